@@ -1,11 +1,26 @@
 import os
-from flask import Flask, jsonify, request, g, send_from_directory # Added send_from_directory
-from neo4j import GraphDatabase
+import asyncio
+import hmac
+import threading
+from quart import Quart, Response, jsonify, request, send_from_directory
+from quart.json.provider import JSONProvider
+from neo4j import AsyncGraphDatabase, READ_ACCESS, RoutingControl
+from neo4j.exceptions import ServiceUnavailable
+from cachetools import TTLCache
+from brotli_asgi import BrotliMiddleware
+from starlette.middleware.gzip import GZipMiddleware
+import orjson
+import numpy as np
 from dotenv import load_dotenv
 import sys
 import time # Import time for default timestamp calculation if needed
 import traceback # Import traceback for better error logging
 
+try:
+    import redis.asyncio as aioredis # Optional: shared time-range cache for multi-worker deploys
+except ImportError:
+    aioredis = None
+
 # --- Configuration Loading ---
 dotenv_path = os.path.join(os.path.dirname(__file__), '..', '.env')
 load_dotenv(dotenv_path=dotenv_path)
@@ -16,54 +31,210 @@ load_dotenv(dotenv_path=dotenv_path)
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 # frontend_folder = os.path.join(project_root, 'frontend') # OLD
 
-# --- Flask App Initialization (UPDATED) ---
+# --- Quart App Initialization ---
+# Quart mirrors the Flask API but runs on an event loop (ASGI), so Bolt round-trips
+# made through the async Neo4j driver no longer block the worker.
 # Configure the static folder to point to our 'frontend' directory
-app = Flask(__name__, static_folder=project_root, static_url_path='')
+app = Quart(__name__, static_folder=project_root, static_url_path='')
+
+# --- JSON Serialization ---
+class ORJSONProvider(JSONProvider):
+    """Serializes jsonify() responses with orjson instead of the stdlib json module."""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
 
-# --- Neo4j Driver Setup (Keep as before) ---
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+app.json = ORJSONProvider(app)
+
+# --- Response Compression ---
+# Node/link JSON is highly repetitive, so responses are Brotli-compressed for clients
+# that accept it and gzip-compressed otherwise. Working at the ASGI level, this also
+# compresses streamed /graph-data bodies chunk by chunk. The outer gzip layer passes
+# through responses the Brotli layer has already encoded.
+RESPONSE_COMPRESSION_LEVEL = 4
+RESPONSE_COMPRESSION_MIN_SIZE = 1024 # Bytes; smaller responses are sent as-is
+app.asgi_app = GZipMiddleware(
+    BrotliMiddleware(
+        app.asgi_app,
+        quality=RESPONSE_COMPRESSION_LEVEL,
+        minimum_size=RESPONSE_COMPRESSION_MIN_SIZE,
+        gzip_fallback=False,
+    ),
+    minimum_size=RESPONSE_COMPRESSION_MIN_SIZE,
+    compresslevel=RESPONSE_COMPRESSION_LEVEL,
+)
+
+# --- Neo4j Driver Setup ---
 NEO4J_URI = os.getenv("NEO4J_URI")
 NEO4J_USER = os.getenv("NEO4J_USER")
 NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD")
+NEO4J_DATABASE = os.getenv("NEO4J_DATABASE", "neo4j")
+NEO4J_MAX_CONNECTION_POOL_SIZE = 50
+NEO4J_CONNECTION_ACQUISITION_TIMEOUT_SECONDS = 5
 driver = None
-try:
-    driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASSWORD))
-    driver.verify_connectivity()
-    print("Successfully connected to Neo4j.")
-except Exception as e:
-    print(f"ERROR: Failed to create Neo4j driver or connect: {e}", file=sys.stderr)
-    driver = None
-
-# --- Neo4j Session Management (Keep as before) ---
-def get_db():
-    if not hasattr(g, 'neo4j_db'):
-        if driver is None:
-            print("ERROR: Neo4j driver not available.", file=sys.stderr)
-            g.neo4j_db = None
-        else:
-            try:
-                # Ensure driver is still valid before creating session
-                driver.verify_connectivity()
-                g.neo4j_db = driver.session()
-            except Exception as e:
-                 print(f"ERROR: Failed to create Neo4j session: {e}", file=sys.stderr)
-                 g.neo4j_db = None # Set session to None if connection fails here too
-    return g.neo4j_db
-
-@app.teardown_appcontext
-def close_db(exception):
-    if hasattr(g, 'neo4j_db') and g.neo4j_db is not None:
-        g.neo4j_db.close()
-
-# --- Transaction Functions (UPDATED) ---
-
-def _get_overall_time_range_tx(tx):
+_driver_lock = None # asyncio.Lock guarding driver recreation, created in the serving loop
+
+# --- Cache Configuration ---
+TIME_RANGE_CACHE_TTL_SECONDS = int(os.getenv("TIME_RANGE_CACHE_TTL_SECONDS", 60))
+TIME_RANGE_CACHE_KEY = "ts_range:v1"
+GRAPH_DATA_CACHE_MAX_BYTES = int(os.getenv("GRAPH_DATA_CACHE_MAX_BYTES", 128 * 1024 * 1024)) # Per worker process
+GRAPH_DATA_CACHE_TTL_SECONDS = int(os.getenv("GRAPH_DATA_CACHE_TTL_SECONDS", 300))
+GRAPH_DATA_CACHE_MAX_BODY_BYTES = 16 * 1024 * 1024
+GRAPH_DATA_STREAM_BATCH_SIZE = 1000 # Records encoded per chunk of the streamed response
+GRAPH_DATA_PAGE_SIZE = 50000 # Default (and maximum) number of links per /graph-data page
+DAY_MS = 24 * 60 * 60 * 1000 # Length of a UTC day in epoch milliseconds, as used by the :DailyAgg rollups
+REDIS_URL = os.getenv("REDIS_URL")
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+redis_client = None
+
+# --- Cypher Queries ---
+# Query texts are fixed at import time and take values only as parameters, so Neo4j
+# plans each of them once and serves later requests from its query plan cache.
+# CYPHER_QUERY_OPTIONS (e.g. "runtime=pipelined") is prepended to the /graph-data
+# query as a CYPHER prefix; it is empty by default since the pipelined runtime
+# requires Neo4j Enterprise Edition.
+CYPHER_QUERY_OPTIONS = os.getenv("CYPHER_QUERY_OPTIONS", "").strip()
+CYPHER_PREFIX = f"CYPHER {CYPHER_QUERY_OPTIONS}" if CYPHER_QUERY_OPTIONS else ""
+
+TIME_RANGE_QUERY = """
+MATCH ()-[r:REPOSTED]->()
+WHERE r.timestamp IS NOT NULL
+RETURN min(r.timestamp) as min_ts, max(r.timestamp) as max_ts
+"""
+
+# Links are paged in (timestamp, relationship id) order, so a page resumes strictly
+# after the last link of the previous one and no single response grows unbounded.
+# Degrees aren't aggregated in Cypher, which would touch the window's relationships
+# a second time; they are counted from the returned endpoints instead. Channels are
+# identified by their compact Channel.idx; /channel-map resolves them to channel ids.
+# Channels ingested before indices existed have none and are left out (see
+# MISSING_CHANNEL_IDX_QUERY).
+GRAPH_LINKS_QUERY = CYPHER_PREFIX + """
+MATCH (source:Channel)-[r:REPOSTED]->(target:Channel)
+WHERE r.timestamp >= $startTime AND r.timestamp <= $endTime
+  AND (r.timestamp > $afterTs OR (r.timestamp = $afterTs AND id(r) > $afterId))
+  AND source.idx IS NOT NULL AND target.idx IS NOT NULL
+RETURN source.idx AS source, target.idx AS target, r.timestamp AS timestamp, id(r) AS rid
+ORDER BY timestamp, rid
+LIMIT $limit
+"""
+
+# When a window covers the whole time range, every relationship counts towards the
+# degrees, so they are read from each channel's stored relationship count (no
+# relationship scan) and sent once with the first page. The undirected pattern
+# counts a self-repost (a loop) once.
+FULL_RANGE_DEGREES_QUERY = CYPHER_PREFIX + """
+MATCH (c:Channel)
+WHERE c.idx IS NOT NULL
+WITH c, COUNT { (c)-[:REPOSTED]-() } AS degree
+WHERE degree > 0
+RETURN c.idx AS id, degree
+"""
+
+# Windows spanning whole UTC days sum the per-day degree rollups written at ingestion
+# time, touching O(days x channels) rollup nodes rather than every relationship.
+DAILY_DEGREES_QUERY = CYPHER_PREFIX + """
+MATCH (a:DailyAgg)
+WHERE a.day >= $startDay AND a.day <= $endDay
+RETURN a.channel_idx AS id, sum(a.degree) AS degree
+"""
+
+# Read from the count store. Rollups are rebuilt for all channels after every
+# ingestion, so any :DailyAgg node means they cover the whole graph; databases
+# ingested before rollups existed have none.
+DAILY_ROLLUPS_AVAILABLE_QUERY = """
+MATCH (a:DailyAgg)
+RETURN count(a) > 0 AS available
+"""
+
+# Checked once at startup: a database ingested before Channel.idx existed would
+# silently serve an empty graph.
+MISSING_CHANNEL_IDX_QUERY = """
+RETURN EXISTS { MATCH (c:Channel) WHERE c.idx IS NULL } AS missing
+"""
+
+CHANNEL_MAP_QUERY = """
+MATCH (c:Channel)
+WHERE c.idx IS NOT NULL
+RETURN c.idx AS idx, c.channel_id AS channel_id
+"""
+
+def _create_driver():
+    # Pooled connections are health-checked lazily by the driver (keep-alive, bounded
+    # acquisition wait), so requests don't need to ping Neo4j themselves.
+    return AsyncGraphDatabase.driver(
+        NEO4J_URI,
+        auth=(NEO4J_USER, NEO4J_PASSWORD),
+        max_connection_pool_size=NEO4J_MAX_CONNECTION_POOL_SIZE,
+        connection_acquisition_timeout=NEO4J_CONNECTION_ACQUISITION_TIMEOUT_SECONDS,
+        keep_alive=True,
+    )
+
+@app.before_serving
+async def open_driver():
+    # The async driver must be created inside the serving event loop, since its
+    # pooled connections are bound to the loop that opened them.
+    global driver, _driver_lock
+    _driver_lock = asyncio.Lock()
+    try:
+        driver = _create_driver()
+    except Exception as e:
+        print(f"ERROR: Failed to create Neo4j driver: {e}", file=sys.stderr)
+        driver = None
+        return
+    try:
+        await driver.verify_connectivity()
+        print("Successfully connected to Neo4j.")
+        records, _, _ = await driver.execute_query(MISSING_CHANNEL_IDX_QUERY, database_=NEO4J_DATABASE, routing_=RoutingControl.READ)
+        if records[0]["missing"]:
+            print("WARNING: Some channels have no compact index (Channel.idx) and are left out of /graph-data. "
+                  "Re-run scripts/ingest_data.py on a cleared database.", file=sys.stderr)
+    except Exception as e:
+        # Keep the driver: it connects lazily, so requests succeed once Neo4j is reachable
+        print(f"ERROR: Failed to connect to Neo4j: {e}", file=sys.stderr)
+
+async def recreate_driver(failed_driver):
+    """Replaces the driver after it reported Neo4j as unavailable, unless another request already did."""
+    global driver
+    async with _driver_lock:
+        if driver is not failed_driver:
+            return
+        print("WARNING: Recreating Neo4j driver after a connection failure.", file=sys.stderr)
+        driver = _create_driver()
+    try:
+        await failed_driver.close()
+    except Exception as e:
+        print(f"WARNING: Failed to close previous Neo4j driver: {e}", file=sys.stderr)
+
+@app.before_serving
+async def open_redis():
+    # Redis is only used to share the overall time range between worker processes;
+    # without it each worker keeps its own in-process copy.
+    global redis_client
+    if not REDIS_URL:
+        return
+    if aioredis is None:
+        print("WARNING: REDIS_URL is set but the 'redis' library is not installed. Using in-process cache.", file=sys.stderr)
+        return
+    redis_client = aioredis.from_url(REDIS_URL)
+
+@app.after_serving
+async def close_driver():
+    if driver is not None:
+        await driver.close()
+    if redis_client is not None:
+        await redis_client.aclose()
+
+# --- Query Functions ---
+
+async def _get_overall_time_range():
     """Gets the absolute minimum and maximum timestamp from all REPOSTED relationships."""
-    query = """
-    MATCH ()-[r:REPOSTED]->()
-    WHERE r.timestamp IS NOT NULL
-    RETURN min(r.timestamp) as min_ts, max(r.timestamp) as max_ts
-    """
-    result = tx.run(query).single()
+    # execute_query borrows a pooled session and manages the (retryable) transaction itself
+    records, _, _ = await driver.execute_query(TIME_RANGE_QUERY, database_=NEO4J_DATABASE, routing_=RoutingControl.READ)
+    result = records[0] if records else None
     if result and result["min_ts"] is not None and result["max_ts"] is not None:
         return result["min_ts"], result["max_ts"]
     else:
@@ -71,84 +242,352 @@ def _get_overall_time_range_tx(tx):
         print("WARNING: Could not determine overall time range from database.")
         return 0, int(time.time() * 1000) # Default to epoch start and current time
 
-def _get_filtered_graph_data_tx(tx, start_time_ms, end_time_ms):
+# --- Streaming Graph Data ---
+
+async def _encode_records(result):
+    """Yields the records of a result as comma-separated JSON objects, a batch at a time."""
+    batch = []
+    separator = b""
+    async for record in result:
+        batch.append(orjson.dumps(record.data()))
+        if len(batch) >= GRAPH_DATA_STREAM_BATCH_SIZE:
+            yield separator + b",".join(batch)
+            separator = b","
+            batch = []
+    if batch:
+        yield separator + b",".join(batch)
+
+def _page_degrees(page):
     """
-    Fetches nodes and links within the specified time window and calculates
-    node degrees based *only* on connections within that window.
+    Returns the node entries for the links of one page. A node's degree is how often its
+    compact index appears as an endpoint, so all degrees are counted in one np.bincount.
+    A self-repost counts once, as it does in the degree store and the daily rollups.
     """
-    # This query uses the provided time range to filter relationships ($startTime, $endTime).
-    # It then finds all nodes connected by these filtered relationships.
-    # Finally, it calculates the degree for each of these nodes based *only*
-    # on the relationships that fall within the time window.
-    query = """
-    // Match relationships within the time window
-    MATCH (source:Channel)-[r:REPOSTED]->(target:Channel)
-    WHERE r.timestamp >= $startTime AND r.timestamp <= $endTime
+    sources = np.asarray(page["sources"], dtype=np.int64)
+    targets = np.asarray(page["targets"], dtype=np.int64)
+    endpoints = np.concatenate([sources, targets[targets != sources]])
+    counts = np.bincount(endpoints)
+    idxs = np.flatnonzero(counts)
+    return [{"id": idx, "degree": count} for idx, count in zip(idxs.tolist(), counts[idxs].tolist())]
 
-    // Collect the distinct nodes involved in these relationships
-    WITH collect(DISTINCT source) + collect(DISTINCT target) AS nodes_in_window,
-         // Collect the filtered relationships for the links output
-         collect({source: source.channel_id, target: target.channel_id, timestamp: r.timestamp}) AS links_in_window
+async def _window_degrees_query(tx, start_time_ms, end_time_ms, min_ts_overall, max_ts_overall):
+    """
+    Returns the (query, parameters) reading the degrees of a whole window from precomputed
+    counts, or None if they have to be counted from the window's links.
+    """
+    if start_time_ms <= min_ts_overall and end_time_ms >= max_ts_overall:
+        return FULL_RANGE_DEGREES_QUERY, {}
+    # Day-aligned: starts at midnight UTC and ends on the last millisecond of a day
+    if start_time_ms % DAY_MS == 0 and (end_time_ms + 1) % DAY_MS == 0:
+        # Checked on every page, so all pages of a window agree on where degrees come from
+        result = await tx.run(DAILY_ROLLUPS_AVAILABLE_QUERY)
+        record = await result.single()
+        if record["available"]:
+            return DAILY_DEGREES_QUERY, {"startDay": start_time_ms // DAY_MS, "endDay": end_time_ms // DAY_MS}
+    return None
 
-    // Unwind the distinct nodes to process them individually
-    UNWIND nodes_in_window AS n
+async def _encode_link_page(result, page_size, page):
+    """
+    Yields up to page_size links as comma-separated JSON objects, a batch at a time,
+    collecting their endpoints in page["sources"]/page["targets"]. The links query
+    fetches one row more than that; if it arrives, page["next_cursor"] is set to
+    resume after the last link sent.
+    """
+    batch = []
+    separator = b""
+    sent = 0
+    last_link = None
+    async for record in result:
+        if sent == page_size:
+            page["next_cursor"] = {"after_ts": last_link["timestamp"], "after_id": last_link["rid"]}
+            break
+        batch.append(orjson.dumps(record.data("source", "target", "timestamp")))
+        page["sources"].append(record["source"])
+        page["targets"].append(record["target"])
+        last_link = record
+        sent += 1
+        if len(batch) >= GRAPH_DATA_STREAM_BATCH_SIZE:
+            yield separator + b",".join(batch)
+            separator = b","
+            batch = []
+    if batch:
+        yield separator + b",".join(batch)
 
-    // Calculate the degree for each node 'n' considering ONLY relationships within the time window
-    // We need to re-match relationships connected to 'n' within the window to count degree correctly
-    WITH n, links_in_window, count {
-        MATCH (n)-[r_deg:REPOSTED]-(neighbor) // Match incoming or outgoing
-        WHERE r_deg.timestamp >= $startTime AND r_deg.timestamp <= $endTime
-    } AS degree_in_window
+async def _stream_graph_records(start_time_ms, end_time_ms, page_size, cursor, time_range):
+    """
+    Yields the "links", "nodes" and "next_cursor" members of one /graph-data page for
+    the given time window, encoding links as they arrive from Neo4j instead of
+    collecting them into lists first. Node degrees are computed from the links of
+    this page only; summed over all pages they give the degrees within the window.
+    If the window covers the overall range (awaited from `time_range`) or whole
+    UTC days, the first page carries every node's degree within the window instead,
+    read from precomputed counts, and later pages carry no nodes.
+    The first chunk is yielded once the query is running, so connection and query
+    errors surface before the HTTP response has started.
+    """
+    if cursor is None:
+        after_ts, after_id = start_time_ms - 1, -1
+    else:
+        after_ts, after_id = cursor
+    links_params = {
+        "startTime": max(start_time_ms, after_ts), # Lets the index seek start at the cursor
+        "endTime": end_time_ms,
+        "afterTs": after_ts,
+        "afterId": after_id,
+        "limit": page_size + 1, # One extra row tells whether another page follows
+    }
+    page = {"next_cursor": None, "sources": [], "targets": []}
+
+    # This needs an explicit session: execute_query would buffer every record before returning.
+    async with driver.session(database=NEO4J_DATABASE, default_access_mode=READ_ACCESS) as session:
+        async with await session.begin_transaction() as tx:
+            result = await tx.run(GRAPH_LINKS_QUERY, links_params)
+            yield b'"links":['
+            async for chunk in _encode_link_page(result, page_size, page):
+                yield chunk
 
-    // Collect the final node data (ensure distinct nodes)
-    WITH links_in_window, collect(DISTINCT {id: n.channel_id, label: n.channel_id, degree: degree_in_window}) AS nodes_data
+            min_ts_overall, max_ts_overall = await time_range
+            window_degrees = await _window_degrees_query(tx, start_time_ms, end_time_ms, min_ts_overall, max_ts_overall)
+            if window_degrees is not None:
+                yield b'],"nodes":['
+                if cursor is None:
+                    result = await tx.run(*window_degrees)
+                    async for chunk in _encode_records(result):
+                        yield chunk
+                yield b'],"next_cursor":' + orjson.dumps(page["next_cursor"])
+                return
 
-    RETURN nodes_data, links_in_window
+    yield b'],"nodes":' + orjson.dumps(_page_degrees(page)) + b',"next_cursor":' + orjson.dumps(page["next_cursor"])
+
+async def _stream_graph_data_body(first_chunk, records, min_ts_overall, max_ts_overall, cache_key):
+    """
+    Wraps the streamed links/nodes in the JSON response object and caches the complete
+    body once it has been sent, unless it exceeds GRAPH_DATA_CACHE_MAX_BODY_BYTES.
     """
-    result = tx.run(query, startTime=start_time_ms, endTime=end_time_ms).single()
+    chunks = []
+    body_size = 0
+
+    for chunk in (b"{", first_chunk):
+        chunks.append(chunk)
+        body_size += len(chunk)
+        yield chunk
+    async for chunk in records:
+        if chunks is not None:
+            chunks.append(chunk)
+            body_size += len(chunk)
+            if body_size > GRAPH_DATA_CACHE_MAX_BODY_BYTES:
+                chunks = None # Too large to keep in memory; stream it without caching
+        yield chunk
 
-    if result:
-        return result["nodes_data"], result["links_in_window"]
+    # Always return overall range for slider
+    tail = b',"min_timestamp":' + orjson.dumps(min_ts_overall) + b',"max_timestamp":' + orjson.dumps(max_ts_overall) + b'}'
+    yield tail
+    if chunks is not None:
+        chunks.append(tail)
+        _cache_graph_data(cache_key, b"".join(chunks))
+
+
+# --- Overall Time Range Cache ---
+# The min/max aggregation scans every REPOSTED relationship, but the ingested graph
+# rarely changes, so the result is reused for TIME_RANGE_CACHE_TTL_SECONDS.
+_ts_range_cache = {"value": None, "expires": 0.0}
+_ts_range_cache_lock = threading.Lock()
+
+async def _get_cached_time_range_from_redis():
+    try:
+        cached = await redis_client.get(TIME_RANGE_CACHE_KEY)
+    except Exception as e:
+        print(f"WARNING: Failed to read time range from Redis: {e}", file=sys.stderr)
+        return None
+    if cached is None:
+        return None
+    min_ts, max_ts = cached.decode().split(",")
+    return int(min_ts), int(max_ts)
+
+async def _set_cached_time_range_in_redis(value):
+    try:
+        await redis_client.setex(TIME_RANGE_CACHE_KEY, TIME_RANGE_CACHE_TTL_SECONDS, f"{value[0]},{value[1]}")
+    except Exception as e:
+        print(f"WARNING: Failed to store time range in Redis: {e}", file=sys.stderr)
+
+async def get_overall_time_range_cached():
+    """Returns the overall (min_ts, max_ts) tuple, querying Neo4j only when the cached value has expired."""
+    if redis_client is not None:
+        value = await _get_cached_time_range_from_redis()
+        if value is not None:
+            return value
     else:
-        # Return empty lists if no data found in the window
-        return [], []
+        with _ts_range_cache_lock:
+            if _ts_range_cache["value"] is not None and time.monotonic() < _ts_range_cache["expires"]:
+                return _ts_range_cache["value"]
+
+    value = await _get_overall_time_range()
+
+    if redis_client is not None:
+        await _set_cached_time_range_in_redis(value)
+    else:
+        with _ts_range_cache_lock:
+            _ts_range_cache["value"] = value
+            _ts_range_cache["expires"] = time.monotonic() + TIME_RANGE_CACHE_TTL_SECONDS
+    return value
+
+# --- Graph Data Response Cache ---
+# Sliders often revisit the same windows, so finished /graph-data bodies are kept
+# already serialized, keyed on the bound window and the requested page.
+# The cache is bounded by the total size of the stored bodies, not by their number.
+_graph_data_cache = TTLCache(maxsize=GRAPH_DATA_CACHE_MAX_BYTES, ttl=GRAPH_DATA_CACHE_TTL_SECONDS, getsizeof=len)
+_graph_data_cache_lock = threading.Lock()
+
+def _get_cached_graph_data(key):
+    with _graph_data_cache_lock:
+        return _graph_data_cache.get(key)
+
+def _cache_graph_data(key, body):
+    if len(body) > GRAPH_DATA_CACHE_MAX_BYTES:
+        return # Would not fit even in an empty cache
+    with _graph_data_cache_lock:
+        _graph_data_cache[key] = body
+
+# --- Channel Map Cache ---
+# The /channel-map body only changes when channels are ingested, so like the overall
+# time range it is reused for TIME_RANGE_CACHE_TTL_SECONDS. Clients that have seen a
+# higher channel index than the cached map covers ask for a minimum size, which
+# bypasses a map that predates the latest ingestion.
+_channel_map_cache = {"body": None, "size": 0, "expires": 0.0}
+_channel_map_cache_lock = threading.Lock()
+
+def _get_cached_channel_map(min_size):
+    with _channel_map_cache_lock:
+        if _channel_map_cache["body"] is None or time.monotonic() >= _channel_map_cache["expires"]:
+            return None
+        if _channel_map_cache["size"] < min_size:
+            return None
+        return _channel_map_cache["body"]
+
+def _cache_channel_map(body, size):
+    with _channel_map_cache_lock:
+        _channel_map_cache["body"] = body
+        _channel_map_cache["size"] = size
+        _channel_map_cache["expires"] = time.monotonic() + TIME_RANGE_CACHE_TTL_SECONDS
+
+async def invalidate_caches():
+    """Drops all cached query results, e.g. after new data has been ingested."""
+    with _ts_range_cache_lock:
+        _ts_range_cache["value"] = None
+        _ts_range_cache["expires"] = 0.0
+    with _channel_map_cache_lock:
+        _channel_map_cache["body"] = None
+        _channel_map_cache["size"] = 0
+        _channel_map_cache["expires"] = 0.0
+    with _graph_data_cache_lock:
+        _graph_data_cache.clear()
+    if redis_client is not None:
+        await redis_client.delete(TIME_RANGE_CACHE_KEY)
 
 
 # --- API Routes ---
 @app.route('/')
-def serve_index():
+async def serve_index():
      # Serve index.html specifically from the frontend subfolder
      try:
          # Use os.path.join for cross-platform compatibility
-         return send_from_directory(os.path.join(app.static_folder, 'frontend'), 'index.html')
+         return await send_from_directory(os.path.join(app.static_folder, 'frontend'), 'index.html')
      except FileNotFoundError:
           print(f"ERROR: index.html not found in {os.path.join(app.static_folder, 'frontend')}", file=sys.stderr)
           return "Error: index.html not found.", 404
 
+async def _get_channel_map():
+    """Returns the channel_id of every channel as a list indexed by Channel.idx (None for unused indices)."""
+    records, _, _ = await driver.execute_query(CHANNEL_MAP_QUERY, database_=NEO4J_DATABASE, routing_=RoutingControl.READ)
+    channel_ids = [None] * (max((record["idx"] for record in records), default=-1) + 1)
+    for record in records:
+        channel_ids[record["idx"]] = record["channel_id"]
+    return channel_ids
+
+async def _graph_data_response(start_time_ms, end_time_ms, page_size, cursor):
+    """
+    Builds the /graph-data response for the requested window, filling in missing
+    bounds from the overall time range. Neo4j being unreachable surfaces as
+    ServiceUnavailable before any of the body has been sent.
+    """
+    # The overall time range is needed for sliders/defaults, and to tell whether the window covers it
+    time_range = asyncio.ensure_future(get_overall_time_range_cached())
+    window_is_bound = start_time_ms is not None and end_time_ms is not None
+    if not window_is_bound:
+        min_ts_overall, max_ts_overall = await time_range
+
+        # Set defaults if parameters are missing
+        if start_time_ms is None:
+            start_time_ms = min_ts_overall
+        if end_time_ms is None:
+            end_time_ms = max_ts_overall
+
+        if start_time_ms > end_time_ms:
+             print(f"WARNING: start_time ({start_time_ms}) is after end_time ({end_time_ms}). Swapping.")
+             start_time_ms, end_time_ms = end_time_ms, start_time_ms # Simple swap
+
+    cache_key = (start_time_ms, end_time_ms, page_size, cursor)
+    if not window_is_bound:
+        body = _get_cached_graph_data(cache_key)
+        if body is not None:
+            return Response(body, mimetype="application/json")
+
+    print(f"Querying graph data for window: {start_time_ms} -> {end_time_ms}") # Debug print
+
+    # Start streaming the filtered graph data. When both bounds were given, the
+    # overall range (for sliders) doesn't affect the window, so fetch it concurrently.
+    records = _stream_graph_records(start_time_ms, end_time_ms, page_size, cursor, time_range)
+    first_chunk_task = asyncio.ensure_future(records.__anext__())
+    try:
+        if window_is_bound:
+            (min_ts_overall, max_ts_overall), first_chunk = await asyncio.gather(
+                time_range,
+                first_chunk_task,
+            )
+        else:
+            first_chunk = await first_chunk_task
+    except BaseException:
+        # gather() leaves the other awaitable running when one fails. Stop it and wait
+        # for it, so the generator is no longer running when it is closed (closing its
+        # session) and the first exception is the one that propagates.
+        time_range.cancel()
+        first_chunk_task.cancel()
+        await asyncio.gather(time_range, first_chunk_task, return_exceptions=True)
+        await records.aclose()
+        raise
+
+    # Stream the JSON response; it is cached once fully sent
+    body = _stream_graph_data_body(first_chunk, records, min_ts_overall, max_ts_overall, cache_key)
+    return Response(body, mimetype="application/json")
+
 @app.route('/graph-data')
-def get_graph_data():
+async def get_graph_data():
     """
     API endpoint to fetch graph data, filtered by time window.
     Accepts optional 'start_time' and 'end_time' query parameters (Unix ms).
     Defaults to the full time range in the database if parameters are missing.
+    Links are paged: 'limit' caps the links per response (default and maximum
+    GRAPH_DATA_PAGE_SIZE), and a non-null 'next_cursor' in the response holds the
+    'after_ts'/'after_id' parameters requesting the next page. Each page lists the
+    nodes of its links with their degree within that page; summing them over all
+    pages gives the degrees within the window (for a window covering the whole
+    time range or whole UTC days, all of them come with the first page).
+    Channels are identified by their compact index, see /channel-map.
+    The response body is streamed while records arrive from Neo4j.
     """
-    db = get_db()
-    if db is None:
+    if driver is None:
         return jsonify({"error": "Database connection not available"}), 503
 
     try:
-        # 1. Determine overall time range for sliders/defaults
-        min_ts_overall, max_ts_overall = db.read_transaction(_get_overall_time_range_tx)
-
-        # 2. Parse and validate query parameters
+        # 1. Parse and validate query parameters
         start_time_ms = None
         end_time_ms = None
+        start_time_str = request.args.get('start_time')
+        end_time_str = request.args.get('end_time')
         try:
-            start_time_str = request.args.get('start_time')
             if start_time_str:
                 start_time_ms = int(start_time_str)
 
-            end_time_str = request.args.get('end_time')
             if end_time_str:
                 end_time_ms = int(end_time_str)
 
@@ -156,42 +595,125 @@ def get_graph_data():
             print(f"WARNING: Invalid timestamp format received. start='{start_time_str}', end='{end_time_str}'")
             return jsonify({"error": "Invalid timestamp format for start_time/end_time. Expecting integer milliseconds."}), 400
 
-        # 3. Set defaults if parameters are missing
-        if start_time_ms is None:
-            start_time_ms = min_ts_overall
-        if end_time_ms is None:
-            end_time_ms = max_ts_overall
+        page_size = GRAPH_DATA_PAGE_SIZE
+        cursor = None
+        limit_str = request.args.get('limit')
+        after_ts_str = request.args.get('after_ts')
+        after_id_str = request.args.get('after_id')
+        try:
+            if limit_str:
+                page_size = int(limit_str)
 
-        # Ensure start <= end, swap if necessary or handle as error (optional)
-        if start_time_ms > end_time_ms:
-             print(f"WARNING: start_time ({start_time_ms}) is after end_time ({end_time_ms}). Swapping.")
-             start_time_ms, end_time_ms = end_time_ms, start_time_ms # Simple swap
+            if after_ts_str or after_id_str:
+                cursor = (int(after_ts_str), int(after_id_str))
+
+        except (ValueError, TypeError):
+            print(f"WARNING: Invalid pagination parameters received. limit='{limit_str}', after_ts='{after_ts_str}', after_id='{after_id_str}'")
+            return jsonify({"error": "Invalid pagination parameters. Expecting integer limit, and after_ts/after_id given together."}), 400
+
+        if page_size < 1:
+            return jsonify({"error": "limit must be a positive integer."}), 400
+        page_size = min(page_size, GRAPH_DATA_PAGE_SIZE)
 
-        print(f"Querying graph data for window: {start_time_ms} -> {end_time_ms}") # Debug print
+        if start_time_ms is not None and end_time_ms is not None:
+            # Ensure start <= end, swap if necessary or handle as error (optional)
+            if start_time_ms > end_time_ms:
+                 print(f"WARNING: start_time ({start_time_ms}) is after end_time ({end_time_ms}). Swapping.")
+                 start_time_ms, end_time_ms = end_time_ms, start_time_ms # Simple swap
 
-        # 4. Fetch filtered graph data using the determined time window
-        nodes_data, links_data = db.execute_read(_get_filtered_graph_data_tx, start_time_ms, end_time_ms)
+            # 2. Repeated windows are answered from memory without touching the database
+            body = _get_cached_graph_data((start_time_ms, end_time_ms, page_size, cursor))
+            if body is not None:
+                return Response(body, mimetype="application/json")
 
-        # 5. Construct JSON response
-        response_data = {
-            "nodes": nodes_data,
-            "links": links_data,
-            "min_timestamp": min_ts_overall, # Always return overall range for slider
-            "max_timestamp": max_ts_overall  # Always return overall range for slider
-        }
-        return jsonify(response_data)
+        # 3. Query Neo4j. If it is reported unreachable (e.g. pooled connections went stale
+        # after a restart), retry once on a freshly created driver. The time range and the
+        # links are queried concurrently; whichever fails first is the error seen here, and
+        # the other query is stopped before the response is abandoned.
+        failed_driver = driver
+        try:
+            return await _graph_data_response(start_time_ms, end_time_ms, page_size, cursor)
+        except ServiceUnavailable as e:
+            print(f"WARNING: Neo4j unavailable ({e}). Retrying with a new driver.", file=sys.stderr)
+            await recreate_driver(failed_driver)
+        try:
+            return await _graph_data_response(start_time_ms, end_time_ms, page_size, cursor)
+        except ServiceUnavailable as e:
+            print(f"ERROR: Neo4j still unavailable after retry: {e}", file=sys.stderr)
+            return jsonify({"error": "Database connection not available"}), 503
 
     except Exception as e:
         # Log the detailed error to the console/log file
         print(f"ERROR: Failed processing /graph-data request: {e}", file=sys.stderr)
         # Optionally log the stack trace
-        import traceback
         traceback.print_exc()
         # Return a generic error to the client
         return jsonify({"error": "An internal server error occurred while retrieving graph data"}), 500
 
 
-# --- Main Execution (Keep as before, add one print statement) ---
+@app.route('/channel-map')
+async def get_channel_map():
+    """
+    API endpoint mapping the compact channel indices used by /graph-data to channel ids.
+    Returns a JSON array whose element at position idx is that channel's channel_id.
+    Accepts an optional 'min_size' query parameter: a cached map with fewer entries
+    is reloaded from Neo4j, so indices of newly ingested channels can be resolved.
+    """
+    if driver is None:
+        return jsonify({"error": "Database connection not available"}), 503
+
+    min_size = 0
+    min_size_str = request.args.get('min_size')
+    try:
+        if min_size_str:
+            min_size = int(min_size_str)
+    except (ValueError, TypeError):
+        print(f"WARNING: Invalid min_size received: '{min_size_str}'")
+        return jsonify({"error": "Invalid min_size. Expecting an integer."}), 400
+
+    body = _get_cached_channel_map(min_size)
+    if body is not None:
+        return Response(body, mimetype="application/json")
+
+    try:
+        channel_ids = await _get_channel_map()
+    except ServiceUnavailable as e:
+        print(f"ERROR: Neo4j unavailable while loading the channel map: {e}", file=sys.stderr)
+        return jsonify({"error": "Database connection not available"}), 503
+    except Exception as e:
+        print(f"ERROR: Failed processing /channel-map request: {e}", file=sys.stderr)
+        traceback.print_exc()
+        return jsonify({"error": "An internal server error occurred while retrieving the channel map"}), 500
+
+    body = orjson.dumps(channel_ids)
+    _cache_channel_map(body, len(channel_ids))
+    return Response(body, mimetype="application/json")
+
+
+@app.route('/admin/invalidate', methods=['POST'])
+async def invalidate_cache():
+    """
+    Clears cached query results so newly ingested data shows up before the TTL expires.
+    Requires the 'X-Admin-Token' header to match ADMIN_TOKEN; disabled when ADMIN_TOKEN is unset.
+    """
+    if not ADMIN_TOKEN:
+        return jsonify({"error": "Admin endpoints are disabled"}), 404
+    token = request.headers.get('X-Admin-Token', '')
+    if not hmac.compare_digest(token, ADMIN_TOKEN):
+        return jsonify({"error": "Invalid admin token"}), 403
+
+    try:
+        await invalidate_caches()
+    except Exception as e:
+        print(f"ERROR: Failed to invalidate caches: {e}", file=sys.stderr)
+        return jsonify({"error": "Failed to invalidate caches"}), 500
+    print("Caches invalidated.")
+    return jsonify({"status": "invalidated"})
+
+
+# --- Main Execution ---
+# app.run() starts Quart's development server; use an ASGI server such as
+# Hypercorn in production so requests are scheduled concurrently on the event loop.
 if __name__ == '__main__':
     host = os.getenv('FLASK_HOST', '127.0.0.1')
     port = int(os.getenv('FLASK_PORT', 5000))
@@ -200,5 +722,5 @@ if __name__ == '__main__':
     # ADD THIS LINE for confirmation:
     print(f"Serving static files from project root: {project_root}")
     # Print the host, port, and debug mode for clarity
-    print(f"Starting Flask server on {host}:{port} with debug={debug_mode}")
+    print(f"Starting Quart server on {host}:{port} with debug={debug_mode}")
     app.run(host=host, port=port, debug=debug_mode)
\ No newline at end of file
@@ -309,7 +309,575 @@ void main() {
   v_color.a *= bias;
 }
 `,vo=mo,Sn=WebGLRenderingContext,dn=Sn.UNSIGNED_BYTE,pt=Sn.FLOAT,yo=["u_matrix","u_zoomRatio","u_sizeRatio","u_correctionRatio","u_pixelRatio","u_feather","u_minEdgeThickness"],Cn=function(r){function i(){return le(this,i),ye(this,i,arguments)}return be(i,r),ce(i,[{key:"getDefinition",value:function(){return{VERTICES:6,VERTEX_SHADER_SOURCE:vo,FRAGMENT_SHADER_SOURCE:wn,METHOD:WebGLRenderingContext.TRIANGLES,UNIFORMS:yo,ATTRIBUTES:[{name:"a_positionStart",size:2,type:pt},{name:"a_positionEnd",size:2,type:pt},{name:"a_normal",size:2,type:pt},{name:"a_color",size:4,type:dn,normalized:!0},{name:"a_id",size:4,type:dn,normalized:!0}],CONSTANT_ATTRIBUTES:[{name:"a_positionCoef",size:1,type:pt},{name:"a_normalCoef",size:1,type:pt}],CONSTANT_DATA:[[0,1],[0,-1],[1,1],[1,1],[0,-1],[1,-1]]}}},{key:"processVisibleItem",value:function(t,n,a,o,s){var u=s.size||1,h=a.x,d=a.y,l=o.x,c=o.y,f=ht(s.color),p=l-h,_=c-d,E=p*p+_*_,x=0,D=0;E&&(E=1/Math.sqrt(E),x=-_*E*u,D=p*E*u);var w=this.array;w[n++]=h,w[n++]=d,w[n++]=l,w[n++]=c,w[n++]=x,w[n++]=D,w[n++]=f,w[n++]=t}},{key:"setUniforms",value:function(t,n){var a=n.gl,o=n.uniformLocations,s=o.u_matrix,u=o.u_zoomRatio,h=o.u_feather,d=o.u_pixelRatio,l=o.u_correctionRatio,c=o.u_sizeRatio,f=o.u_minEdgeThickness;a.uniformMatrix3fv(s,!1,t.matrix),a.uniform1f(u,t.zoomRatio),a.uniform1f(c,t.sizeRatio),a.uniform1f(l,t.correctionRatio),a.uniform1f(d,t.pixelRatio),a.uniform1f(h,t.antiAliasingFeather),a.uniform1f(f,t.minEdgeThickness)}}])}(di);var An=je(St()),Ft=function(r){function i(){var e;return le(this,i),e=ye(this,i),e.rawEmitter=e,e}return be(i,r),ce(i)}(An.EventEmitter);var Ln=je($t());var bo=function(i){return i},wo=function(i){return i*i},Eo=function(i){return i*(2-i)},_o=function(i){return(i*=2)<1?.5*i*i:-.5*(--i*(i-2)-1)},To=function(i){return i*i*i},So=function(i){return--i*i*i+1},Co=function(i){return(i*=2)<1?.5*i*i*i:.5*((i-=2)*i*i+2)},kn={linear:bo,quadraticIn:wo,quadraticOut:Eo,quadraticInOut:_o,cubicIn:To,cubicOut:So,cubicInOut:Co},Gn={easing:"quadraticInOut",duration:150};function Ae(){return Float32Array.of(1,0,0,0,1,0,0,0,1)}function Pt(r,i,e){return r[0]=i,r[4]=typeof e=="number"?e:i,r}function Rn(r,i){var e=Math.sin(i),t=Math.cos(i);return r[0]=t,r[1]=e,r[3]=-e,r[4]=t,r}function xn(r,i,e){return r[6]=i,r[7]=e,r}function Ye(r,i){var e=r[0],t=r[1],n=r[2],a=r[3],o=r[4],s=r[5],u=r[6],h=r[7],d=r[8],l=i[0],c=i[1],f=i[2],p=i[3],_=i[4],E=i[5],x=i[6],D=i[7],w=i[8];return r[0]=l*e+c*a+f*u,r[1]=l*t+c*o+f*h,r[2]=l*n+c*s+f*d,r[3]=p*e+_*a+E*u,r[4]=p*t+_*o+E*h,r[5]=p*n+_*s+E*d,r[6]=x*e+D*a+w*u,r[7]=x*t+D*o+w*h,r[8]=x*n+D*s+w*d,r}function It(r,i){var e=arguments.length>2&&arguments[2]!==void 0?arguments[2]:1,t=r[0],n=r[1],a=r[3],o=r[4],s=r[6],u=r[7],h=i.x,d=i.y;return{x:h*t+d*a+s*e,y:h*n+d*o+u*e}}function Ao(r,i){var e=r.height/r.width,t=i.height/i.width;return e<1&&t>1||e>1&&t<1?1:Math.min(Math.max(t,1/t),Math.max(1/e,e))}function dt(r,i,e,t,n){var a=r.angle,o=r.ratio,s=r.x,u=r.y,h=i.width,d=i.height,l=Ae(),c=Math.min(h,d)-2*t,f=Ao(i,e);return n?(Ye(l,xn(Ae(),s,u)),Ye(l,Pt(Ae(),o)),Ye(l,Rn(Ae(),a)),Ye(l,Pt(Ae(),h/c/2/f,d/c/2/f))):(Ye(l,Pt(Ae(),2*(c/h)*f,2*(c/d)*f)),Ye(l,Rn(Ae(),-a)),Ye(l,Pt(Ae(),1/o)),Ye(l,xn(Ae(),-s,-u))),l}function Nn(r,i,e){var t=It(r,{x:Math.cos(i.angle),y:Math.sin(i.angle)},0),n=t.x,a=t.y;return 1/Math.sqrt(Math.pow(n,2)+Math.pow(a,2))/e.width}function Fn(r){if(!r.order)return{x:[0,1],y:[0,1]};var i=1/0,e=-1/0,t=1/0,n=-1/0;return r.forEachNode(function(a,o){var s=o.x,u=o.y;s<i&&(i=s),s>e&&(e=s),u<t&&(t=u),u>n&&(n=u)}),{x:[i,e],y:[t,n]}}function $n(r){if(!(0,Ln.default)(r))throw new Error("Sigma: invalid graph instance.");r.forEachNode(function(i,e){if(!Number.isFinite(e.x)||!Number.isFinite(e.y))throw new Error("Sigma: Coordinates of node ".concat(i," are invalid. A node must have a numeric 'x' and 'y' attribute."))})}function Pn(r,i,e){var t=document.createElement(r);if(i)for(var n in i)t.style[n]=i[n];if(e)for(var a in e)t.setAttribute(a,e[a]);return t}function ci(){return typeof window.devicePixelRatio<"u"?window.devicePixelRatio:1}function fi(r,i,e){return e.sort(function(t,n){var a=i(t)||0,o=i(n)||0;return a<o?-1:a>o?1:0})}function gi(r){var i=Ve(r.x,2),e=i[0],t=i[1],n=Ve(r.y,2),a=n[0],o=n[1],s=Math.max(t-e,o-a),u=(t+e)/2,h=(o+a)/2;(s===0||Math.abs(s)===1/0||isNaN(s))&&(s=1),isNaN(u)&&(u=0),isNaN(h)&&(h=0);var d=function(c){return{x:.5+(c.x-u)/s,y:.5+(c.y-h)/s}};return d.applyTo=function(l){l.x=.5+(l.x-u)/s,l.y=.5+(l.y-h)/s},d.inverse=function(l){return{x:u+s*(l.x-.5),y:h+s*(l.y-.5)}},d.ratio=s,d}function Ot(r){"@babel/helpers - typeof";return Ot=typeof Symbol=="function"&&typeof Symbol.iterator=="symbol"?function(i){return typeof i}:function(i){return i&&typeof Symbol=="function"&&i.constructor===Symbol&&i!==Symbol.prototype?"symbol":typeof i},Ot(r)}function pi(r,i){var e=i.size;if(e!==0){var t=r.length;r.length+=e;var n=0;i.forEach(function(a){r[t+n]=a,n++})}}function zt(r){r=r||{};for(var i=0,e=arguments.length<=1?0:arguments.length-1;i<e;i++){var t=i+1<1||arguments.length<=i+1?void 0:arguments[i+1];t&&Object.assign(r,t)}return r}var Ut={hideEdgesOnMove:!1,hideLabelsOnMove:!1,renderLabels:!0,renderEdgeLabels:!1,enableEdgeEvents:!1,defaultNodeColor:"#999",defaultNodeType:"circle",defaultEdgeColor:"#ccc",defaultEdgeType:"line",labelFont:"Arial",labelSize:14,labelWeight:"normal",labelColor:{color:"#000"},edgeLabelFont:"Arial",edgeLabelSize:14,edgeLabelWeight:"normal",edgeLabelColor:{attribute:"color"},stagePadding:30,defaultDrawEdgeLabel:gn,defaultDrawNodeLabel:li,defaultDrawNodeHover:pn,minEdgeThickness:1.7,antiAliasingFeather:1,dragTimeout:100,draggedEventsTolerance:3,inertiaDuration:200,inertiaRatio:3,zoomDuration:250,zoomingRatio:1.7,doubleClickTimeout:300,doubleClickZoomingRatio:2.2,doubleClickZoomingDuration:200,tapMoveTolerance:10,zoomToSizeRatioFunction:Math.sqrt,itemSizesReference:"screen",autoRescale:!0,autoCenter:!0,labelDensity:1,labelGridCellSize:100,labelRenderedSizeThreshold:6,nodeReducer:null,edgeReducer:null,zIndex:!1,minCameraRatio:null,maxCameraRatio:null,enableCameraZooming:!0,enableCameraPanning:!0,enableCameraRotation:!0,cameraPanBoundaries:null,allowInvalidContainer:!1,nodeProgramClasses:{},nodeHoverProgramClasses:{},edgeProgramClasses:{}},Do={circle:mt},Ro={arrow:Tn,line:Cn};function Mt(r){if(typeof r.labelDensity!="number"||r.labelDensity<0)throw new Error("Settings: invalid `labelDensity`. Expecting a positive number.");var i=r.minCameraRatio,e=r.maxCameraRatio;if(typeof i=="number"&&typeof e=="number"&&e<i)throw new Error("Settings: invalid camera ratio boundaries. Expecting `maxCameraRatio` to be greater than `minCameraRatio`.")}function In(r){var i=zt({},Ut,r);return i.nodeProgramClasses=zt({},Do,i.nodeProgramClasses),i.edgeProgramClasses=zt({},Ro,i.edgeProgramClasses),i}var xs=je(St()),Ls=je($t()),Bt=1.5,On=function(r){function i(){var e;return le(this,i),e=ye(this,i),v(e,"x",.5),v(e,"y",.5),v(e,"angle",0),v(e,"ratio",1),v(e,"minRatio",null),v(e,"maxRatio",null),v(e,"enabledZooming",!0),v(e,"enabledPanning",!0),v(e,"enabledRotation",!0),v(e,"clean",null),v(e,"nextFrame",null),v(e,"previousState",null),v(e,"enabled",!0),e.previousState=e.getState(),e}return be(i,r),ce(i,[{key:"enable",value:function(){return this.enabled=!0,this}},{key:"disable",value:function(){return this.enabled=!1,this}},{key:"getState",value:function(){return{x:this.x,y:this.y,angle:this.angle,ratio:this.ratio}}},{key:"hasState",value:function(t){return this.x===t.x&&this.y===t.y&&this.ratio===t.ratio&&this.angle===t.angle}},{key:"getPreviousState",value:function(){var t=this.previousState;return t?{x:t.x,y:t.y,angle:t.angle,ratio:t.ratio}:null}},{key:"getBoundedRatio",value:function(t){var n=t;return typeof this.minRatio=="number"&&(n=Math.max(n,this.minRatio)),typeof this.maxRatio=="number"&&(n=Math.min(n,this.maxRatio)),n}},{key:"validateState",value:function(t){var n={};return this.enabledPanning&&typeof t.x=="number"&&(n.x=t.x),this.enabledPanning&&typeof t.y=="number"&&(n.y=t.y),this.enabledZooming&&typeof t.ratio=="number"&&(n.ratio=this.getBoundedRatio(t.ratio)),this.enabledRotation&&typeof t.angle=="number"&&(n.angle=t.angle),this.clean?this.clean(P(P({},this.getState()),n)):n}},{key:"isAnimated",value:function(){return!!this.nextFrame}},{key:"setState",value:function(t){if(!this.enabled)return this;this.previousState=this.getState();var n=this.validateState(t);return typeof n.x=="number"&&(this.x=n.x),typeof n.y=="number"&&(this.y=n.y),typeof n.ratio=="number"&&(this.ratio=n.ratio),typeof n.angle=="number"&&(this.angle=n.angle),this.hasState(this.previousState)||this.emit("updated",this.getState()),this}},{key:"updateState",value:function(t){return this.setState(t(this.getState())),this}},{key:"animate",value:function(t){var n=this,a=arguments.length>1&&arguments[1]!==void 0?arguments[1]:{},o=arguments.length>2?arguments[2]:void 0;if(!o)return new Promise(function(f){return n.animate(t,a,f)});if(this.enabled){var s=P(P({},Gn),a),u=this.validateState(t),h=typeof s.easing=="function"?s.easing:kn[s.easing],d=Date.now(),l=this.getState(),c=function(){var p=(Date.now()-d)/s.duration;if(p>=1){n.nextFrame=null,n.setState(u),n.animationCallback&&(n.animationCallback.call(null),n.animationCallback=void 0);return}var _=h(p),E={};typeof u.x=="number"&&(E.x=l.x+(u.x-l.x)*_),typeof u.y=="number"&&(E.y=l.y+(u.y-l.y)*_),n.enabledRotation&&typeof u.angle=="number"&&(E.angle=l.angle+(u.angle-l.angle)*_),typeof u.ratio=="number"&&(E.ratio=l.ratio+(u.ratio-l.ratio)*_),n.setState(E),n.nextFrame=requestAnimationFrame(c)};this.nextFrame?(cancelAnimationFrame(this.nextFrame),this.animationCallback&&this.animationCallback.call(null),this.nextFrame=requestAnimationFrame(c)):c(),this.animationCallback=o}}},{key:"animatedZoom",value:function(t){return t?typeof t=="number"?this.animate({ratio:this.ratio/t}):this.animate({ratio:this.ratio/(t.factor||Bt)},t):this.animate({ratio:this.ratio/Bt})}},{key:"animatedUnzoom",value:function(t){return t?typeof t=="number"?this.animate({ratio:this.ratio*t}):this.animate({ratio:this.ratio*(t.factor||Bt)},t):this.animate({ratio:this.ratio*Bt})}},{key:"animatedReset",value:function(t){return this.animate({x:.5,y:.5,ratio:1,angle:0},t)}},{key:"copy",value:function(){return i.from(this.getState())}}],[{key:"from",value:function(t){var n=new i;return n.setState(t)}}])}(Ft);function ke(r,i){var e=i.getBoundingClientRect();return{x:r.clientX-e.left,y:r.clientY-e.top}}function Ue(r,i){var e=P(P({},ke(r,i)),{},{sigmaDefaultPrevented:!1,preventSigmaDefault:function(){e.sigmaDefaultPrevented=!0},original:r});return e}function vt(r){var i="x"in r?r:P(P({},r.touches[0]||r.previousTouches[0]),{},{original:r.original,sigmaDefaultPrevented:r.sigmaDefaultPrevented,preventSigmaDefault:function(){r.sigmaDefaultPrevented=!0,i.sigmaDefaultPrevented=!0}});return i}function xo(r,i){return P(P({},Ue(r,i)),{},{delta:Wn(r)})}var Lo=2;function Ht(r){for(var i=[],e=0,t=Math.min(r.length,Lo);e<t;e++)i.push(r[e]);return i}function yt(r,i,e){var t={touches:Ht(r.touches).map(function(n){return ke(n,e)}),previousTouches:i.map(function(n){return ke(n,e)}),sigmaDefaultPrevented:!1,preventSigmaDefault:function(){t.sigmaDefaultPrevented=!0},original:r};return t}function Wn(r){if(typeof r.deltaY<"u")return r.deltaY*-3/360;if(typeof r.detail<"u")return r.detail/-9;throw new Error("Captor: could not extract delta from event.")}var jn=function(r){function i(e,t){var n;return le(this,i),n=ye(this,i),n.container=e,n.renderer=t,n}return be(i,r),ce(i)}(Ft),ko=["doubleClickTimeout","doubleClickZoomingDuration","doubleClickZoomingRatio","dragTimeout","draggedEventsTolerance","inertiaDuration","inertiaRatio","zoomDuration","zoomingRatio"],Go=ko.reduce(function(r,i){return P(P({},r),{},v({},i,Ut[i]))},{}),No=function(r){function i(e,t){var n;return le(this,i),n=ye(this,i,[e,t]),v(n,"enabled",!0),v(n,"draggedEvents",0),v(n,"downStartTime",null),v(n,"lastMouseX",null),v(n,"lastMouseY",null),v(n,"isMouseDown",!1),v(n,"isMoving",!1),v(n,"movingTimeout",null),v(n,"startCameraState",null),v(n,"clicks",0),v(n,"doubleClickTimeout",null),v(n,"currentWheelDirection",0),v(n,"settings",Go),n.handleClick=n.handleClick.bind(n),n.handleRightClick=n.handleRightClick.bind(n),n.handleDown=n.handleDown.bind(n),n.handleUp=n.handleUp.bind(n),n.handleMove=n.handleMove.bind(n),n.handleWheel=n.handleWheel.bind(n),n.handleLeave=n.handleLeave.bind(n),n.handleEnter=n.handleEnter.bind(n),e.addEventListener("click",n.handleClick,{capture:!1}),e.addEventListener("contextmenu",n.handleRightClick,{capture:!1}),e.addEventListener("mousedown",n.handleDown,{capture:!1}),e.addEventListener("wheel",n.handleWheel,{capture:!1}),e.addEventListener("mouseleave",n.handleLeave,{capture:!1}),e.addEventListener("mouseenter",n.handleEnter,{capture:!1}),document.addEventListener("mousemove",n.handleMove,{capture:!1}),document.addEventListener("mouseup",n.handleUp,{capture:!1}),n}return be(i,r),ce(i,[{key:"kill",value:function(){var t=this.container;t.removeEventListener("click",this.handleClick),t.removeEventListener("contextmenu",this.handleRightClick),t.removeEventListener("mousedown",this.handleDown),t.removeEventListener("wheel",this.handleWheel),t.removeEventListener("mouseleave",this.handleLeave),t.removeEventListener("mouseenter",this.handleEnter),document.removeEventListener("mousemove",this.handleMove),document.removeEventListener("mouseup",this.handleUp)}},{key:"handleClick",value:function(t){var n=this;if(this.enabled){if(this.clicks++,this.clicks===2)return this.clicks=0,typeof this.doubleClickTimeout=="number"&&(clearTimeout(this.doubleClickTimeout),this.doubleClickTimeout=null),this.handleDoubleClick(t);setTimeout(function(){n.clicks=0,n.doubleClickTimeout=null},this.settings.doubleClickTimeout),this.draggedEvents<this.settings.draggedEventsTolerance&&this.emit("click",Ue(t,this.container))}}},{key:"handleRightClick",value:function(t){this.enabled&&this.emit("rightClick",Ue(t,this.container))}},{key:"handleDoubleClick",value:function(t){if(this.enabled){t.preventDefault(),t.stopPropagation();var n=Ue(t,this.container);if(this.emit("doubleClick",n),!n.sigmaDefaultPrevented){var a=this.renderer.getCamera(),o=a.getBoundedRatio(a.getState().ratio/this.settings.doubleClickZoomingRatio);a.animate(this.renderer.getViewportZoomedState(ke(t,this.container),o),{easing:"quadraticInOut",duration:this.settings.doubleClickZoomingDuration})}}}},{key:"handleDown",value:function(t){if(this.enabled){if(t.button===0){this.startCameraState=this.renderer.getCamera().getState();var n=ke(t,this.container),a=n.x,o=n.y;this.lastMouseX=a,this.lastMouseY=o,this.draggedEvents=0,this.downStartTime=Date.now(),this.isMouseDown=!0}this.emit("mousedown",Ue(t,this.container))}}},{key:"handleUp",value:function(t){var n=this;if(!(!this.enabled||!this.isMouseDown)){var a=this.renderer.getCamera();this.isMouseDown=!1,typeof this.movingTimeout=="number"&&(clearTimeout(this.movingTimeout),this.movingTimeout=null);var o=ke(t,this.container),s=o.x,u=o.y,h=a.getState(),d=a.getPreviousState()||{x:0,y:0};this.isMoving?a.animate({x:h.x+this.settings.inertiaRatio*(h.x-d.x),y:h.y+this.settings.inertiaRatio*(h.y-d.y)},{duration:this.settings.inertiaDuration,easing:"quadraticOut"}):(this.lastMouseX!==s||this.lastMouseY!==u)&&a.setState({x:h.x,y:h.y}),this.isMoving=!1,setTimeout(function(){var l=n.draggedEvents>0;n.draggedEvents=0,l&&n.renderer.getSetting("hideEdgesOnMove")&&n.renderer.refresh()},0),this.emit("mouseup",Ue(t,this.container))}}},{key:"handleMove",value:function(t){var n=this;if(this.enabled){var a=Ue(t,this.container);if(this.emit("mousemovebody",a),(t.target===this.container||t.composedPath()[0]===this.container)&&this.emit("mousemove",a),!a.sigmaDefaultPrevented&&this.isMouseDown){this.isMoving=!0,this.draggedEvents++,typeof this.movingTimeout=="number"&&clearTimeout(this.movingTimeout),this.movingTimeout=window.setTimeout(function(){n.movingTimeout=null,n.isMoving=!1},this.settings.dragTimeout);var o=this.renderer.getCamera(),s=ke(t,this.container),u=s.x,h=s.y,d=this.renderer.viewportToFramedGraph({x:this.lastMouseX,y:this.lastMouseY}),l=this.renderer.viewportToFramedGraph({x:u,y:h}),c=d.x-l.x,f=d.y-l.y,p=o.getState(),_=p.x+c,E=p.y+f;o.setState({x:_,y:E}),this.lastMouseX=u,this.lastMouseY=h,t.preventDefault(),t.stopPropagation()}}}},{key:"handleLeave",value:function(t){this.emit("mouseleave",Ue(t,this.container))}},{key:"handleEnter",value:function(t){this.emit("mouseenter",Ue(t,this.container))}},{key:"handleWheel",value:function(t){var n=this,a=this.renderer.getCamera();if(!(!this.enabled||!a.enabledZooming)){var o=Wn(t);if(o){var s=xo(t,this.container);if(this.emit("wheel",s),s.sigmaDefaultPrevented){t.preventDefault(),t.stopPropagation();return}var u=a.getState().ratio,h=o>0?1/this.settings.zoomingRatio:this.settings.zoomingRatio,d=a.getBoundedRatio(u*h),l=o>0?1:-1,c=Date.now();u!==d&&(t.preventDefault(),t.stopPropagation(),!(this.currentWheelDirection===l&&this.lastWheelTriggerTime&&c-this.lastWheelTriggerTime<this.settings.zoomDuration/5)&&(a.animate(this.renderer.getViewportZoomedState(ke(t,this.container),d),{easing:"quadraticOut",duration:this.settings.zoomDuration},function(){n.currentWheelDirection=0}),this.currentWheelDirection=l,this.lastWheelTriggerTime=c))}}}},{key:"setSettings",value:function(t){this.settings=t}}])}(jn),Fo=["dragTimeout","inertiaDuration","inertiaRatio","doubleClickTimeout","doubleClickZoomingRatio","doubleClickZoomingDuration","tapMoveTolerance"],$o=Fo.reduce(function(r,i){return P(P({},r),{},v({},i,Ut[i]))},{}),Po=function(r){function i(e,t){var n;return le(this,i),n=ye(this,i,[e,t]),v(n,"enabled",!0),v(n,"isMoving",!1),v(n,"hasMoved",!1),v(n,"touchMode",0),v(n,"startTouchesPositions",[]),v(n,"lastTouches",[]),v(n,"lastTap",null),v(n,"settings",$o),n.handleStart=n.handleStart.bind(n),n.handleLeave=n.handleLeave.bind(n),n.handleMove=n.handleMove.bind(n),e.addEventListener("touchstart",n.handleStart,{capture:!1}),e.addEventListener("touchcancel",n.handleLeave,{capture:!1}),document.addEventListener("touchend",n.handleLeave,{capture:!1,passive:!1}),document.addEventListener("touchmove",n.handleMove,{capture:!1,passive:!1}),n}return be(i,r),ce(i,[{key:"kill",value:function(){var t=this.container;t.removeEventListener("touchstart",this.handleStart),t.removeEventListener("touchcancel",this.handleLeave),document.removeEventListener("touchend",this.handleLeave),document.removeEventListener("touchmove",this.handleMove)}},{key:"getDimensions",value:function(){return{width:this.container.offsetWidth,height:this.container.offsetHeight}}},{key:"handleStart",value:function(t){var n=this;if(this.enabled){t.preventDefault();var a=Ht(t.touches);if(this.touchMode=a.length,this.startCameraState=this.renderer.getCamera().getState(),this.startTouchesPositions=a.map(function(f){return ke(f,n.container)}),this.touchMode===2){var o=Ve(this.startTouchesPositions,2),s=o[0],u=s.x,h=s.y,d=o[1],l=d.x,c=d.y;this.startTouchesAngle=Math.atan2(c-h,l-u),this.startTouchesDistance=Math.sqrt(Math.pow(l-u,2)+Math.pow(c-h,2))}this.emit("touchdown",yt(t,this.lastTouches,this.container)),this.lastTouches=a,this.lastTouchesPositions=this.startTouchesPositions}}},{key:"handleLeave",value:function(t){if(!(!this.enabled||!this.startTouchesPositions.length)){switch(t.cancelable&&t.preventDefault(),this.movingTimeout&&(this.isMoving=!1,clearTimeout(this.movingTimeout)),this.touchMode){case 2:if(t.touches.length===1){this.handleStart(t),t.preventDefault();break}case 1:if(this.isMoving){var n=this.renderer.getCamera(),a=n.getState(),o=n.getPreviousState()||{x:0,y:0};n.animate({x:a.x+this.settings.inertiaRatio*(a.x-o.x),y:a.y+this.settings.inertiaRatio*(a.y-o.y)},{duration:this.settings.inertiaDuration,easing:"quadraticOut"})}this.hasMoved=!1,this.isMoving=!1,this.touchMode=0;break}if(this.emit("touchup",yt(t,this.lastTouches,this.container)),!t.touches.length){var s=ke(this.lastTouches[0],this.container),u=this.startTouchesPositions[0],h=Math.pow(s.x-u.x,2)+Math.pow(s.y-u.y,2);if(!t.touches.length&&h<Math.pow(this.settings.tapMoveTolerance,2))if(this.lastTap&&Date.now()-this.lastTap.time<this.settings.doubleClickTimeout){var d=yt(t,this.lastTouches,this.container);if(this.emit("doubletap",d),this.lastTap=null,!d.sigmaDefaultPrevented){var l=this.renderer.getCamera(),c=l.getBoundedRatio(l.getState().ratio/this.settings.doubleClickZoomingRatio);l.animate(this.renderer.getViewportZoomedState(s,c),{easing:"quadraticInOut",duration:this.settings.doubleClickZoomingDuration})}}else{var f=yt(t,this.lastTouches,this.container);this.emit("tap",f),this.lastTap={time:Date.now(),position:f.touches[0]||f.previousTouches[0]}}}this.lastTouches=Ht(t.touches),this.startTouchesPositions=[]}}},{key:"handleMove",value:function(t){var n=this;if(!(!this.enabled||!this.startTouchesPositions.length)){t.preventDefault();var a=Ht(t.touches),o=a.map(function(j){return ke(j,n.container)}),s=this.lastTouches;this.lastTouches=a,this.lastTouchesPositions=o;var u=yt(t,s,this.container);if(this.emit("touchmove",u),!u.sigmaDefaultPrevented&&(this.hasMoved||(this.hasMoved=o.some(function(j,Z){var X=n.startTouchesPositions[Z];return X&&(j.x!==X.x||j.y!==X.y)})),!!this.hasMoved)){this.isMoving=!0,this.movingTimeout&&clearTimeout(this.movingTimeout),this.movingTimeout=window.setTimeout(function(){n.isMoving=!1},this.settings.dragTimeout);var h=this.renderer.getCamera(),d=this.startCameraState,l=this.renderer.getSetting("stagePadding");switch(this.touchMode){case 1:{var c=this.renderer.viewportToFramedGraph((this.startTouchesPositions||[])[0]),f=c.x,p=c.y,_=this.renderer.viewportToFramedGraph(o[0]),E=_.x,x=_.y;h.setState({x:d.x+f-E,y:d.y+p-x});break}case 2:{var D={x:.5,y:.5,angle:0,ratio:1},w=o[0],T=w.x,G=w.y,U=o[1],m=U.x,y=U.y,g=Math.atan2(y-G,m-T)-this.startTouchesAngle,q=Math.hypot(y-G,m-T)/this.startTouchesDistance,te=h.getBoundedRatio(d.ratio/q);D.ratio=te,D.angle=d.angle+g;var F=this.getDimensions(),C=this.renderer.viewportToFramedGraph((this.startTouchesPositions||[])[0],{cameraState:d}),b=Math.min(F.width,F.height)-2*l,L=b/F.width,A=b/F.height,O=te/b,I=T-b/2/L,M=G-b/2/A,B=[I*Math.cos(-D.angle)-M*Math.sin(-D.angle),M*Math.cos(-D.angle)+I*Math.sin(-D.angle)];I=B[0],M=B[1],D.x=C.x-I*O,D.y=C.y+M*O,h.setState(D);break}}}}}},{key:"setSettings",value:function(t){this.settings=t}}])}(jn);function Io(r){if(Array.isArray(r))return Gt(r)}function Oo(r){if(typeof Symbol<"u"&&r[Symbol.iterator]!=null||r["@@iterator"]!=null)return Array.from(r)}function zo(){throw new TypeError(`Invalid attempt to spread non-iterable instance.
-In order to be iterable, non-array objects must have a [Symbol.iterator]() method.`)}function zn(r){return Io(r)||Oo(r)||ni(r)||zo()}function Uo(r,i){if(r==null)return{};var e={};for(var t in r)if({}.hasOwnProperty.call(r,t)){if(i.includes(t))continue;e[t]=r[t]}return e}function mi(r,i){if(r==null)return{};var e,t,n=Uo(r,i);if(Object.getOwnPropertySymbols){var a=Object.getOwnPropertySymbols(r);for(t=0;t<a.length;t++)e=a[t],i.includes(e)||{}.propertyIsEnumerable.call(r,e)&&(n[e]=r[e])}return n}var Un=function(){function r(i,e){le(this,r),this.key=i,this.size=e}return ce(r,null,[{key:"compare",value:function(e,t){return e.size>t.size?-1:e.size<t.size||e.key>t.key?1:-1}}])}(),Mn=function(){function r(){le(this,r),v(this,"width",0),v(this,"height",0),v(this,"cellSize",0),v(this,"columns",0),v(this,"rows",0),v(this,"cells",{})}return ce(r,[{key:"resizeAndClear",value:function(e,t){this.width=e.width,this.height=e.height,this.cellSize=t,this.columns=Math.ceil(e.width/t),this.rows=Math.ceil(e.height/t),this.cells={}}},{key:"getIndex",value:function(e){var t=Math.floor(e.x/this.cellSize),n=Math.floor(e.y/this.cellSize);return n*this.columns+t}},{key:"add",value:function(e,t,n){var a=new Un(e,t),o=this.getIndex(n),s=this.cells[o];s||(s=[],this.cells[o]=s),s.push(a)}},{key:"organize",value:function(){for(var e in this.cells){var t=this.cells[e];t.sort(Un.compare)}}},{key:"getLabelsToDisplay",value:function(e,t){var n=this.cellSize*this.cellSize,a=n/e/e,o=a*t/n,s=Math.ceil(o),u=[];for(var h in this.cells)for(var d=this.cells[h],l=0;l<Math.min(s,d.length);l++)u.push(d[l].key);return u}}])}();function Mo(r){var i=r.graph,e=r.hoveredNode,t=r.highlightedNodes,n=r.displayedNodeLabels,a=[];return i.forEachEdge(function(o,s,u,h){(u===e||h===e||t.has(u)||t.has(h)||n.has(u)&&n.has(h))&&a.push(o)}),a}var Bn=150,Hn=50,Me=Object.prototype.hasOwnProperty;function Bo(r,i,e){if(!Me.call(e,"x")||!Me.call(e,"y"))throw new Error('Sigma: could not find a valid position (x, y) for node "'.concat(i,'". All your nodes must have a number "x" and "y". Maybe your forgot to apply a layout or your "nodeReducer" is not returning the correct data?'));return e.color||(e.color=r.defaultNodeColor),!e.label&&e.label!==""&&(e.label=null),e.label!==void 0&&e.label!==null?e.label=""+e.label:e.label=null,e.size||(e.size=2),Me.call(e,"hidden")||(e.hidden=!1),Me.call(e,"highlighted")||(e.highlighted=!1),Me.call(e,"forceLabel")||(e.forceLabel=!1),(!e.type||e.type==="")&&(e.type=r.defaultNodeType),e.zIndex||(e.zIndex=0),e}function Ho(r,i,e){return e.color||(e.color=r.defaultEdgeColor),e.label||(e.label=""),e.size||(e.size=.5),Me.call(e,"hidden")||(e.hidden=!1),Me.call(e,"forceLabel")||(e.forceLabel=!1),(!e.type||e.type==="")&&(e.type=r.defaultEdgeType),e.zIndex||(e.zIndex=0),e}var Wo=function(r){function i(e,t){var n,a=arguments.length>2&&arguments[2]!==void 0?arguments[2]:{};if(le(this,i),n=ye(this,i),v(n,"elements",{}),v(n,"canvasContexts",{}),v(n,"webGLContexts",{}),v(n,"pickingLayers",new Set),v(n,"textures",{}),v(n,"frameBuffers",{}),v(n,"activeListeners",{}),v(n,"labelGrid",new Mn),v(n,"nodeDataCache",{}),v(n,"edgeDataCache",{}),v(n,"nodeProgramIndex",{}),v(n,"edgeProgramIndex",{}),v(n,"nodesWithForcedLabels",new Set),v(n,"edgesWithForcedLabels",new Set),v(n,"nodeExtent",{x:[0,1],y:[0,1]}),v(n,"nodeZExtent",[1/0,-1/0]),v(n,"edgeZExtent",[1/0,-1/0]),v(n,"matrix",Ae()),v(n,"invMatrix",Ae()),v(n,"correctionRatio",1),v(n,"customBBox",null),v(n,"normalizationFunction",gi({x:[0,1],y:[0,1]})),v(n,"graphToViewportRatio",1),v(n,"itemIDsIndex",{}),v(n,"nodeIndices",{}),v(n,"edgeIndices",{}),v(n,"width",0),v(n,"height",0),v(n,"pixelRatio",ci()),v(n,"pickingDownSizingRatio",2*n.pixelRatio),v(n,"displayedNodeLabels",new Set),v(n,"displayedEdgeLabels",new Set),v(n,"highlightedNodes",new Set),v(n,"hoveredNode",null),v(n,"hoveredEdge",null),v(n,"renderFrame",null),v(n,"renderHighlightedNodesFrame",null),v(n,"needToProcess",!1),v(n,"checkEdgesEventsFrame",null),v(n,"nodePrograms",{}),v(n,"nodeHoverPrograms",{}),v(n,"edgePrograms",{}),n.settings=In(a),Mt(n.settings),$n(e),!(t instanceof HTMLElement))throw new Error("Sigma: container should be an html element.");n.graph=e,n.container=t,n.createWebGLContext("edges",{picking:a.enableEdgeEvents}),n.createCanvasContext("edgeLabels"),n.createWebGLContext("nodes",{picking:!0}),n.createCanvasContext("labels"),n.createCanvasContext("hovers"),n.createWebGLContext("hoverNodes"),n.createCanvasContext("mouse",{style:{touchAction:"none",userSelect:"none"}}),n.resize();for(var o in n.settings.nodeProgramClasses)n.registerNodeProgram(o,n.settings.nodeProgramClasses[o],n.settings.nodeHoverProgramClasses[o]);for(var s in n.settings.edgeProgramClasses)n.registerEdgeProgram(s,n.settings.edgeProgramClasses[s]);return n.camera=new On,n.bindCameraHandlers(),n.mouseCaptor=new No(n.elements.mouse,n),n.mouseCaptor.setSettings(n.settings),n.touchCaptor=new Po(n.elements.mouse,n),n.touchCaptor.setSettings(n.settings),n.bindEventHandlers(),n.bindGraphHandlers(),n.handleSettingsUpdate(),n.refresh(),n}return be(i,r),ce(i,[{key:"registerNodeProgram",value:function(t,n,a){return this.nodePrograms[t]&&this.nodePrograms[t].kill(),this.nodeHoverPrograms[t]&&this.nodeHoverPrograms[t].kill(),this.nodePrograms[t]=new n(this.webGLContexts.nodes,this.frameBuffers.nodes,this),this.nodeHoverPrograms[t]=new(a||n)(this.webGLContexts.hoverNodes,null,this),this}},{key:"registerEdgeProgram",value:function(t,n){return this.edgePrograms[t]&&this.edgePrograms[t].kill(),this.edgePrograms[t]=new n(this.webGLContexts.edges,this.frameBuffers.edges,this),this}},{key:"unregisterNodeProgram",value:function(t){if(this.nodePrograms[t]){var n=this.nodePrograms,a=n[t],o=mi(n,[t].map(et));a.kill(),this.nodePrograms=o}if(this.nodeHoverPrograms[t]){var s=this.nodeHoverPrograms,u=s[t],h=mi(s,[t].map(et));u.kill(),this.nodePrograms=h}return this}},{key:"unregisterEdgeProgram",value:function(t){if(this.edgePrograms[t]){var n=this.edgePrograms,a=n[t],o=mi(n,[t].map(et));a.kill(),this.edgePrograms=o}return this}},{key:"resetWebGLTexture",value:function(t){var n=this.webGLContexts[t],a=this.frameBuffers[t],o=this.textures[t];o&&n.deleteTexture(o);var s=n.createTexture();return n.bindFramebuffer(n.FRAMEBUFFER,a),n.bindTexture(n.TEXTURE_2D,s),n.texImage2D(n.TEXTURE_2D,0,n.RGBA,this.width,this.height,0,n.RGBA,n.UNSIGNED_BYTE,null),n.framebufferTexture2D(n.FRAMEBUFFER,n.COLOR_ATTACHMENT0,n.TEXTURE_2D,s,0),this.textures[t]=s,this}},{key:"bindCameraHandlers",value:function(){var t=this;return this.activeListeners.camera=function(){t.scheduleRender()},this.camera.on("updated",this.activeListeners.camera),this}},{key:"unbindCameraHandlers",value:function(){return this.camera.removeListener("updated",this.activeListeners.camera),this}},{key:"getNodeAtPosition",value:function(t){var n=t.x,a=t.y,o=oi(this.webGLContexts.nodes,this.frameBuffers.nodes,n,a,this.pixelRatio,this.pickingDownSizingRatio),s=ai.apply(void 0,zn(o)),u=this.itemIDsIndex[s];return u&&u.type==="node"?u.id:null}},{key:"bindEventHandlers",value:function(){var t=this;this.activeListeners.handleResize=function(){t.scheduleRefresh()},window.addEventListener("resize",this.activeListeners.handleResize),this.activeListeners.handleMove=function(a){var o=vt(a),s={event:o,preventSigmaDefault:function(){o.preventSigmaDefault()}},u=t.getNodeAtPosition(o);if(u&&t.hoveredNode!==u&&!t.nodeDataCache[u].hidden){t.hoveredNode&&t.emit("leaveNode",P(P({},s),{},{node:t.hoveredNode})),t.hoveredNode=u,t.emit("enterNode",P(P({},s),{},{node:u})),t.scheduleHighlightedNodesRender();return}if(t.hoveredNode&&t.getNodeAtPosition(o)!==t.hoveredNode){var h=t.hoveredNode;t.hoveredNode=null,t.emit("leaveNode",P(P({},s),{},{node:h})),t.scheduleHighlightedNodesRender();return}if(t.settings.enableEdgeEvents){var d=t.hoveredNode?null:t.getEdgeAtPoint(s.event.x,s.event.y);d!==t.hoveredEdge&&(t.hoveredEdge&&t.emit("leaveEdge",P(P({},s),{},{edge:t.hoveredEdge})),d&&t.emit("enterEdge",P(P({},s),{},{edge:d})),t.hoveredEdge=d)}},this.activeListeners.handleMoveBody=function(a){var o=vt(a);t.emit("moveBody",{event:o,preventSigmaDefault:function(){o.preventSigmaDefault()}})},this.activeListeners.handleLeave=function(a){var o=vt(a),s={event:o,preventSigmaDefault:function(){o.preventSigmaDefault()}};t.hoveredNode&&(t.emit("leaveNode",P(P({},s),{},{node:t.hoveredNode})),t.scheduleHighlightedNodesRender()),t.settings.enableEdgeEvents&&t.hoveredEdge&&(t.emit("leaveEdge",P(P({},s),{},{edge:t.hoveredEdge})),t.scheduleHighlightedNodesRender()),t.emit("leaveStage",P({},s))},this.activeListeners.handleEnter=function(a){var o=vt(a),s={event:o,preventSigmaDefault:function(){o.preventSigmaDefault()}};t.emit("enterStage",P({},s))};var n=function(o){return function(s){var u=vt(s),h={event:u,preventSigmaDefault:function(){u.preventSigmaDefault()}},d=t.getNodeAtPosition(u);if(d)return t.emit("".concat(o,"Node"),P(P({},h),{},{node:d}));if(t.settings.enableEdgeEvents){var l=t.getEdgeAtPoint(u.x,u.y);if(l)return t.emit("".concat(o,"Edge"),P(P({},h),{},{edge:l}))}return t.emit("".concat(o,"Stage"),h)}};return this.activeListeners.handleClick=n("click"),this.activeListeners.handleRightClick=n("rightClick"),this.activeListeners.handleDoubleClick=n("doubleClick"),this.activeListeners.handleWheel=n("wheel"),this.activeListeners.handleDown=n("down"),this.activeListeners.handleUp=n("up"),this.mouseCaptor.on("mousemove",this.activeListeners.handleMove),this.mouseCaptor.on("mousemovebody",this.activeListeners.handleMoveBody),this.mouseCaptor.on("click",this.activeListeners.handleClick),this.mouseCaptor.on("rightClick",this.activeListeners.handleRightClick),this.mouseCaptor.on("doubleClick",this.activeListeners.handleDoubleClick),this.mouseCaptor.on("wheel",this.activeListeners.handleWheel),this.mouseCaptor.on("mousedown",this.activeListeners.handleDown),this.mouseCaptor.on("mouseup",this.activeListeners.handleUp),this.mouseCaptor.on("mouseleave",this.activeListeners.handleLeave),this.mouseCaptor.on("mouseenter",this.activeListeners.handleEnter),this.touchCaptor.on("touchdown",this.activeListeners.handleDown),this.touchCaptor.on("touchdown",this.activeListeners.handleMove),this.touchCaptor.on("touchup",this.activeListeners.handleUp),this.touchCaptor.on("touchmove",this.activeListeners.handleMove),this.touchCaptor.on("tap",this.activeListeners.handleClick),this.touchCaptor.on("doubletap",this.activeListeners.handleDoubleClick),this.touchCaptor.on("touchmove",this.activeListeners.handleMoveBody),this}},{key:"bindGraphHandlers",value:function(){var t=this,n=this.graph,a=new Set(["x","y","zIndex","type"]);return this.activeListeners.eachNodeAttributesUpdatedGraphUpdate=function(o){var s,u=(s=o.hints)===null||s===void 0?void 0:s.attributes;t.graph.forEachNode(function(d){return t.updateNode(d)});var h=!u||u.some(function(d){return a.has(d)});t.refresh({partialGraph:{nodes:n.nodes()},skipIndexation:!h,schedule:!0})},this.activeListeners.eachEdgeAttributesUpdatedGraphUpdate=function(o){var s,u=(s=o.hints)===null||s===void 0?void 0:s.attributes;t.graph.forEachEdge(function(d){return t.updateEdge(d)});var h=u&&["zIndex","type"].some(function(d){return u?.includes(d)});t.refresh({partialGraph:{edges:n.edges()},skipIndexation:!h,schedule:!0})},this.activeListeners.addNodeGraphUpdate=function(o){var s=o.key;t.addNode(s),t.refresh({partialGraph:{nodes:[s]},skipIndexation:!1,schedule:!0})},this.activeListeners.updateNodeGraphUpdate=function(o){var s=o.key;t.refresh({partialGraph:{nodes:[s]},skipIndexation:!1,schedule:!0})},this.activeListeners.dropNodeGraphUpdate=function(o){var s=o.key;t.removeNode(s),t.refresh({schedule:!0})},this.activeListeners.addEdgeGraphUpdate=function(o){var s=o.key;t.addEdge(s),t.refresh({partialGraph:{edges:[s]},schedule:!0})},this.activeListeners.updateEdgeGraphUpdate=function(o){var s=o.key;t.refresh({partialGraph:{edges:[s]},skipIndexation:!1,schedule:!0})},this.activeListeners.dropEdgeGraphUpdate=function(o){var s=o.key;t.removeEdge(s),t.refresh({schedule:!0})},this.activeListeners.clearEdgesGraphUpdate=function(){t.clearEdgeState(),t.clearEdgeIndices(),t.refresh({schedule:!0})},this.activeListeners.clearGraphUpdate=function(){t.clearEdgeState(),t.clearNodeState(),t.clearEdgeIndices(),t.clearNodeIndices(),t.refresh({schedule:!0})},n.on("nodeAdded",this.activeListeners.addNodeGraphUpdate),n.on("nodeDropped",this.activeListeners.dropNodeGraphUpdate),n.on("nodeAttributesUpdated",this.activeListeners.updateNodeGraphUpdate),n.on("eachNodeAttributesUpdated",this.activeListeners.eachNodeAttributesUpdatedGraphUpdate),n.on("edgeAdded",this.activeListeners.addEdgeGraphUpdate),n.on("edgeDropped",this.activeListeners.dropEdgeGraphUpdate),n.on("edgeAttributesUpdated",this.activeListeners.updateEdgeGraphUpdate),n.on("eachEdgeAttributesUpdated",this.activeListeners.eachEdgeAttributesUpdatedGraphUpdate),n.on("edgesCleared",this.activeListeners.clearEdgesGraphUpdate),n.on("cleared",this.activeListeners.clearGraphUpdate),this}},{key:"unbindGraphHandlers",value:function(){var t=this.graph;t.removeListener("nodeAdded",this.activeListeners.addNodeGraphUpdate),t.removeListener("nodeDropped",this.activeListeners.dropNodeGraphUpdate),t.removeListener("nodeAttributesUpdated",this.activeListeners.updateNodeGraphUpdate),t.removeListener("eachNodeAttributesUpdated",this.activeListeners.eachNodeAttributesUpdatedGraphUpdate),t.removeListener("edgeAdded",this.activeListeners.addEdgeGraphUpdate),t.removeListener("edgeDropped",this.activeListeners.dropEdgeGraphUpdate),t.removeListener("edgeAttributesUpdated",this.activeListeners.updateEdgeGraphUpdate),t.removeListener("eachEdgeAttributesUpdated",this.activeListeners.eachEdgeAttributesUpdatedGraphUpdate),t.removeListener("edgesCleared",this.activeListeners.clearEdgesGraphUpdate),t.removeListener("cleared",this.activeListeners.clearGraphUpdate)}},{key:"getEdgeAtPoint",value:function(t,n){var a=oi(this.webGLContexts.edges,this.frameBuffers.edges,t,n,this.pixelRatio,this.pickingDownSizingRatio),o=ai.apply(void 0,zn(a)),s=this.itemIDsIndex[o];return s&&s.type==="edge"?s.id:null}},{key:"process",value:function(){var t=this;this.emit("beforeProcess");var n=this.graph,a=this.settings,o=this.getDimensions();if(this.nodeExtent=Fn(this.graph),!this.settings.autoRescale){var s=o.width,u=o.height,h=this.nodeExtent,d=h.x,l=h.y;this.nodeExtent={x:[(d[0]+d[1])/2-s/2,(d[0]+d[1])/2+s/2],y:[(l[0]+l[1])/2-u/2,(l[0]+l[1])/2+u/2]}}this.normalizationFunction=gi(this.customBBox||this.nodeExtent);var c=new On,f=dt(c.getState(),o,this.getGraphDimensions(),this.getStagePadding());this.labelGrid.resizeAndClear(o,a.labelGridCellSize);for(var p={},_={},E={},x={},D=1,w=n.nodes(),T=0,G=w.length;T<G;T++){var U=w[T],m=this.nodeDataCache[U],y=n.getNodeAttributes(U);m.x=y.x,m.y=y.y,this.normalizationFunction.applyTo(m),typeof m.label=="string"&&!m.hidden&&this.labelGrid.add(U,m.size,this.framedGraphToViewport(m,{matrix:f})),p[m.type]=(p[m.type]||0)+1}this.labelGrid.organize();for(var g in this.nodePrograms){if(!Me.call(this.nodePrograms,g))throw new Error('Sigma: could not find a suitable program for node type "'.concat(g,'"!'));this.nodePrograms[g].reallocate(p[g]||0),p[g]=0}this.settings.zIndex&&this.nodeZExtent[0]!==this.nodeZExtent[1]&&(w=fi(this.nodeZExtent,function(he){return t.nodeDataCache[he].zIndex},w));for(var q=0,te=w.length;q<te;q++){var F=w[q];_[F]=D,x[_[F]]={type:"node",id:F},D++;var C=this.nodeDataCache[F];this.addNodeToProgram(F,_[F],p[C.type]++)}for(var b={},L=n.edges(),A=0,O=L.length;A<O;A++){var I=L[A],M=this.edgeDataCache[I];b[M.type]=(b[M.type]||0)+1}this.settings.zIndex&&this.edgeZExtent[0]!==this.edgeZExtent[1]&&(L=fi(this.edgeZExtent,function(he){return t.edgeDataCache[he].zIndex},L));for(var B in this.edgePrograms){if(!Me.call(this.edgePrograms,B))throw new Error('Sigma: could not find a suitable program for edge type "'.concat(B,'"!'));this.edgePrograms[B].reallocate(b[B]||0),b[B]=0}for(var j=0,Z=L.length;j<Z;j++){var X=L[j];E[X]=D,x[E[X]]={type:"edge",id:X},D++;var se=this.edgeDataCache[X];this.addEdgeToProgram(X,E[X],b[se.type]++)}return this.itemIDsIndex=x,this.nodeIndices=_,this.edgeIndices=E,this.emit("afterProcess"),this}},{key:"handleSettingsUpdate",value:function(t){var n=this,a=this.settings;if(this.camera.minRatio=a.minCameraRatio,this.camera.maxRatio=a.maxCameraRatio,this.camera.enabledZooming=a.enableCameraZooming,this.camera.enabledPanning=a.enableCameraPanning,this.camera.enabledRotation=a.enableCameraRotation,a.cameraPanBoundaries?this.camera.clean=function(d){return n.cleanCameraState(d,a.cameraPanBoundaries&&Ot(a.cameraPanBoundaries)==="object"?a.cameraPanBoundaries:{})}:this.camera.clean=null,this.camera.setState(this.camera.validateState(this.camera.getState())),t){if(t.edgeProgramClasses!==a.edgeProgramClasses){for(var o in a.edgeProgramClasses)a.edgeProgramClasses[o]!==t.edgeProgramClasses[o]&&this.registerEdgeProgram(o,a.edgeProgramClasses[o]);for(var s in t.edgeProgramClasses)a.edgeProgramClasses[s]||this.unregisterEdgeProgram(s)}if(t.nodeProgramClasses!==a.nodeProgramClasses||t.nodeHoverProgramClasses!==a.nodeHoverProgramClasses){for(var u in a.nodeProgramClasses)(a.nodeProgramClasses[u]!==t.nodeProgramClasses[u]||a.nodeHoverProgramClasses[u]!==t.nodeHoverProgramClasses[u])&&this.registerNodeProgram(u,a.nodeProgramClasses[u],a.nodeHoverProgramClasses[u]);for(var h in t.nodeProgramClasses)a.nodeProgramClasses[h]||this.unregisterNodeProgram(h)}}return this.mouseCaptor.setSettings(this.settings),this.touchCaptor.setSettings(this.settings),this}},{key:"cleanCameraState",value:function(t){var n=arguments.length>1&&arguments[1]!==void 0?arguments[1]:{},a=n.tolerance,o=a===void 0?0:a,s=n.boundaries,u=P({},t),h=s||this.nodeExtent,d=Ve(h.x,2),l=d[0],c=d[1],f=Ve(h.y,2),p=f[0],_=f[1],E=[this.graphToViewport({x:l,y:p},{cameraState:t}),this.graphToViewport({x:c,y:p},{cameraState:t}),this.graphToViewport({x:l,y:_},{cameraState:t}),this.graphToViewport({x:c,y:_},{cameraState:t})],x=1/0,D=-1/0,w=1/0,T=-1/0;E.forEach(function(b){var L=b.x,A=b.y;x=Math.min(x,L),D=Math.max(D,L),w=Math.min(w,A),T=Math.max(T,A)});var G=D-x,U=T-w,m=this.getDimensions(),y=m.width,g=m.height,q=0,te=0;if(G>=y?D<y-o?q=D-(y-o):x>o&&(q=x-o):D>y+o?q=D-(y+o):x<-o&&(q=x+o),U>=g?T<g-o?te=T-(g-o):w>o&&(te=w-o):T>g+o?te=T-(g+o):w<-o&&(te=w+o),q||te){var F=this.viewportToFramedGraph({x:0,y:0},{cameraState:t}),C=this.viewportToFramedGraph({x:q,y:te},{cameraState:t});q=C.x-F.x,te=C.y-F.y,u.x+=q,u.y+=te}return u}},{key:"renderLabels",value:function(){if(!this.settings.renderLabels)return this;var t=this.camera.getState(),n=this.labelGrid.getLabelsToDisplay(t.ratio,this.settings.labelDensity);pi(n,this.nodesWithForcedLabels),this.displayedNodeLabels=new Set;for(var a=this.canvasContexts.labels,o=0,s=n.length;o<s;o++){var u=n[o],h=this.nodeDataCache[u];if(!this.displayedNodeLabels.has(u)&&!h.hidden){var d=this.framedGraphToViewport(h),l=d.x,c=d.y,f=this.scaleSize(h.size);if(!(!h.forceLabel&&f<this.settings.labelRenderedSizeThreshold)&&!(l<-Bn||l>this.width+Bn||c<-Hn||c>this.height+Hn)){this.displayedNodeLabels.add(u);var p=this.settings.defaultDrawNodeLabel,_=this.nodePrograms[h.type],E=_?.drawLabel||p;E(a,P(P({key:u},h),{},{size:f,x:l,y:c}),this.settings)}}}return this}},{key:"renderEdgeLabels",value:function(){if(!this.settings.renderEdgeLabels)return this;var t=this.canvasContexts.edgeLabels;t.clearRect(0,0,this.width,this.height);var n=Mo({graph:this.graph,hoveredNode:this.hoveredNode,displayedNodeLabels:this.displayedNodeLabels,highlightedNodes:this.highlightedNodes});pi(n,this.edgesWithForcedLabels);for(var a=new Set,o=0,s=n.length;o<s;o++){var u=n[o],h=this.graph.extremities(u),d=this.nodeDataCache[h[0]],l=this.nodeDataCache[h[1]],c=this.edgeDataCache[u];if(!a.has(u)&&!(c.hidden||d.hidden||l.hidden)){var f=this.settings.defaultDrawEdgeLabel,p=this.edgePrograms[c.type],_=p?.drawLabel||f;_(t,P(P({key:u},c),{},{size:this.scaleSize(c.size)}),P(P(P({key:h[0]},d),this.framedGraphToViewport(d)),{},{size:this.scaleSize(d.size)}),P(P(P({key:h[1]},l),this.framedGraphToViewport(l)),{},{size:this.scaleSize(l.size)}),this.settings),a.add(u)}}return this.displayedEdgeLabels=a,this}},{key:"renderHighlightedNodes",value:function(){var t=this,n=this.canvasContexts.hovers;n.clearRect(0,0,this.width,this.height);var a=function(f){var p=t.nodeDataCache[f],_=t.framedGraphToViewport(p),E=_.x,x=_.y,D=t.scaleSize(p.size),w=t.settings.defaultDrawNodeHover,T=t.nodePrograms[p.type],G=T?.drawHover||w;G(n,P(P({key:f},p),{},{size:D,x:E,y:x}),t.settings)},o=[];this.hoveredNode&&!this.nodeDataCache[this.hoveredNode].hidden&&o.push(this.hoveredNode),this.highlightedNodes.forEach(function(c){c!==t.hoveredNode&&o.push(c)}),o.forEach(function(c){return a(c)});var s={};o.forEach(function(c){var f=t.nodeDataCache[c].type;s[f]=(s[f]||0)+1});for(var u in this.nodeHoverPrograms)this.nodeHoverPrograms[u].reallocate(s[u]||0),s[u]=0;o.forEach(function(c){var f=t.nodeDataCache[c];t.nodeHoverPrograms[f.type].process(0,s[f.type]++,f)}),this.webGLContexts.hoverNodes.clear(this.webGLContexts.hoverNodes.COLOR_BUFFER_BIT);var h=this.getRenderParams();for(var d in this.nodeHoverPrograms){var l=this.nodeHoverPrograms[d];l.render(h)}}},{key:"scheduleHighlightedNodesRender",value:function(){var t=this;this.renderHighlightedNodesFrame||this.renderFrame||(this.renderHighlightedNodesFrame=requestAnimationFrame(function(){t.renderHighlightedNodesFrame=null,t.renderHighlightedNodes(),t.renderEdgeLabels()}))}},{key:"render",value:function(){var t=this;this.emit("beforeRender");var n=function(){return t.emit("afterRender"),t};if(this.renderFrame&&(cancelAnimationFrame(this.renderFrame),this.renderFrame=null),this.resize(),this.needToProcess&&this.process(),this.needToProcess=!1,this.clear(),this.pickingLayers.forEach(function(E){return t.resetWebGLTexture(E)}),!this.graph.order)return n();var a=this.mouseCaptor,o=this.camera.isAnimated()||a.isMoving||a.draggedEvents||a.currentWheelDirection,s=this.camera.getState(),u=this.getDimensions(),h=this.getGraphDimensions(),d=this.getStagePadding();this.matrix=dt(s,u,h,d),this.invMatrix=dt(s,u,h,d,!0),this.correctionRatio=Nn(this.matrix,s,u),this.graphToViewportRatio=this.getGraphToViewportRatio();var l=this.getRenderParams();for(var c in this.nodePrograms){var f=this.nodePrograms[c];f.render(l)}if(!this.settings.hideEdgesOnMove||!o)for(var p in this.edgePrograms){var _=this.edgePrograms[p];_.render(l)}return this.settings.hideLabelsOnMove&&o||(this.renderLabels(),this.renderEdgeLabels(),this.renderHighlightedNodes()),n()}},{key:"addNode",value:function(t){var n=Object.assign({},this.graph.getNodeAttributes(t));this.settings.nodeReducer&&(n=this.settings.nodeReducer(t,n));var a=Bo(this.settings,t,n);this.nodeDataCache[t]=a,this.nodesWithForcedLabels.delete(t),a.forceLabel&&!a.hidden&&this.nodesWithForcedLabels.add(t),this.highlightedNodes.delete(t),a.highlighted&&!a.hidden&&this.highlightedNodes.add(t),this.settings.zIndex&&(a.zIndex<this.nodeZExtent[0]&&(this.nodeZExtent[0]=a.zIndex),a.zIndex>this.nodeZExtent[1]&&(this.nodeZExtent[1]=a.zIndex))}},{key:"updateNode",value:function(t){this.addNode(t);var n=this.nodeDataCache[t];this.normalizationFunction.applyTo(n)}},{key:"removeNode",value:function(t){delete this.nodeDataCache[t],delete this.nodeProgramIndex[t],this.highlightedNodes.delete(t),this.hoveredNode===t&&(this.hoveredNode=null),this.nodesWithForcedLabels.delete(t)}},{key:"addEdge",value:function(t){var n=Object.assign({},this.graph.getEdgeAttributes(t));this.settings.edgeReducer&&(n=this.settings.edgeReducer(t,n));var a=Ho(this.settings,t,n);this.edgeDataCache[t]=a,this.edgesWithForcedLabels.delete(t),a.forceLabel&&!a.hidden&&this.edgesWithForcedLabels.add(t),this.settings.zIndex&&(a.zIndex<this.edgeZExtent[0]&&(this.edgeZExtent[0]=a.zIndex),a.zIndex>this.edgeZExtent[1]&&(this.edgeZExtent[1]=a.zIndex))}},{key:"updateEdge",value:function(t){this.addEdge(t)}},{key:"removeEdge",value:function(t){delete this.edgeDataCache[t],delete this.edgeProgramIndex[t],this.hoveredEdge===t&&(this.hoveredEdge=null),this.edgesWithForcedLabels.delete(t)}},{key:"clearNodeIndices",value:function(){this.labelGrid=new Mn,this.nodeExtent={x:[0,1],y:[0,1]},this.nodeDataCache={},this.edgeProgramIndex={},this.nodesWithForcedLabels=new Set,this.nodeZExtent=[1/0,-1/0]}},{key:"clearEdgeIndices",value:function(){this.edgeDataCache={},this.edgeProgramIndex={},this.edgesWithForcedLabels=new Set,this.edgeZExtent=[1/0,-1/0]}},{key:"clearIndices",value:function(){this.clearEdgeIndices(),this.clearNodeIndices()}},{key:"clearNodeState",value:function(){this.displayedNodeLabels=new Set,this.highlightedNodes=new Set,this.hoveredNode=null}},{key:"clearEdgeState",value:function(){this.displayedEdgeLabels=new Set,this.highlightedNodes=new Set,this.hoveredEdge=null}},{key:"clearState",value:function(){this.clearEdgeState(),this.clearNodeState()}},{key:"addNodeToProgram",value:function(t,n,a){var o=this.nodeDataCache[t],s=this.nodePrograms[o.type];if(!s)throw new Error('Sigma: could not find a suitable program for node type "'.concat(o.type,'"!'));s.process(n,a,o),this.nodeProgramIndex[t]=a}},{key:"addEdgeToProgram",value:function(t,n,a){var o=this.edgeDataCache[t],s=this.edgePrograms[o.type];if(!s)throw new Error('Sigma: could not find a suitable program for edge type "'.concat(o.type,'"!'));var u=this.graph.extremities(t),h=this.nodeDataCache[u[0]],d=this.nodeDataCache[u[1]];s.process(n,a,h,d,o),this.edgeProgramIndex[t]=a}},{key:"getRenderParams",value:function(){return{matrix:this.matrix,invMatrix:this.invMatrix,width:this.width,height:this.height,pixelRatio:this.pixelRatio,zoomRatio:this.camera.ratio,cameraAngle:this.camera.angle,sizeRatio:1/this.scaleSize(),correctionRatio:this.correctionRatio,downSizingRatio:this.pickingDownSizingRatio,minEdgeThickness:this.settings.minEdgeThickness,antiAliasingFeather:this.settings.antiAliasingFeather}}},{key:"getStagePadding",value:function(){var t=this.settings,n=t.stagePadding,a=t.autoRescale;return a&&n||0}},{key:"createLayer",value:function(t,n){var a=arguments.length>2&&arguments[2]!==void 0?arguments[2]:{};if(this.elements[t])throw new Error('Sigma: a layer named "'.concat(t,'" already exists'));var o=Pn(n,{position:"absolute"},{class:"sigma-".concat(t)});return a.style&&Object.assign(o.style,a.style),this.elements[t]=o,"beforeLayer"in a&&a.beforeLayer?this.elements[a.beforeLayer].before(o):"afterLayer"in a&&a.afterLayer?this.elements[a.afterLayer].after(o):this.container.appendChild(o),o}},{key:"createCanvas",value:function(t){var n=arguments.length>1&&arguments[1]!==void 0?arguments[1]:{};return this.createLayer(t,"canvas",n)}},{key:"createCanvasContext",value:function(t){var n=arguments.length>1&&arguments[1]!==void 0?arguments[1]:{},a=this.createCanvas(t,n),o={preserveDrawingBuffer:!1,antialias:!1};return this.canvasContexts[t]=a.getContext("2d",o),this}},{key:"createWebGLContext",value:function(t){var n=arguments.length>1&&arguments[1]!==void 0?arguments[1]:{},a=n?.canvas||this.createCanvas(t,n);n.hidden&&a.remove();var o=P({preserveDrawingBuffer:!1,antialias:!1},n),s;s=a.getContext("webgl2",o),s||(s=a.getContext("webgl",o)),s||(s=a.getContext("experimental-webgl",o));var u=s;if(this.webGLContexts[t]=u,u.blendFunc(u.ONE,u.ONE_MINUS_SRC_ALPHA),n.picking){this.pickingLayers.add(t);var h=u.createFramebuffer();if(!h)throw new Error("Sigma: cannot create a new frame buffer for layer ".concat(t));this.frameBuffers[t]=h}return u}},{key:"killLayer",value:function(t){var n=this.elements[t];if(!n)throw new Error("Sigma: cannot kill layer ".concat(t,", which does not exist"));if(this.webGLContexts[t]){var a,o=this.webGLContexts[t];(a=o.getExtension("WEBGL_lose_context"))===null||a===void 0||a.loseContext(),delete this.webGLContexts[t]}else this.canvasContexts[t]&&delete this.canvasContexts[t];return n.remove(),delete this.elements[t],this}},{key:"getCamera",value:function(){return this.camera}},{key:"setCamera",value:function(t){this.unbindCameraHandlers(),this.camera=t,this.bindCameraHandlers()}},{key:"getContainer",value:function(){return this.container}},{key:"getGraph",value:function(){return this.graph}},{key:"setGraph",value:function(t){t!==this.graph&&(this.hoveredNode&&!t.hasNode(this.hoveredNode)&&(this.hoveredNode=null),this.hoveredEdge&&!t.hasEdge(this.hoveredEdge)&&(this.hoveredEdge=null),this.unbindGraphHandlers(),this.checkEdgesEventsFrame!==null&&(cancelAnimationFrame(this.checkEdgesEventsFrame),this.checkEdgesEventsFrame=null),this.graph=t,this.bindGraphHandlers(),this.refresh())}},{key:"getMouseCaptor",value:function(){return this.mouseCaptor}},{key:"getTouchCaptor",value:function(){return this.touchCaptor}},{key:"getDimensions",value:function(){return{width:this.width,height:this.height}}},{key:"getGraphDimensions",value:function(){var t=this.customBBox||this.nodeExtent;return{width:t.x[1]-t.x[0]||1,height:t.y[1]-t.y[0]||1}}},{key:"getNodeDisplayData",value:function(t){var n=this.nodeDataCache[t];return n?Object.assign({},n):void 0}},{key:"getEdgeDisplayData",value:function(t){var n=this.edgeDataCache[t];return n?Object.assign({},n):void 0}},{key:"getNodeDisplayedLabels",value:function(){return new Set(this.displayedNodeLabels)}},{key:"getEdgeDisplayedLabels",value:function(){return new Set(this.displayedEdgeLabels)}},{key:"getSettings",value:function(){return P({},this.settings)}},{key:"getSetting",value:function(t){return this.settings[t]}},{key:"setSetting",value:function(t,n){var a=P({},this.settings);return this.settings[t]=n,Mt(this.settings),this.handleSettingsUpdate(a),this.scheduleRefresh(),this}},{key:"updateSetting",value:function(t,n){return this.setSetting(t,n(this.settings[t])),this}},{key:"setSettings",value:function(t){var n=P({},this.settings);return this.settings=P(P({},this.settings),t),Mt(this.settings),this.handleSettingsUpdate(n),this.scheduleRefresh(),this}},{key:"resize",value:function(t){var n=this.width,a=this.height;if(this.width=this.container.offsetWidth,this.height=this.container.offsetHeight,this.pixelRatio=ci(),this.width===0)if(this.settings.allowInvalidContainer)this.width=1;else throw new Error("Sigma: Container has no width. You can set the allowInvalidContainer setting to true to stop seeing this error.");if(this.height===0)if(this.settings.allowInvalidContainer)this.height=1;else throw new Error("Sigma: Container has no height. You can set the allowInvalidContainer setting to true to stop seeing this error.");if(!t&&n===this.width&&a===this.height)return this;for(var o in this.elements){var s=this.elements[o];s.style.width=this.width+"px",s.style.height=this.height+"px"}for(var u in this.canvasContexts)this.elements[u].setAttribute("width",this.width*this.pixelRatio+"px"),this.elements[u].setAttribute("height",this.height*this.pixelRatio+"px"),this.pixelRatio!==1&&this.canvasContexts[u].scale(this.pixelRatio,this.pixelRatio);for(var h in this.webGLContexts){this.elements[h].setAttribute("width",this.width*this.pixelRatio+"px"),this.elements[h].setAttribute("height",this.height*this.pixelRatio+"px");var d=this.webGLContexts[h];if(d.viewport(0,0,this.width*this.pixelRatio,this.height*this.pixelRatio),this.pickingLayers.has(h)){var l=this.textures[h];l&&d.deleteTexture(l)}}return this.emit("resize"),this}},{key:"clear",value:function(){return this.emit("beforeClear"),this.webGLContexts.nodes.bindFramebuffer(WebGLRenderingContext.FRAMEBUFFER,null),this.webGLContexts.nodes.clear(WebGLRenderingContext.COLOR_BUFFER_BIT),this.webGLContexts.edges.bindFramebuffer(WebGLRenderingContext.FRAMEBUFFER,null),this.webGLContexts.edges.clear(WebGLRenderingContext.COLOR_BUFFER_BIT),this.webGLContexts.hoverNodes.clear(WebGLRenderingContext.COLOR_BUFFER_BIT),this.canvasContexts.labels.clearRect(0,0,this.width,this.height),this.canvasContexts.hovers.clearRect(0,0,this.width,this.height),this.canvasContexts.edgeLabels.clearRect(0,0,this.width,this.height),this.emit("afterClear"),this}},{key:"refresh",value:function(t){var n=this,a=t?.skipIndexation!==void 0?t?.skipIndexation:!1,o=t?.schedule!==void 0?t.schedule:!1,s=!t||!t.partialGraph;if(s)this.clearEdgeIndices(),this.clearNodeIndices(),this.graph.forEachNode(function(T){return n.addNode(T)}),this.graph.forEachEdge(function(T){return n.addEdge(T)});else{for(var u,h,d=((u=t.partialGraph)===null||u===void 0?void 0:u.nodes)||[],l=0,c=d?.length||0;l<c;l++){var f=d[l];if(this.updateNode(f),a){var p=this.nodeProgramIndex[f];if(p===void 0)throw new Error('Sigma: node "'.concat(f,`" can't be repaint`));this.addNodeToProgram(f,this.nodeIndices[f],p)}}for(var _=(t==null||(h=t.partialGraph)===null||h===void 0?void 0:h.edges)||[],E=0,x=_.length;E<x;E++){var D=_[E];if(this.updateEdge(D),a){var w=this.edgeProgramIndex[D];if(w===void 0)throw new Error('Sigma: edge "'.concat(D,`" can't be repaint`));this.addEdgeToProgram(D,this.edgeIndices[D],w)}}}return(s||!a)&&(this.needToProcess=!0),o?this.scheduleRender():this.render(),this}},{key:"scheduleRender",value:function(){var t=this;return this.renderFrame||(this.renderFrame=requestAnimationFrame(function(){t.render()})),this}},{key:"scheduleRefresh",value:function(t){return this.refresh(P(P({},t),{},{schedule:!0}))}},{key:"getViewportZoomedState",value:function(t,n){var a=this.camera.getState(),o=a.ratio,s=a.angle,u=a.x,h=a.y,d=this.settings,l=d.minCameraRatio,c=d.maxCameraRatio;typeof c=="number"&&(n=Math.min(n,c)),typeof l=="number"&&(n=Math.max(n,l));var f=n/o,p={x:this.width/2,y:this.height/2},_=this.viewportToFramedGraph(t),E=this.viewportToFramedGraph(p);return{angle:s,x:(_.x-E.x)*(1-f)+u,y:(_.y-E.y)*(1-f)+h,ratio:n}}},{key:"viewRectangle",value:function(){var t=this.viewportToFramedGraph({x:0,y:0}),n=this.viewportToFramedGraph({x:this.width,y:0}),a=this.viewportToFramedGraph({x:0,y:this.height});return{x1:t.x,y1:t.y,x2:n.x,y2:n.y,height:n.y-a.y}}},{key:"framedGraphToViewport",value:function(t){var n=arguments.length>1&&arguments[1]!==void 0?arguments[1]:{},a=!!n.cameraState||!!n.viewportDimensions||!!n.graphDimensions,o=n.matrix?n.matrix:a?dt(n.cameraState||this.camera.getState(),n.viewportDimensions||this.getDimensions(),n.graphDimensions||this.getGraphDimensions(),n.padding||this.getStagePadding()):this.matrix,s=It(o,t);return{x:(1+s.x)*this.width/2,y:(1-s.y)*this.height/2}}},{key:"viewportToFramedGraph",value:function(t){var n=arguments.length>1&&arguments[1]!==void 0?arguments[1]:{},a=!!n.cameraState||!!n.viewportDimensions||!n.graphDimensions,o=n.matrix?n.matrix:a?dt(n.cameraState||this.camera.getState(),n.viewportDimensions||this.getDimensions(),n.graphDimensions||this.getGraphDimensions(),n.padding||this.getStagePadding(),!0):this.invMatrix,s=It(o,{x:t.x/this.width*2-1,y:1-t.y/this.height*2});return isNaN(s.x)&&(s.x=0),isNaN(s.y)&&(s.y=0),s}},{key:"viewportToGraph",value:function(t){var n=arguments.length>1&&arguments[1]!==void 0?arguments[1]:{};return this.normalizationFunction.inverse(this.viewportToFramedGraph(t,n))}},{key:"graphToViewport",value:function(t){var n=arguments.length>1&&arguments[1]!==void 0?arguments[1]:{};return this.framedGraphToViewport(this.normalizationFunction(t),n)}},{key:"getGraphToViewportRatio",value:function(){var t={x:0,y:0},n={x:1,y:1},a=Math.sqrt(Math.pow(t.x-n.x,2)+Math.pow(t.y-n.y,2)),o=this.graphToViewport(t),s=this.graphToViewport(n),u=Math.sqrt(Math.pow(o.x-s.x,2)+Math.pow(o.y-s.y,2));return u/a}},{key:"getBBox",value:function(){return this.nodeExtent}},{key:"getCustomBBox",value:function(){return this.customBBox}},{key:"setCustomBBox",value:function(t){return this.customBBox=t,this.scheduleRender(),this}},{key:"kill",value:function(){this.emit("kill"),this.removeAllListeners(),this.unbindCameraHandlers(),window.removeEventListener("resize",this.activeListeners.handleResize),this.mouseCaptor.kill(),this.touchCaptor.kill(),this.unbindGraphHandlers(),this.clearIndices(),this.clearState(),this.nodeDataCache={},this.edgeDataCache={},this.highlightedNodes.clear(),this.renderFrame&&(cancelAnimationFrame(this.renderFrame),this.renderFrame=null),this.renderHighlightedNodesFrame&&(cancelAnimationFrame(this.renderHighlightedNodesFrame),this.renderHighlightedNodesFrame=null);for(var t=this.container;t.firstChild;)t.removeChild(t.firstChild);this.canvasContexts={},this.webGLContexts={},this.elements={};for(var n in this.nodePrograms)this.nodePrograms[n].kill();for(var a in this.nodeHoverPrograms)this.nodeHoverPrograms[a].kill();for(var o in this.edgePrograms)this.edgePrograms[o].kill();this.nodePrograms={},this.nodeHoverPrograms={},this.edgePrograms={};for(var s in this.elements)this.killLayer(s)}},{key:"scaleSize",value:function(){var t=arguments.length>0&&arguments[0]!==void 0?arguments[0]:1,n=arguments.length>1&&arguments[1]!==void 0?arguments[1]:this.camera.ratio;return t/this.settings.zoomToSizeRatioFunction(n)*(this.getSetting("itemSizesReference")==="positions"?n*this.graphToViewportRatio:1)}},{key:"getCanvases",value:function(){var t={};for(var n in this.elements)this.elements[n]instanceof HTMLCanvasElement&&(t[n]=this.elements[n]);return t}}])}(Ft),Vn=Wo;var Ti=je(or()),Vt=je(sr()),hr=je(ur());Vt.default.extend(hr.default);document.addEventListener("DOMContentLoaded",()=>{console.log("DOM fully loaded and parsed (Phase 7 Version - Disappearing Fix)");let r=document.getElementById("graph-container"),i=document.getElementById("loading-indicator"),e=document.getElementById("error-display"),t=document.getElementById("start-time-slider"),n=document.getElementById("end-time-slider"),a=document.getElementById("start-time-label"),o=document.getElementById("end-time-label"),s=document.getElementById("layout-button"),u=document.createElement("div");u.className="sigma-tooltip",document.body.appendChild(u);let h=null,d=null,l=0,c=0,f=0,p=0,_=!1,E=!1,x=null,D=0,w=0,T=!1,G=null,U=null,m=null,y=new Set,g="/graph-data",q=400,te=100,F=50,C=2,b=15,L=.8,A="#f00",O="#00f",I="#fcba03",M="#f0f0f0",B="#fafafa",j={r:200,g:200,b:200},Z={r:0,g:100,b:255},X="#ccc";console.log("Day.js initialized with UTC plugin.");function se(N,$="Loading / Calculating Layout..."){i.textContent=$,i.classList.toggle("hidden",!N),N&&e.classList.add("hidden")}function he(N){e.textContent=N||"An error occurred.",e.classList.remove("hidden"),se(!1)}function qe(){e.classList.add("hidden")}function Ee(N){if(N==null||isNaN(N))return"-";if(typeof Vt.default!="function"){console.warn("Day.js not available for formatting.");let R=Number(N);if(isNaN(R))return"-";try{return new Date(R).toISOString()}catch{return"-"}}let $=Number(N);return isNaN($)?"-":Vt.default.utc($).format("YYYY-MM-DD HH:mm [UTC]")}function pe(N,$,R){u.innerHTML=N,u.style.display="block";let H=u.getBoundingClientRect(),W=document.body.getBoundingClientRect(),ie=$+15,Te=R+15;ie+H.width>W.width&&(ie=$-15-H.width),Te+H.height>W.height&&(Te=R-15-H.height),u.style.left=`${ie}px`,u.style.top=`${Te}px`}function Ne(){u.style.display="none"}function Xe(N,$,R){R=Math.max(0,Math.min(1,R));let H=Math.round(N.r+($.r-N.r)*R),W=Math.round(N.g+($.g-N.g)*R),ie=Math.round(N.b+($.b-N.b)*R);return`rgb(${H},${W},${ie})`}function Je(){let N="0123456789ABCDEF",$="#";for(let R=0;R<6;R++)$+=N[Math.floor(Math.random()*16)];return $}let lr=(N,$)=>{let R={...$};return m===N?(R.color=O,R.highlighted=!1,R.zIndex=3):G===N?(R.color=A,R.highlighted=!1,R.zIndex=2):y.size>0&&!y.has(N)?(R.color=M,R.label=null,R.highlighted=!1,R.zIndex=0):y.has(N)?(R.color=I,R.highlighted=!0,R.zIndex=1):(R.color=$.originalColor||Je(),R.highlighted=!1,R.zIndex=1),R},cr=(N,$)=>{let R={...$},H=d.source(N),W=d.target(N),ie=H===m,Te=W===m,Re=H===G,We=W===G,J=y.has(H)&&y.has(W);if(y.size>0&&!J)R.color=B,R.hidden=!0,R.zIndex=0;else{let re=$.timestamp,ae=p-f,xe=.5;ae>0&&re>=f&&re<=p?xe=(re-f)/ae:re<f?xe=0:re>p&&(xe=1),R.color=Xe(j,Z,xe),R.hidden=!1,R.zIndex=0}return ie||Te?(R.color=O,R.hidden=!1,R.zIndex=2):(Re||We)&&(R.color=A,R.hidden=!1,R.zIndex=1),R};function fr(){if(console.log("Initializing Sigma.js (Phase 7 - Sync Layout)..."),!r){console.error("Graph container #graph-container not found!"),he("Graph container element is missing.");return}try{d=new ee({multi:!0,type:"directed"}),h=new Vn(d,r,{allowInvalidContainer:!0,defaultNodeType:"circle",defaultEdgeType:"arrow",nodeReducer:lr,edgeReducer:cr,labelDensity:.1,labelGridCellSize:150,labelRenderedSizeThreshold:8,labelFont:"Lato, sans-serif",zIndex:!0,hideEdgesOnMove:!0,hideLabelsOnMove:!0,enableCameraInteraction:!0}),console.log("Sigma.js instance created."),gr(),console.log("Sigma.js initialized successfully.")}catch(N){console.error("Error initializing Sigma:",N),he(`Failed to initialize graph visualization: ${N.message}. Check browser console.`),h=null,d=null}}function gr(){if(!h)return;console.log("Setting up Sigma event handlers (Phase 7)..."),h.on("downNode",$=>{if(!$.event.original.ctrlKey){E=!0,x=$.node;let R=d.getNodeAttributes(x),H=h.graphToViewport(R),W={x:$.event.x,y:$.event.y};D=W.x-H.x,w=W.y-H.y,h.getCamera().disable()}}),h.getMouseCaptor().on("mousemove",$=>{if(!E||!x)return;let R={x:$.x,y:$.y},H={x:R.x-D,y:R.y-w},W=h.viewportToGraph(H);d.setNodeAttribute(x,"x",W.x),d.setNodeAttribute(x,"y",W.y)});let N=()=>{E=!1,x=null,h&&h.getCamera().enable()};h.getMouseCaptor().on("mouseup",N),h.getMouseCaptor().on("mouseleave",N),h.on("enterNode",$=>{if(!E){G=$.node,y.clear(),y.add(G),m!==G&&d.neighbors(G).forEach(W=>y.add(W)),m&&m!==G&&(y.add(m),d.neighbors(m).forEach(W=>y.add(W)));let R=d.getNodeAttributes(G),H=`ID: ${R.label}<br>Degree (window): ${R.degree}`;pe(H,$.event.x,$.event.y),h.refresh()}}),h.on("leaveNode",$=>{E||(G=null,Ne(),m?(y.clear(),y.add(m),d.neighbors(m).forEach(R=>y.add(R))):y.clear(),h.refresh())}),h.on("clickNode",$=>{if(!E){let R=$.node;m===R?(m=null,y.clear()):(m=R,y.clear(),y.add(m),d.neighbors(m).forEach(H=>y.add(H))),console.log(`Selected node: ${m}`),h.refresh()}}),h.on("clickStage",()=>{m&&!E&&(m=null,y.clear(),console.log("Selected node cleared by stage click."),h.refresh())})}async function Si(N=null,$=null){if(!d||!h||_)return;T=!1,console.log(`Fetching graph data for window: ${N} -> ${$}`),_=!0,se(!0),qe(),f=N===null?l:Math.round(N),p=$===null?c:Math.round($),f>p&&(f=p);let R=new URLSearchParams;R.append("start_time",String(f)),R.append("end_time",String(p));let H=`${g}?${R.toString()}`;console.log(`Requesting URL: ${H}`);try{let W=await fetch(H);if(!W.ok){let J="An error occurred";try{J=(await W.json()).error||`HTTP error ${W.status}`}catch{J=`HTTP error ${W.status}: ${W.statusText}`}throw new Error(J)}let ie=await W.json();if(console.log(`Data received: ${ie.nodes?.length||0} nodes, ${ie.links?.length||0} links`),!ie||!Array.isArray(ie.nodes)||!Array.isArray(ie.links))throw new Error("Invalid data structure received from backend.");let Te={};d.order>0&&d.forEachNode((J,re)=>{re.x!==void 0&&re.y!==void 0&&(Te[J]={x:re.x,y:re.y})}),d.clear(),console.log("Populating graphology instance...");let Re=0;ie.nodes.forEach(J=>{if(J.id===null||J.id===void 0)return;let re=Te[J.id],ae=J.degree||0,xe=C+Math.sqrt(ae)*L,Et=Math.max(C,Math.min(xe,b)),Pe=Je();try{d.addNode(J.id,{label:J.label||String(J.id),x:re?.x??Math.random()*1e3,y:re?.y??Math.random()*1e3,size:Et,degree:ae,color:Pe,originalColor:Pe,zIndex:1}),Re++}catch(me){console.error(`Error adding node ${J.id}:`,me)}});let We=0;if(ie.links.forEach(J=>{if(!J.source||!J.target)return;let re=String(J.source),ae=String(J.target);if(d.hasNode(re)&&d.hasNode(ae))try{!d.multi&&d.hasEdge(re,ae)?d.multi&&(d.addEdge(re,ae,{timestamp:J.timestamp,type:"arrow",size:.5,zIndex:0}),We++):(d.addEdge(re,ae,{timestamp:J.timestamp,type:"arrow",size:.5,zIndex:0}),We++)}catch{}}),console.log(`Graph populated: ${Re} nodes, ${We} edges.`),d.order===0&&console.warn("Graph is empty after population."),N===null&&$===null){console.log("Performing initial slider setup..."),l=ie.min_timestamp,c=ie.max_timestamp;let J=Date.now();(l==null||isNaN(l)||c===null||c===void 0||isNaN(c)||l>c)&&(console.warn("Received invalid overall timestamps from backend or range is invalid. Using defaults (last 7 days)."),l=J-7*24*60*60*1e3,c=J),f=l,p=c,console.log(`Overall time range: ${l} -> ${c}`),console.log(`Formatted: ${Ee(l)} -> ${Ee(c)}`),l<=c?(t.min=String(l),t.max=String(c),n.min=String(l),n.max=String(c),t.value=String(l),n.value=String(c),a.textContent=Ee(l),o.textContent=Ee(c),t.disabled=!1,n.disabled=!1,console.log("Sliders initialized and enabled.")):(console.error("Invalid overall time range after potential defaults. Cannot initialize sliders."),he("Error: Invalid time range data from server."),t.disabled=!0,n.disabled=!0)}d.order>0?(console.log("Triggering initial layout calculation..."),Ci(te)):se(!1)}catch(W){console.error("Failed to fetch or process graph data:",W),he(`Failed to load graph data: ${W.message}`),d.clear(),se(!1)}finally{_=!1,console.log("fetchAndPopulateGraph finished.")}}function Ci(N,$=!1){if(typeof Ti.default!="function"){console.error("Layout library (forceAtlas2Layout assign function) not loaded or imported correctly!"),he("Layout engine failed to load.");return}if(!d||!h||d.order===0){console.log("Skipping layout: Graph empty or not initialized.");return}let R=N!==void 0?N:te;console.log(`Applying ForceAtlas2 layout (${R} iterations)...`),se(!0,"Calculating Layout..."),setTimeout(()=>{let H={iterations:R,settings:{barnesHutOptimize:d.order>1e3,barnesHutTheta:.6,gravity:1,scalingRatio:10,strongGravityMode:!1,slowDown:1+Math.log(d.order)/10,adjustSizes:!1}};console.time("Layout Calculation");let W=!1;try{Ti.default.assign(d,H),console.timeEnd("Layout Calculation"),console.log("ForceAtlas2 layout applied."),W=!0;let ie=!1;d.forEachNode((Te,Re)=>{(!isFinite(Re.x)||!isFinite(Re.y))&&(console.error(`  Node ${Te}: INVALID coordinates after layout! x=${Re.x}, y=${Re.y}`),ie=!0)}),ie&&he("Layout produced invalid coordinates! Graph might disappear or camera might fail.")}catch(ie){console.error("Error applying ForceAtlas2 layout:",ie),he("Error occurred during graph layout."),console.timeEnd("Layout Calculation")}finally{se(!1),console.log("applyLayout finished.")}},10)}function is(){if(!h||d.order===0)return;console.log("Applying camera centering and zoom..."),console.log("Camera state BEFORE centering:",h.getCamera().getState());let N=1/0,$=-1/0,R=1/0,H=-1/0,W=!1;if(d.forEachNode((Pe,me)=>{isFinite(me.x)&&isFinite(me.y)?(me.x<N&&(N=me.x),me.x>$&&($=me.x),me.y<R&&(R=me.y),me.y>H&&(H=me.y),W=!0):console.warn(`Node ${Pe} has invalid coordinates (x=${me.x}, y=${me.y}) - skipping for bound calculation.`)}),!W){console.warn("Cannot center camera: No nodes with finite coordinates found after layout."),h.getCamera().animate({x:.5,y:.5,ratio:1,angle:0},{duration:200});return}if(N===1/0||R===1/0||$===-1/0||H===-1/0||N===$&&R===H){console.warn("Cannot determine valid bounds for camera centering (single point or invalid bounds). Using default view.");let Pe=d.findNode(Ri=>isFinite(d.getNodeAttribute(Ri,"x"))&&isFinite(d.getNodeAttribute(Ri,"y"))),me=Pe?d.getNodeAttribute(Pe,"x"):.5,mr=Pe?d.getNodeAttribute(Pe,"y"):.5;h.getCamera().animate({x:me,y:mr,ratio:1,angle:0},{duration:200});return}let ie=$-N||1,Te=H-R||1,Re=ie/Te,{width:We,height:J}=h.getDimensions(),re=We/J,ae;Re>re?ae=ie/We:ae=Te/J,ae*=1.2,ae=h.getCamera().getBoundedRatio(ae),(!isFinite(ae)||ae<=0)&&(console.warn(`Calculated invalid targetRatio (${ae}). Resetting ratio to 1.`),ae=1);let xe=(N+$)/2,Et=(R+H)/2;console.log(`Centering camera on graph coords [${xe.toFixed(2)}, ${Et.toFixed(2)}] with ratio ${ae.toFixed(3)}`),h.getCamera().animate({x:xe,y:Et,ratio:ae,angle:0},{duration:300}).then(()=>{console.log("Camera animation finished. Final state:",h.getCamera().getState())})}function pr(N,$){let R;return function(...H){let W=this;clearTimeout(R),R=setTimeout(()=>{N.apply(W,H)},$)}}function Ai(){let N=parseInt(t.value,10),$=parseInt(n.value,10),R=parseInt(t.min,10),H=parseInt(n.max,10);N=isNaN(N)?isNaN(R)?l:R:N,$=isNaN($)?isNaN(H)?c:H:$,this===t&&N>$?(n.value=String(N),$=N):this===n&&$<N&&(t.value=String($),N=$),f=N,p=$,a.textContent=Ee(N),o.textContent=Ee($),h&&h.refresh()}let Di=pr(()=>{if(t.disabled||n.disabled)return;let N=parseInt(t.value,10),$=parseInt(n.value,10);N=isNaN(N)?l:N,$=isNaN($)?c:$,N>$&&(N=$),console.log("Debounced fetch triggered..."),Si(N,$)},q);t.addEventListener("input",Ai),n.addEventListener("input",Ai),t.addEventListener("change",Di),n.addEventListener("change",Di),s&&s.addEventListener("click",()=>{console.log("Manual layout trigger clicked."),Ci(F,!0)}),fr(),h&&d?Si():(console.error("Skipping initial data fetch: Sigma/Graphology failed initialization."),t.disabled=!0,n.disabled=!0,s&&(s.disabled=!0))});var dr=document.createElement("style");dr.textContent=`
+In order to be iterable, non-array objects must have a [Symbol.iterator]() method.`)}function zn(r){return Io(r)||Oo(r)||ni(r)||zo()}function Uo(r,i){if(r==null)return{};var e={};for(var t in r)if({}.hasOwnProperty.call(r,t)){if(i.includes(t))continue;e[t]=r[t]}return e}function mi(r,i){if(r==null)return{};var e,t,n=Uo(r,i);if(Object.getOwnPropertySymbols){var a=Object.getOwnPropertySymbols(r);for(t=0;t<a.length;t++)e=a[t],i.includes(e)||{}.propertyIsEnumerable.call(r,e)&&(n[e]=r[e])}return n}var Un=function(){function r(i,e){le(this,r),this.key=i,this.size=e}return ce(r,null,[{key:"compare",value:function(e,t){return e.size>t.size?-1:e.size<t.size||e.key>t.key?1:-1}}])}(),Mn=function(){function r(){le(this,r),v(this,"width",0),v(this,"height",0),v(this,"cellSize",0),v(this,"columns",0),v(this,"rows",0),v(this,"cells",{})}return ce(r,[{key:"resizeAndClear",value:function(e,t){this.width=e.width,this.height=e.height,this.cellSize=t,this.columns=Math.ceil(e.width/t),this.rows=Math.ceil(e.height/t),this.cells={}}},{key:"getIndex",value:function(e){var t=Math.floor(e.x/this.cellSize),n=Math.floor(e.y/this.cellSize);return n*this.columns+t}},{key:"add",value:function(e,t,n){var a=new Un(e,t),o=this.getIndex(n),s=this.cells[o];s||(s=[],this.cells[o]=s),s.push(a)}},{key:"organize",value:function(){for(var e in this.cells){var t=this.cells[e];t.sort(Un.compare)}}},{key:"getLabelsToDisplay",value:function(e,t){var n=this.cellSize*this.cellSize,a=n/e/e,o=a*t/n,s=Math.ceil(o),u=[];for(var h in this.cells)for(var d=this.cells[h],l=0;l<Math.min(s,d.length);l++)u.push(d[l].key);return u}}])}();function Mo(r){var i=r.graph,e=r.hoveredNode,t=r.highlightedNodes,n=r.displayedNodeLabels,a=[];return i.forEachEdge(function(o,s,u,h){(u===e||h===e||t.has(u)||t.has(h)||n.has(u)&&n.has(h))&&a.push(o)}),a}var Bn=150,Hn=50,Me=Object.prototype.hasOwnProperty;function Bo(r,i,e){if(!Me.call(e,"x")||!Me.call(e,"y"))throw new Error('Sigma: could not find a valid position (x, y) for node "'.concat(i,'". All your nodes must have a number "x" and "y". Maybe your forgot to apply a layout or your "nodeReducer" is not returning the correct data?'));return e.color||(e.color=r.defaultNodeColor),!e.label&&e.label!==""&&(e.label=null),e.label!==void 0&&e.label!==null?e.label=""+e.label:e.label=null,e.size||(e.size=2),Me.call(e,"hidden")||(e.hidden=!1),Me.call(e,"highlighted")||(e.highlighted=!1),Me.call(e,"forceLabel")||(e.forceLabel=!1),(!e.type||e.type==="")&&(e.type=r.defaultNodeType),e.zIndex||(e.zIndex=0),e}function Ho(r,i,e){return e.color||(e.color=r.defaultEdgeColor),e.label||(e.label=""),e.size||(e.size=.5),Me.call(e,"hidden")||(e.hidden=!1),Me.call(e,"forceLabel")||(e.forceLabel=!1),(!e.type||e.type==="")&&(e.type=r.defaultEdgeType),e.zIndex||(e.zIndex=0),e}var Wo=function(r){function i(e,t){var n,a=arguments.length>2&&arguments[2]!==void 0?arguments[2]:{};if(le(this,i),n=ye(this,i),v(n,"elements",{}),v(n,"canvasContexts",{}),v(n,"webGLContexts",{}),v(n,"pickingLayers",new Set),v(n,"textures",{}),v(n,"frameBuffers",{}),v(n,"activeListeners",{}),v(n,"labelGrid",new Mn),v(n,"nodeDataCache",{}),v(n,"edgeDataCache",{}),v(n,"nodeProgramIndex",{}),v(n,"edgeProgramIndex",{}),v(n,"nodesWithForcedLabels",new Set),v(n,"edgesWithForcedLabels",new Set),v(n,"nodeExtent",{x:[0,1],y:[0,1]}),v(n,"nodeZExtent",[1/0,-1/0]),v(n,"edgeZExtent",[1/0,-1/0]),v(n,"matrix",Ae()),v(n,"invMatrix",Ae()),v(n,"correctionRatio",1),v(n,"customBBox",null),v(n,"normalizationFunction",gi({x:[0,1],y:[0,1]})),v(n,"graphToViewportRatio",1),v(n,"itemIDsIndex",{}),v(n,"nodeIndices",{}),v(n,"edgeIndices",{}),v(n,"width",0),v(n,"height",0),v(n,"pixelRatio",ci()),v(n,"pickingDownSizingRatio",2*n.pixelRatio),v(n,"displayedNodeLabels",new Set),v(n,"displayedEdgeLabels",new Set),v(n,"highlightedNodes",new Set),v(n,"hoveredNode",null),v(n,"hoveredEdge",null),v(n,"renderFrame",null),v(n,"renderHighlightedNodesFrame",null),v(n,"needToProcess",!1),v(n,"checkEdgesEventsFrame",null),v(n,"nodePrograms",{}),v(n,"nodeHoverPrograms",{}),v(n,"edgePrograms",{}),n.settings=In(a),Mt(n.settings),$n(e),!(t instanceof HTMLElement))throw new Error("Sigma: container should be an html element.");n.graph=e,n.container=t,n.createWebGLContext("edges",{picking:a.enableEdgeEvents}),n.createCanvasContext("edgeLabels"),n.createWebGLContext("nodes",{picking:!0}),n.createCanvasContext("labels"),n.createCanvasContext("hovers"),n.createWebGLContext("hoverNodes"),n.createCanvasContext("mouse",{style:{touchAction:"none",userSelect:"none"}}),n.resize();for(var o in n.settings.nodeProgramClasses)n.registerNodeProgram(o,n.settings.nodeProgramClasses[o],n.settings.nodeHoverProgramClasses[o]);for(var s in n.settings.edgeProgramClasses)n.registerEdgeProgram(s,n.settings.edgeProgramClasses[s]);return n.camera=new On,n.bindCameraHandlers(),n.mouseCaptor=new No(n.elements.mouse,n),n.mouseCaptor.setSettings(n.settings),n.touchCaptor=new Po(n.elements.mouse,n),n.touchCaptor.setSettings(n.settings),n.bindEventHandlers(),n.bindGraphHandlers(),n.handleSettingsUpdate(),n.refresh(),n}return be(i,r),ce(i,[{key:"registerNodeProgram",value:function(t,n,a){return this.nodePrograms[t]&&this.nodePrograms[t].kill(),this.nodeHoverPrograms[t]&&this.nodeHoverPrograms[t].kill(),this.nodePrograms[t]=new n(this.webGLContexts.nodes,this.frameBuffers.nodes,this),this.nodeHoverPrograms[t]=new(a||n)(this.webGLContexts.hoverNodes,null,this),this}},{key:"registerEdgeProgram",value:function(t,n){return this.edgePrograms[t]&&this.edgePrograms[t].kill(),this.edgePrograms[t]=new n(this.webGLContexts.edges,this.frameBuffers.edges,this),this}},{key:"unregisterNodeProgram",value:function(t){if(this.nodePrograms[t]){var n=this.nodePrograms,a=n[t],o=mi(n,[t].map(et));a.kill(),this.nodePrograms=o}if(this.nodeHoverPrograms[t]){var s=this.nodeHoverPrograms,u=s[t],h=mi(s,[t].map(et));u.kill(),this.nodePrograms=h}return this}},{key:"unregisterEdgeProgram",value:function(t){if(this.edgePrograms[t]){var n=this.edgePrograms,a=n[t],o=mi(n,[t].map(et));a.kill(),this.edgePrograms=o}return this}},{key:"resetWebGLTexture",value:function(t){var n=this.webGLContexts[t],a=this.frameBuffers[t],o=this.textures[t];o&&n.deleteTexture(o);var s=n.createTexture();return n.bindFramebuffer(n.FRAMEBUFFER,a),n.bindTexture(n.TEXTURE_2D,s),n.texImage2D(n.TEXTURE_2D,0,n.RGBA,this.width,this.height,0,n.RGBA,n.UNSIGNED_BYTE,null),n.framebufferTexture2D(n.FRAMEBUFFER,n.COLOR_ATTACHMENT0,n.TEXTURE_2D,s,0),this.textures[t]=s,this}},{key:"bindCameraHandlers",value:function(){var t=this;return this.activeListeners.camera=function(){t.scheduleRender()},this.camera.on("updated",this.activeListeners.camera),this}},{key:"unbindCameraHandlers",value:function(){return this.camera.removeListener("updated",this.activeListeners.camera),this}},{key:"getNodeAtPosition",value:function(t){var n=t.x,a=t.y,o=oi(this.webGLContexts.nodes,this.frameBuffers.nodes,n,a,this.pixelRatio,this.pickingDownSizingRatio),s=ai.apply(void 0,zn(o)),u=this.itemIDsIndex[s];return u&&u.type==="node"?u.id:null}},{key:"bindEventHandlers",value:function(){var t=this;this.activeListeners.handleResize=function(){t.scheduleRefresh()},window.addEventListener("resize",this.activeListeners.handleResize),this.activeListeners.handleMove=function(a){var o=vt(a),s={event:o,preventSigmaDefault:function(){o.preventSigmaDefault()}},u=t.getNodeAtPosition(o);if(u&&t.hoveredNode!==u&&!t.nodeDataCache[u].hidden){t.hoveredNode&&t.emit("leaveNode",P(P({},s),{},{node:t.hoveredNode})),t.hoveredNode=u,t.emit("enterNode",P(P({},s),{},{node:u})),t.scheduleHighlightedNodesRender();return}if(t.hoveredNode&&t.getNodeAtPosition(o)!==t.hoveredNode){var h=t.hoveredNode;t.hoveredNode=null,t.emit("leaveNode",P(P({},s),{},{node:h})),t.scheduleHighlightedNodesRender();return}if(t.settings.enableEdgeEvents){var d=t.hoveredNode?null:t.getEdgeAtPoint(s.event.x,s.event.y);d!==t.hoveredEdge&&(t.hoveredEdge&&t.emit("leaveEdge",P(P({},s),{},{edge:t.hoveredEdge})),d&&t.emit("enterEdge",P(P({},s),{},{edge:d})),t.hoveredEdge=d)}},this.activeListeners.handleMoveBody=function(a){var o=vt(a);t.emit("moveBody",{event:o,preventSigmaDefault:function(){o.preventSigmaDefault()}})},this.activeListeners.handleLeave=function(a){var o=vt(a),s={event:o,preventSigmaDefault:function(){o.preventSigmaDefault()}};t.hoveredNode&&(t.emit("leaveNode",P(P({},s),{},{node:t.hoveredNode})),t.scheduleHighlightedNodesRender()),t.settings.enableEdgeEvents&&t.hoveredEdge&&(t.emit("leaveEdge",P(P({},s),{},{edge:t.hoveredEdge})),t.scheduleHighlightedNodesRender()),t.emit("leaveStage",P({},s))},this.activeListeners.handleEnter=function(a){var o=vt(a),s={event:o,preventSigmaDefault:function(){o.preventSigmaDefault()}};t.emit("enterStage",P({},s))};var n=function(o){return function(s){var u=vt(s),h={event:u,preventSigmaDefault:function(){u.preventSigmaDefault()}},d=t.getNodeAtPosition(u);if(d)return t.emit("".concat(o,"Node"),P(P({},h),{},{node:d}));if(t.settings.enableEdgeEvents){var l=t.getEdgeAtPoint(u.x,u.y);if(l)return t.emit("".concat(o,"Edge"),P(P({},h),{},{edge:l}))}return t.emit("".concat(o,"Stage"),h)}};return this.activeListeners.handleClick=n("click"),this.activeListeners.handleRightClick=n("rightClick"),this.activeListeners.handleDoubleClick=n("doubleClick"),this.activeListeners.handleWheel=n("wheel"),this.activeListeners.handleDown=n("down"),this.activeListeners.handleUp=n("up"),this.mouseCaptor.on("mousemove",this.activeListeners.handleMove),this.mouseCaptor.on("mousemovebody",this.activeListeners.handleMoveBody),this.mouseCaptor.on("click",this.activeListeners.handleClick),this.mouseCaptor.on("rightClick",this.activeListeners.handleRightClick),this.mouseCaptor.on("doubleClick",this.activeListeners.handleDoubleClick),this.mouseCaptor.on("wheel",this.activeListeners.handleWheel),this.mouseCaptor.on("mousedown",this.activeListeners.handleDown),this.mouseCaptor.on("mouseup",this.activeListeners.handleUp),this.mouseCaptor.on("mouseleave",this.activeListeners.handleLeave),this.mouseCaptor.on("mouseenter",this.activeListeners.handleEnter),this.touchCaptor.on("touchdown",this.activeListeners.handleDown),this.touchCaptor.on("touchdown",this.activeListeners.handleMove),this.touchCaptor.on("touchup",this.activeListeners.handleUp),this.touchCaptor.on("touchmove",this.activeListeners.handleMove),this.touchCaptor.on("tap",this.activeListeners.handleClick),this.touchCaptor.on("doubletap",this.activeListeners.handleDoubleClick),this.touchCaptor.on("touchmove",this.activeListeners.handleMoveBody),this}},{key:"bindGraphHandlers",value:function(){var t=this,n=this.graph,a=new Set(["x","y","zIndex","type"]);return this.activeListeners.eachNodeAttributesUpdatedGraphUpdate=function(o){var s,u=(s=o.hints)===null||s===void 0?void 0:s.attributes;t.graph.forEachNode(function(d){return t.updateNode(d)});var h=!u||u.some(function(d){return a.has(d)});t.refresh({partialGraph:{nodes:n.nodes()},skipIndexation:!h,schedule:!0})},this.activeListeners.eachEdgeAttributesUpdatedGraphUpdate=function(o){var s,u=(s=o.hints)===null||s===void 0?void 0:s.attributes;t.graph.forEachEdge(function(d){return t.updateEdge(d)});var h=u&&["zIndex","type"].some(function(d){return u?.includes(d)});t.refresh({partialGraph:{edges:n.edges()},skipIndexation:!h,schedule:!0})},this.activeListeners.addNodeGraphUpdate=function(o){var s=o.key;t.addNode(s),t.refresh({partialGraph:{nodes:[s]},skipIndexation:!1,schedule:!0})},this.activeListeners.updateNodeGraphUpdate=function(o){var s=o.key;t.refresh({partialGraph:{nodes:[s]},skipIndexation:!1,schedule:!0})},this.activeListeners.dropNodeGraphUpdate=function(o){var s=o.key;t.removeNode(s),t.refresh({schedule:!0})},this.activeListeners.addEdgeGraphUpdate=function(o){var s=o.key;t.addEdge(s),t.refresh({partialGraph:{edges:[s]},schedule:!0})},this.activeListeners.updateEdgeGraphUpdate=function(o){var s=o.key;t.refresh({partialGraph:{edges:[s]},skipIndexation:!1,schedule:!0})},this.activeListeners.dropEdgeGraphUpdate=function(o){var s=o.key;t.removeEdge(s),t.refresh({schedule:!0})},this.activeListeners.clearEdgesGraphUpdate=function(){t.clearEdgeState(),t.clearEdgeIndices(),t.refresh({schedule:!0})},this.activeListeners.clearGraphUpdate=function(){t.clearEdgeState(),t.clearNodeState(),t.clearEdgeIndices(),t.clearNodeIndices(),t.refresh({schedule:!0})},n.on("nodeAdded",this.activeListeners.addNodeGraphUpdate),n.on("nodeDropped",this.activeListeners.dropNodeGraphUpdate),n.on("nodeAttributesUpdated",this.activeListeners.updateNodeGraphUpdate),n.on("eachNodeAttributesUpdated",this.activeListeners.eachNodeAttributesUpdatedGraphUpdate),n.on("edgeAdded",this.activeListeners.addEdgeGraphUpdate),n.on("edgeDropped",this.activeListeners.dropEdgeGraphUpdate),n.on("edgeAttributesUpdated",this.activeListeners.updateEdgeGraphUpdate),n.on("eachEdgeAttributesUpdated",this.activeListeners.eachEdgeAttributesUpdatedGraphUpdate),n.on("edgesCleared",this.activeListeners.clearEdgesGraphUpdate),n.on("cleared",this.activeListeners.clearGraphUpdate),this}},{key:"unbindGraphHandlers",value:function(){var t=this.graph;t.removeListener("nodeAdded",this.activeListeners.addNodeGraphUpdate),t.removeListener("nodeDropped",this.activeListeners.dropNodeGraphUpdate),t.removeListener("nodeAttributesUpdated",this.activeListeners.updateNodeGraphUpdate),t.removeListener("eachNodeAttributesUpdated",this.activeListeners.eachNodeAttributesUpdatedGraphUpdate),t.removeListener("edgeAdded",this.activeListeners.addEdgeGraphUpdate),t.removeListener("edgeDropped",this.activeListeners.dropEdgeGraphUpdate),t.removeListener("edgeAttributesUpdated",this.activeListeners.updateEdgeGraphUpdate),t.removeListener("eachEdgeAttributesUpdated",this.activeListeners.eachEdgeAttributesUpdatedGraphUpdate),t.removeListener("edgesCleared",this.activeListeners.clearEdgesGraphUpdate),t.removeListener("cleared",this.activeListeners.clearGraphUpdate)}},{key:"getEdgeAtPoint",value:function(t,n){var a=oi(this.webGLContexts.edges,this.frameBuffers.edges,t,n,this.pixelRatio,this.pickingDownSizingRatio),o=ai.apply(void 0,zn(a)),s=this.itemIDsIndex[o];return s&&s.type==="edge"?s.id:null}},{key:"process",value:function(){var t=this;this.emit("beforeProcess");var n=this.graph,a=this.settings,o=this.getDimensions();if(this.nodeExtent=Fn(this.graph),!this.settings.autoRescale){var s=o.width,u=o.height,h=this.nodeExtent,d=h.x,l=h.y;this.nodeExtent={x:[(d[0]+d[1])/2-s/2,(d[0]+d[1])/2+s/2],y:[(l[0]+l[1])/2-u/2,(l[0]+l[1])/2+u/2]}}this.normalizationFunction=gi(this.customBBox||this.nodeExtent);var c=new On,f=dt(c.getState(),o,this.getGraphDimensions(),this.getStagePadding());this.labelGrid.resizeAndClear(o,a.labelGridCellSize);for(var p={},_={},E={},x={},D=1,w=n.nodes(),T=0,G=w.length;T<G;T++){var U=w[T],m=this.nodeDataCache[U],y=n.getNodeAttributes(U);m.x=y.x,m.y=y.y,this.normalizationFunction.applyTo(m),typeof m.label=="string"&&!m.hidden&&this.labelGrid.add(U,m.size,this.framedGraphToViewport(m,{matrix:f})),p[m.type]=(p[m.type]||0)+1}this.labelGrid.organize();for(var g in this.nodePrograms){if(!Me.call(this.nodePrograms,g))throw new Error('Sigma: could not find a suitable program for node type "'.concat(g,'"!'));this.nodePrograms[g].reallocate(p[g]||0),p[g]=0}this.settings.zIndex&&this.nodeZExtent[0]!==this.nodeZExtent[1]&&(w=fi(this.nodeZExtent,function(he){return t.nodeDataCache[he].zIndex},w));for(var q=0,te=w.length;q<te;q++){var F=w[q];_[F]=D,x[_[F]]={type:"node",id:F},D++;var C=this.nodeDataCache[F];this.addNodeToProgram(F,_[F],p[C.type]++)}for(var b={},L=n.edges(),A=0,O=L.length;A<O;A++){var I=L[A],M=this.edgeDataCache[I];b[M.type]=(b[M.type]||0)+1}this.settings.zIndex&&this.edgeZExtent[0]!==this.edgeZExtent[1]&&(L=fi(this.edgeZExtent,function(he){return t.edgeDataCache[he].zIndex},L));for(var B in this.edgePrograms){if(!Me.call(this.edgePrograms,B))throw new Error('Sigma: could not find a suitable program for edge type "'.concat(B,'"!'));this.edgePrograms[B].reallocate(b[B]||0),b[B]=0}for(var j=0,Z=L.length;j<Z;j++){var X=L[j];E[X]=D,x[E[X]]={type:"edge",id:X},D++;var se=this.edgeDataCache[X];this.addEdgeToProgram(X,E[X],b[se.type]++)}return this.itemIDsIndex=x,this.nodeIndices=_,this.edgeIndices=E,this.emit("afterProcess"),this}},{key:"handleSettingsUpdate",value:function(t){var n=this,a=this.settings;if(this.camera.minRatio=a.minCameraRatio,this.camera.maxRatio=a.maxCameraRatio,this.camera.enabledZooming=a.enableCameraZooming,this.camera.enabledPanning=a.enableCameraPanning,this.camera.enabledRotation=a.enableCameraRotation,a.cameraPanBoundaries?this.camera.clean=function(d){return n.cleanCameraState(d,a.cameraPanBoundaries&&Ot(a.cameraPanBoundaries)==="object"?a.cameraPanBoundaries:{})}:this.camera.clean=null,this.camera.setState(this.camera.validateState(this.camera.getState())),t){if(t.edgeProgramClasses!==a.edgeProgramClasses){for(var o in a.edgeProgramClasses)a.edgeProgramClasses[o]!==t.edgeProgramClasses[o]&&this.registerEdgeProgram(o,a.edgeProgramClasses[o]);for(var s in t.edgeProgramClasses)a.edgeProgramClasses[s]||this.unregisterEdgeProgram(s)}if(t.nodeProgramClasses!==a.nodeProgramClasses||t.nodeHoverProgramClasses!==a.nodeHoverProgramClasses){for(var u in a.nodeProgramClasses)(a.nodeProgramClasses[u]!==t.nodeProgramClasses[u]||a.nodeHoverProgramClasses[u]!==t.nodeHoverProgramClasses[u])&&this.registerNodeProgram(u,a.nodeProgramClasses[u],a.nodeHoverProgramClasses[u]);for(var h in t.nodeProgramClasses)a.nodeProgramClasses[h]||this.unregisterNodeProgram(h)}}return this.mouseCaptor.setSettings(this.settings),this.touchCaptor.setSettings(this.settings),this}},{key:"cleanCameraState",value:function(t){var n=arguments.length>1&&arguments[1]!==void 0?arguments[1]:{},a=n.tolerance,o=a===void 0?0:a,s=n.boundaries,u=P({},t),h=s||this.nodeExtent,d=Ve(h.x,2),l=d[0],c=d[1],f=Ve(h.y,2),p=f[0],_=f[1],E=[this.graphToViewport({x:l,y:p},{cameraState:t}),this.graphToViewport({x:c,y:p},{cameraState:t}),this.graphToViewport({x:l,y:_},{cameraState:t}),this.graphToViewport({x:c,y:_},{cameraState:t})],x=1/0,D=-1/0,w=1/0,T=-1/0;E.forEach(function(b){var L=b.x,A=b.y;x=Math.min(x,L),D=Math.max(D,L),w=Math.min(w,A),T=Math.max(T,A)});var G=D-x,U=T-w,m=this.getDimensions(),y=m.width,g=m.height,q=0,te=0;if(G>=y?D<y-o?q=D-(y-o):x>o&&(q=x-o):D>y+o?q=D-(y+o):x<-o&&(q=x+o),U>=g?T<g-o?te=T-(g-o):w>o&&(te=w-o):T>g+o?te=T-(g+o):w<-o&&(te=w+o),q||te){var F=this.viewportToFramedGraph({x:0,y:0},{cameraState:t}),C=this.viewportToFramedGraph({x:q,y:te},{cameraState:t});q=C.x-F.x,te=C.y-F.y,u.x+=q,u.y+=te}return u}},{key:"renderLabels",value:function(){if(!this.settings.renderLabels)return this;var t=this.camera.getState(),n=this.labelGrid.getLabelsToDisplay(t.ratio,this.settings.labelDensity);pi(n,this.nodesWithForcedLabels),this.displayedNodeLabels=new Set;for(var a=this.canvasContexts.labels,o=0,s=n.length;o<s;o++){var u=n[o],h=this.nodeDataCache[u];if(!this.displayedNodeLabels.has(u)&&!h.hidden){var d=this.framedGraphToViewport(h),l=d.x,c=d.y,f=this.scaleSize(h.size);if(!(!h.forceLabel&&f<this.settings.labelRenderedSizeThreshold)&&!(l<-Bn||l>this.width+Bn||c<-Hn||c>this.height+Hn)){this.displayedNodeLabels.add(u);var p=this.settings.defaultDrawNodeLabel,_=this.nodePrograms[h.type],E=_?.drawLabel||p;E(a,P(P({key:u},h),{},{size:f,x:l,y:c}),this.settings)}}}return this}},{key:"renderEdgeLabels",value:function(){if(!this.settings.renderEdgeLabels)return this;var t=this.canvasContexts.edgeLabels;t.clearRect(0,0,this.width,this.height);var n=Mo({graph:this.graph,hoveredNode:this.hoveredNode,displayedNodeLabels:this.displayedNodeLabels,highlightedNodes:this.highlightedNodes});pi(n,this.edgesWithForcedLabels);for(var a=new Set,o=0,s=n.length;o<s;o++){var u=n[o],h=this.graph.extremities(u),d=this.nodeDataCache[h[0]],l=this.nodeDataCache[h[1]],c=this.edgeDataCache[u];if(!a.has(u)&&!(c.hidden||d.hidden||l.hidden)){var f=this.settings.defaultDrawEdgeLabel,p=this.edgePrograms[c.type],_=p?.drawLabel||f;_(t,P(P({key:u},c),{},{size:this.scaleSize(c.size)}),P(P(P({key:h[0]},d),this.framedGraphToViewport(d)),{},{size:this.scaleSize(d.size)}),P(P(P({key:h[1]},l),this.framedGraphToViewport(l)),{},{size:this.scaleSize(l.size)}),this.settings),a.add(u)}}return this.displayedEdgeLabels=a,this}},{key:"renderHighlightedNodes",value:function(){var t=this,n=this.canvasContexts.hovers;n.clearRect(0,0,this.width,this.height);var a=function(f){var p=t.nodeDataCache[f],_=t.framedGraphToViewport(p),E=_.x,x=_.y,D=t.scaleSize(p.size),w=t.settings.defaultDrawNodeHover,T=t.nodePrograms[p.type],G=T?.drawHover||w;G(n,P(P({key:f},p),{},{size:D,x:E,y:x}),t.settings)},o=[];this.hoveredNode&&!this.nodeDataCache[this.hoveredNode].hidden&&o.push(this.hoveredNode),this.highlightedNodes.forEach(function(c){c!==t.hoveredNode&&o.push(c)}),o.forEach(function(c){return a(c)});var s={};o.forEach(function(c){var f=t.nodeDataCache[c].type;s[f]=(s[f]||0)+1});for(var u in this.nodeHoverPrograms)this.nodeHoverPrograms[u].reallocate(s[u]||0),s[u]=0;o.forEach(function(c){var f=t.nodeDataCache[c];t.nodeHoverPrograms[f.type].process(0,s[f.type]++,f)}),this.webGLContexts.hoverNodes.clear(this.webGLContexts.hoverNodes.COLOR_BUFFER_BIT);var h=this.getRenderParams();for(var d in this.nodeHoverPrograms){var l=this.nodeHoverPrograms[d];l.render(h)}}},{key:"scheduleHighlightedNodesRender",value:function(){var t=this;this.renderHighlightedNodesFrame||this.renderFrame||(this.renderHighlightedNodesFrame=requestAnimationFrame(function(){t.renderHighlightedNodesFrame=null,t.renderHighlightedNodes(),t.renderEdgeLabels()}))}},{key:"render",value:function(){var t=this;this.emit("beforeRender");var n=function(){return t.emit("afterRender"),t};if(this.renderFrame&&(cancelAnimationFrame(this.renderFrame),this.renderFrame=null),this.resize(),this.needToProcess&&this.process(),this.needToProcess=!1,this.clear(),this.pickingLayers.forEach(function(E){return t.resetWebGLTexture(E)}),!this.graph.order)return n();var a=this.mouseCaptor,o=this.camera.isAnimated()||a.isMoving||a.draggedEvents||a.currentWheelDirection,s=this.camera.getState(),u=this.getDimensions(),h=this.getGraphDimensions(),d=this.getStagePadding();this.matrix=dt(s,u,h,d),this.invMatrix=dt(s,u,h,d,!0),this.correctionRatio=Nn(this.matrix,s,u),this.graphToViewportRatio=this.getGraphToViewportRatio();var l=this.getRenderParams();for(var c in this.nodePrograms){var f=this.nodePrograms[c];f.render(l)}if(!this.settings.hideEdgesOnMove||!o)for(var p in this.edgePrograms){var _=this.edgePrograms[p];_.render(l)}return this.settings.hideLabelsOnMove&&o||(this.renderLabels(),this.renderEdgeLabels(),this.renderHighlightedNodes()),n()}},{key:"addNode",value:function(t){var n=Object.assign({},this.graph.getNodeAttributes(t));this.settings.nodeReducer&&(n=this.settings.nodeReducer(t,n));var a=Bo(this.settings,t,n);this.nodeDataCache[t]=a,this.nodesWithForcedLabels.delete(t),a.forceLabel&&!a.hidden&&this.nodesWithForcedLabels.add(t),this.highlightedNodes.delete(t),a.highlighted&&!a.hidden&&this.highlightedNodes.add(t),this.settings.zIndex&&(a.zIndex<this.nodeZExtent[0]&&(this.nodeZExtent[0]=a.zIndex),a.zIndex>this.nodeZExtent[1]&&(this.nodeZExtent[1]=a.zIndex))}},{key:"updateNode",value:function(t){this.addNode(t);var n=this.nodeDataCache[t];this.normalizationFunction.applyTo(n)}},{key:"removeNode",value:function(t){delete this.nodeDataCache[t],delete this.nodeProgramIndex[t],this.highlightedNodes.delete(t),this.hoveredNode===t&&(this.hoveredNode=null),this.nodesWithForcedLabels.delete(t)}},{key:"addEdge",value:function(t){var n=Object.assign({},this.graph.getEdgeAttributes(t));this.settings.edgeReducer&&(n=this.settings.edgeReducer(t,n));var a=Ho(this.settings,t,n);this.edgeDataCache[t]=a,this.edgesWithForcedLabels.delete(t),a.forceLabel&&!a.hidden&&this.edgesWithForcedLabels.add(t),this.settings.zIndex&&(a.zIndex<this.edgeZExtent[0]&&(this.edgeZExtent[0]=a.zIndex),a.zIndex>this.edgeZExtent[1]&&(this.edgeZExtent[1]=a.zIndex))}},{key:"updateEdge",value:function(t){this.addEdge(t)}},{key:"removeEdge",value:function(t){delete this.edgeDataCache[t],delete this.edgeProgramIndex[t],this.hoveredEdge===t&&(this.hoveredEdge=null),this.edgesWithForcedLabels.delete(t)}},{key:"clearNodeIndices",value:function(){this.labelGrid=new Mn,this.nodeExtent={x:[0,1],y:[0,1]},this.nodeDataCache={},this.edgeProgramIndex={},this.nodesWithForcedLabels=new Set,this.nodeZExtent=[1/0,-1/0]}},{key:"clearEdgeIndices",value:function(){this.edgeDataCache={},this.edgeProgramIndex={},this.edgesWithForcedLabels=new Set,this.edgeZExtent=[1/0,-1/0]}},{key:"clearIndices",value:function(){this.clearEdgeIndices(),this.clearNodeIndices()}},{key:"clearNodeState",value:function(){this.displayedNodeLabels=new Set,this.highlightedNodes=new Set,this.hoveredNode=null}},{key:"clearEdgeState",value:function(){this.displayedEdgeLabels=new Set,this.highlightedNodes=new Set,this.hoveredEdge=null}},{key:"clearState",value:function(){this.clearEdgeState(),this.clearNodeState()}},{key:"addNodeToProgram",value:function(t,n,a){var o=this.nodeDataCache[t],s=this.nodePrograms[o.type];if(!s)throw new Error('Sigma: could not find a suitable program for node type "'.concat(o.type,'"!'));s.process(n,a,o),this.nodeProgramIndex[t]=a}},{key:"addEdgeToProgram",value:function(t,n,a){var o=this.edgeDataCache[t],s=this.edgePrograms[o.type];if(!s)throw new Error('Sigma: could not find a suitable program for edge type "'.concat(o.type,'"!'));var u=this.graph.extremities(t),h=this.nodeDataCache[u[0]],d=this.nodeDataCache[u[1]];s.process(n,a,h,d,o),this.edgeProgramIndex[t]=a}},{key:"getRenderParams",value:function(){return{matrix:this.matrix,invMatrix:this.invMatrix,width:this.width,height:this.height,pixelRatio:this.pixelRatio,zoomRatio:this.camera.ratio,cameraAngle:this.camera.angle,sizeRatio:1/this.scaleSize(),correctionRatio:this.correctionRatio,downSizingRatio:this.pickingDownSizingRatio,minEdgeThickness:this.settings.minEdgeThickness,antiAliasingFeather:this.settings.antiAliasingFeather}}},{key:"getStagePadding",value:function(){var t=this.settings,n=t.stagePadding,a=t.autoRescale;return a&&n||0}},{key:"createLayer",value:function(t,n){var a=arguments.length>2&&arguments[2]!==void 0?arguments[2]:{};if(this.elements[t])throw new Error('Sigma: a layer named "'.concat(t,'" already exists'));var o=Pn(n,{position:"absolute"},{class:"sigma-".concat(t)});return a.style&&Object.assign(o.style,a.style),this.elements[t]=o,"beforeLayer"in a&&a.beforeLayer?this.elements[a.beforeLayer].before(o):"afterLayer"in a&&a.afterLayer?this.elements[a.afterLayer].after(o):this.container.appendChild(o),o}},{key:"createCanvas",value:function(t){var n=arguments.length>1&&arguments[1]!==void 0?arguments[1]:{};return this.createLayer(t,"canvas",n)}},{key:"createCanvasContext",value:function(t){var n=arguments.length>1&&arguments[1]!==void 0?arguments[1]:{},a=this.createCanvas(t,n),o={preserveDrawingBuffer:!1,antialias:!1};return this.canvasContexts[t]=a.getContext("2d",o),this}},{key:"createWebGLContext",value:function(t){var n=arguments.length>1&&arguments[1]!==void 0?arguments[1]:{},a=n?.canvas||this.createCanvas(t,n);n.hidden&&a.remove();var o=P({preserveDrawingBuffer:!1,antialias:!1},n),s;s=a.getContext("webgl2",o),s||(s=a.getContext("webgl",o)),s||(s=a.getContext("experimental-webgl",o));var u=s;if(this.webGLContexts[t]=u,u.blendFunc(u.ONE,u.ONE_MINUS_SRC_ALPHA),n.picking){this.pickingLayers.add(t);var h=u.createFramebuffer();if(!h)throw new Error("Sigma: cannot create a new frame buffer for layer ".concat(t));this.frameBuffers[t]=h}return u}},{key:"killLayer",value:function(t){var n=this.elements[t];if(!n)throw new Error("Sigma: cannot kill layer ".concat(t,", which does not exist"));if(this.webGLContexts[t]){var a,o=this.webGLContexts[t];(a=o.getExtension("WEBGL_lose_context"))===null||a===void 0||a.loseContext(),delete this.webGLContexts[t]}else this.canvasContexts[t]&&delete this.canvasContexts[t];return n.remove(),delete this.elements[t],this}},{key:"getCamera",value:function(){return this.camera}},{key:"setCamera",value:function(t){this.unbindCameraHandlers(),this.camera=t,this.bindCameraHandlers()}},{key:"getContainer",value:function(){return this.container}},{key:"getGraph",value:function(){return this.graph}},{key:"setGraph",value:function(t){t!==this.graph&&(this.hoveredNode&&!t.hasNode(this.hoveredNode)&&(this.hoveredNode=null),this.hoveredEdge&&!t.hasEdge(this.hoveredEdge)&&(this.hoveredEdge=null),this.unbindGraphHandlers(),this.checkEdgesEventsFrame!==null&&(cancelAnimationFrame(this.checkEdgesEventsFrame),this.checkEdgesEventsFrame=null),this.graph=t,this.bindGraphHandlers(),this.refresh())}},{key:"getMouseCaptor",value:function(){return this.mouseCaptor}},{key:"getTouchCaptor",value:function(){return this.touchCaptor}},{key:"getDimensions",value:function(){return{width:this.width,height:this.height}}},{key:"getGraphDimensions",value:function(){var t=this.customBBox||this.nodeExtent;return{width:t.x[1]-t.x[0]||1,height:t.y[1]-t.y[0]||1}}},{key:"getNodeDisplayData",value:function(t){var n=this.nodeDataCache[t];return n?Object.assign({},n):void 0}},{key:"getEdgeDisplayData",value:function(t){var n=this.edgeDataCache[t];return n?Object.assign({},n):void 0}},{key:"getNodeDisplayedLabels",value:function(){return new Set(this.displayedNodeLabels)}},{key:"getEdgeDisplayedLabels",value:function(){return new Set(this.displayedEdgeLabels)}},{key:"getSettings",value:function(){return P({},this.settings)}},{key:"getSetting",value:function(t){return this.settings[t]}},{key:"setSetting",value:function(t,n){var a=P({},this.settings);return this.settings[t]=n,Mt(this.settings),this.handleSettingsUpdate(a),this.scheduleRefresh(),this}},{key:"updateSetting",value:function(t,n){return this.setSetting(t,n(this.settings[t])),this}},{key:"setSettings",value:function(t){var n=P({},this.settings);return this.settings=P(P({},this.settings),t),Mt(this.settings),this.handleSettingsUpdate(n),this.scheduleRefresh(),this}},{key:"resize",value:function(t){var n=this.width,a=this.height;if(this.width=this.container.offsetWidth,this.height=this.container.offsetHeight,this.pixelRatio=ci(),this.width===0)if(this.settings.allowInvalidContainer)this.width=1;else throw new Error("Sigma: Container has no width. You can set the allowInvalidContainer setting to true to stop seeing this error.");if(this.height===0)if(this.settings.allowInvalidContainer)this.height=1;else throw new Error("Sigma: Container has no height. You can set the allowInvalidContainer setting to true to stop seeing this error.");if(!t&&n===this.width&&a===this.height)return this;for(var o in this.elements){var s=this.elements[o];s.style.width=this.width+"px",s.style.height=this.height+"px"}for(var u in this.canvasContexts)this.elements[u].setAttribute("width",this.width*this.pixelRatio+"px"),this.elements[u].setAttribute("height",this.height*this.pixelRatio+"px"),this.pixelRatio!==1&&this.canvasContexts[u].scale(this.pixelRatio,this.pixelRatio);for(var h in this.webGLContexts){this.elements[h].setAttribute("width",this.width*this.pixelRatio+"px"),this.elements[h].setAttribute("height",this.height*this.pixelRatio+"px");var d=this.webGLContexts[h];if(d.viewport(0,0,this.width*this.pixelRatio,this.height*this.pixelRatio),this.pickingLayers.has(h)){var l=this.textures[h];l&&d.deleteTexture(l)}}return this.emit("resize"),this}},{key:"clear",value:function(){return this.emit("beforeClear"),this.webGLContexts.nodes.bindFramebuffer(WebGLRenderingContext.FRAMEBUFFER,null),this.webGLContexts.nodes.clear(WebGLRenderingContext.COLOR_BUFFER_BIT),this.webGLContexts.edges.bindFramebuffer(WebGLRenderingContext.FRAMEBUFFER,null),this.webGLContexts.edges.clear(WebGLRenderingContext.COLOR_BUFFER_BIT),this.webGLContexts.hoverNodes.clear(WebGLRenderingContext.COLOR_BUFFER_BIT),this.canvasContexts.labels.clearRect(0,0,this.width,this.height),this.canvasContexts.hovers.clearRect(0,0,this.width,this.height),this.canvasContexts.edgeLabels.clearRect(0,0,this.width,this.height),this.emit("afterClear"),this}},{key:"refresh",value:function(t){var n=this,a=t?.skipIndexation!==void 0?t?.skipIndexation:!1,o=t?.schedule!==void 0?t.schedule:!1,s=!t||!t.partialGraph;if(s)this.clearEdgeIndices(),this.clearNodeIndices(),this.graph.forEachNode(function(T){return n.addNode(T)}),this.graph.forEachEdge(function(T){return n.addEdge(T)});else{for(var u,h,d=((u=t.partialGraph)===null||u===void 0?void 0:u.nodes)||[],l=0,c=d?.length||0;l<c;l++){var f=d[l];if(this.updateNode(f),a){var p=this.nodeProgramIndex[f];if(p===void 0)throw new Error('Sigma: node "'.concat(f,`" can't be repaint`));this.addNodeToProgram(f,this.nodeIndices[f],p)}}for(var _=(t==null||(h=t.partialGraph)===null||h===void 0?void 0:h.edges)||[],E=0,x=_.length;E<x;E++){var D=_[E];if(this.updateEdge(D),a){var w=this.edgeProgramIndex[D];if(w===void 0)throw new Error('Sigma: edge "'.concat(D,`" can't be repaint`));this.addEdgeToProgram(D,this.edgeIndices[D],w)}}}return(s||!a)&&(this.needToProcess=!0),o?this.scheduleRender():this.render(),this}},{key:"scheduleRender",value:function(){var t=this;return this.renderFrame||(this.renderFrame=requestAnimationFrame(function(){t.render()})),this}},{key:"scheduleRefresh",value:function(t){return this.refresh(P(P({},t),{},{schedule:!0}))}},{key:"getViewportZoomedState",value:function(t,n){var a=this.camera.getState(),o=a.ratio,s=a.angle,u=a.x,h=a.y,d=this.settings,l=d.minCameraRatio,c=d.maxCameraRatio;typeof c=="number"&&(n=Math.min(n,c)),typeof l=="number"&&(n=Math.max(n,l));var f=n/o,p={x:this.width/2,y:this.height/2},_=this.viewportToFramedGraph(t),E=this.viewportToFramedGraph(p);return{angle:s,x:(_.x-E.x)*(1-f)+u,y:(_.y-E.y)*(1-f)+h,ratio:n}}},{key:"viewRectangle",value:function(){var t=this.viewportToFramedGraph({x:0,y:0}),n=this.viewportToFramedGraph({x:this.width,y:0}),a=this.viewportToFramedGraph({x:0,y:this.height});return{x1:t.x,y1:t.y,x2:n.x,y2:n.y,height:n.y-a.y}}},{key:"framedGraphToViewport",value:function(t){var n=arguments.length>1&&arguments[1]!==void 0?arguments[1]:{},a=!!n.cameraState||!!n.viewportDimensions||!!n.graphDimensions,o=n.matrix?n.matrix:a?dt(n.cameraState||this.camera.getState(),n.viewportDimensions||this.getDimensions(),n.graphDimensions||this.getGraphDimensions(),n.padding||this.getStagePadding()):this.matrix,s=It(o,t);return{x:(1+s.x)*this.width/2,y:(1-s.y)*this.height/2}}},{key:"viewportToFramedGraph",value:function(t){var n=arguments.length>1&&arguments[1]!==void 0?arguments[1]:{},a=!!n.cameraState||!!n.viewportDimensions||!n.graphDimensions,o=n.matrix?n.matrix:a?dt(n.cameraState||this.camera.getState(),n.viewportDimensions||this.getDimensions(),n.graphDimensions||this.getGraphDimensions(),n.padding||this.getStagePadding(),!0):this.invMatrix,s=It(o,{x:t.x/this.width*2-1,y:1-t.y/this.height*2});return isNaN(s.x)&&(s.x=0),isNaN(s.y)&&(s.y=0),s}},{key:"viewportToGraph",value:function(t){var n=arguments.length>1&&arguments[1]!==void 0?arguments[1]:{};return this.normalizationFunction.inverse(this.viewportToFramedGraph(t,n))}},{key:"graphToViewport",value:function(t){var n=arguments.length>1&&arguments[1]!==void 0?arguments[1]:{};return this.framedGraphToViewport(this.normalizationFunction(t),n)}},{key:"getGraphToViewportRatio",value:function(){var t={x:0,y:0},n={x:1,y:1},a=Math.sqrt(Math.pow(t.x-n.x,2)+Math.pow(t.y-n.y,2)),o=this.graphToViewport(t),s=this.graphToViewport(n),u=Math.sqrt(Math.pow(o.x-s.x,2)+Math.pow(o.y-s.y,2));return u/a}},{key:"getBBox",value:function(){return this.nodeExtent}},{key:"getCustomBBox",value:function(){return this.customBBox}},{key:"setCustomBBox",value:function(t){return this.customBBox=t,this.scheduleRender(),this}},{key:"kill",value:function(){this.emit("kill"),this.removeAllListeners(),this.unbindCameraHandlers(),window.removeEventListener("resize",this.activeListeners.handleResize),this.mouseCaptor.kill(),this.touchCaptor.kill(),this.unbindGraphHandlers(),this.clearIndices(),this.clearState(),this.nodeDataCache={},this.edgeDataCache={},this.highlightedNodes.clear(),this.renderFrame&&(cancelAnimationFrame(this.renderFrame),this.renderFrame=null),this.renderHighlightedNodesFrame&&(cancelAnimationFrame(this.renderHighlightedNodesFrame),this.renderHighlightedNodesFrame=null);for(var t=this.container;t.firstChild;)t.removeChild(t.firstChild);this.canvasContexts={},this.webGLContexts={},this.elements={};for(var n in this.nodePrograms)this.nodePrograms[n].kill();for(var a in this.nodeHoverPrograms)this.nodeHoverPrograms[a].kill();for(var o in this.edgePrograms)this.edgePrograms[o].kill();this.nodePrograms={},this.nodeHoverPrograms={},this.edgePrograms={};for(var s in this.elements)this.killLayer(s)}},{key:"scaleSize",value:function(){var t=arguments.length>0&&arguments[0]!==void 0?arguments[0]:1,n=arguments.length>1&&arguments[1]!==void 0?arguments[1]:this.camera.ratio;return t/this.settings.zoomToSizeRatioFunction(n)*(this.getSetting("itemSizesReference")==="positions"?n*this.graphToViewportRatio:1)}},{key:"getCanvases",value:function(){var t={};for(var n in this.elements)this.elements[n]instanceof HTMLCanvasElement&&(t[n]=this.elements[n]);return t}}])}(Ft),Vn=Wo;var Ti=je(or()),Vt=je(sr()),hr=je(ur());{
+// FILE: frontend/script.js
+// frontend/script.js (Bundled Version - Phase 7 - Disappearing Fix Attempt)
+
+// --- ES Module Imports ---
+const Graph = ee;
+const Sigma = Vn;
+const forceAtlas2Layout = Ti.default; // Reverted to default import
+const dayjs = Vt.default;
+const utc = hr.default;
+
+// --- Initialize Plugins ---
+dayjs.extend(utc);
+
+// --- Wait for the DOM to be fully loaded ---
+document.addEventListener("DOMContentLoaded", () => {
+    console.log("DOM fully loaded and parsed (Phase 7 Version - Disappearing Fix)");
+
+    // --- DOM Element References ---
+    const graphContainer = document.getElementById('graph-container');
+    const loadingIndicator = document.getElementById('loading-indicator');
+    const errorDisplay = document.getElementById('error-display');
+    const startTimeSlider = document.getElementById('start-time-slider');
+    const endTimeSlider = document.getElementById('end-time-slider');
+    const startTimeLabel = document.getElementById('start-time-label');
+    const endTimeLabel = document.getElementById('end-time-label');
+    const layoutButton = document.getElementById('layout-button');
+    const tooltipElement = document.createElement("div");
+    tooltipElement.className = "sigma-tooltip";
+    document.body.appendChild(tooltipElement);
+
+    // --- Global State ---
+    let sigmaInstance = null;
+    let graph = null;
+    let overallMinTimestamp = 0;
+    let overallMaxTimestamp = 0;
+    let channelNames = []; // channel_id by compact channel index, from CHANNEL_MAP_ENDPOINT
+    let currentStartTimeMs = 0;
+    let currentEndTimeMs = 0;
+    let isFetchingData = false;
+    let isDragging = false;
+    let draggedNode = null;
+    let dragStartX = 0;
+    let dragStartY = 0;
+    let initialZoomApplied = false;
+    // let currentLayoutProcess = null; // Removed - not needed for sync layout
+
+    // --- Interaction State ---
+    let hoveredNode = null;
+    let hoveredEdge = null;
+    let selectedNode = null;
+    let highlightedNodes = new Set();
+
+    // --- Configuration ---
+    const API_ENDPOINT = '/graph-data';
+    const CHANNEL_MAP_ENDPOINT = '/channel-map';
+    const DEBOUNCE_DELAY = 400;
+    const INITIAL_LAYOUT_ITERATIONS = 100;
+    const MANUAL_LAYOUT_ITERATIONS = 50;
+    const NODE_MIN_SIZE = 2;
+    const NODE_MAX_SIZE = 15;
+    const NODE_BASE_SIZE_FACTOR = 0.8;
+
+    // --- Styling Constants ---
+    const HOVER_NODE_COLOR = "#f00";
+    const SELECTED_NODE_COLOR = "#00f";
+    const NEIGHBOR_NODE_COLOR = "#fcba03";
+    const DIMMED_NODE_COLOR = "#f0f0f0";
+    const DIMMED_EDGE_COLOR = "#fafafa";
+    const EDGE_COLOR_START = { r: 200, g: 200, b: 200 };
+    const EDGE_COLOR_END = { r: 0, g: 100, b: 255 };
+    const DEFAULT_EDGE_COLOR = '#ccc';
+
+
+    console.log("Day.js initialized with UTC plugin.");
+
+    // --- UI Helper Functions ---
+    function showLoading(isLoading, message = "Loading / Calculating Layout...") {
+        loadingIndicator.textContent = message;
+        loadingIndicator.classList.toggle('hidden', !isLoading);
+        if (isLoading) errorDisplay.classList.add('hidden');
+    }
+
+    function showError(message) {
+        errorDisplay.textContent = message || "An error occurred.";
+        errorDisplay.classList.remove('hidden');
+        showLoading(false);
+    }
+
+    function hideError() {
+         errorDisplay.classList.add('hidden');
+    }
+
+    // --- Date Formatting Helper ---
+     function formatTimestampUTC(timestampMs) {
+        if (timestampMs === null || timestampMs === undefined || isNaN(timestampMs)) return '-';
+        if (typeof dayjs !== 'function') {
+             console.warn("Day.js not available for formatting.");
+             const numericTimestamp = Number(timestampMs);
+             if (isNaN(numericTimestamp)) return '-';
+             try { return new Date(numericTimestamp).toISOString(); } catch (e) { return '-'; }
+        }
+        const numericTimestamp = Number(timestampMs);
+        if (isNaN(numericTimestamp)) return '-';
+        return dayjs.utc(numericTimestamp).format('YYYY-MM-DD HH:mm [UTC]');
+    }
+
+     // --- Tooltip Functions ---
+    function showTooltip(content, x, y) {
+        tooltipElement.innerHTML = content;
+        tooltipElement.style.display = "block";
+        const tooltipRect = tooltipElement.getBoundingClientRect();
+        const bodyRect = document.body.getBoundingClientRect();
+        let left = x + 15;
+        let top = y + 15;
+        if (left + tooltipRect.width > bodyRect.width) { left = x - 15 - tooltipRect.width; }
+        if (top + tooltipRect.height > bodyRect.height) { top = y - 15 - tooltipRect.height; }
+        tooltipElement.style.left = `${left}px`;
+        tooltipElement.style.top = `${top}px`;
+    }
+
+    function hideTooltip() {
+        tooltipElement.style.display = "none";
+    }
+
+
+    // --- Color Helper ---
+     function interpolateColor(startColor, endColor, factor) {
+        factor = Math.max(0, Math.min(1, factor));
+        const r = Math.round(startColor.r + (endColor.r - startColor.r) * factor);
+        const g = Math.round(startColor.g + (endColor.g - startColor.g) * factor);
+        const b = Math.round(startColor.b + (endColor.b - startColor.b) * factor);
+        return `rgb(${r},${g},${b})`;
+    }
+
+    // --- Helper to get random color (Placeholder) ---
+     function getRandomColor() {
+        const letters = '0123456789ABCDEF';
+        let color = '#';
+        for (let i = 0; i < 6; i++) {
+            color += letters[Math.floor(Math.random() * 16)];
+        }
+        return color;
+    }
+
+    // --- Sigma Reducers (for dynamic styling) ---
+    const nodeReducer = (node, data) => {
+        const newData = { ...data };
+        if (selectedNode === node) { newData.color = SELECTED_NODE_COLOR; newData.highlighted = false; newData.zIndex = 3; }
+        else if (hoveredNode === node) { newData.color = HOVER_NODE_COLOR; newData.highlighted = false; newData.zIndex = 2; }
+        else if (highlightedNodes.size > 0 && !highlightedNodes.has(node)) { newData.color = DIMMED_NODE_COLOR; newData.label = null; newData.highlighted = false; newData.zIndex = 0; }
+        else if (highlightedNodes.has(node)) { newData.color = NEIGHBOR_NODE_COLOR; newData.highlighted = true; newData.zIndex = 1; }
+        else { newData.color = data.originalColor || getRandomColor(); newData.highlighted = false; newData.zIndex = 1; }
+        return newData;
+    };
+
+    const edgeReducer = (edge, data) => {
+        const newData = { ...data };
+        const source = graph.source(edge);
+        const target = graph.target(edge);
+        const isSelectedSource = source === selectedNode;
+        const isSelectedTarget = target === selectedNode;
+        const isHoveredSource = source === hoveredNode;
+        const isHoveredTarget = target === hoveredNode;
+        const highlightEdge = highlightedNodes.has(source) && highlightedNodes.has(target);
+
+        if (highlightedNodes.size > 0 && !highlightEdge) { newData.color = DIMMED_EDGE_COLOR; newData.hidden = true; newData.zIndex = 0; }
+        else {
+             const timestamp = data.timestamp;
+             const range = currentEndTimeMs - currentStartTimeMs;
+             let colorFactor = 0.5;
+             if (range > 0 && timestamp >= currentStartTimeMs && timestamp <= currentEndTimeMs) { colorFactor = (timestamp - currentStartTimeMs) / range; }
+             else if (timestamp < currentStartTimeMs) { colorFactor = 0; }
+             else if (timestamp > currentEndTimeMs) { colorFactor = 1; }
+             newData.color = interpolateColor(EDGE_COLOR_START, EDGE_COLOR_END, colorFactor);
+             newData.hidden = false;
+             newData.zIndex = 0;
+        }
+        if (isSelectedSource || isSelectedTarget) { newData.color = SELECTED_NODE_COLOR; newData.hidden = false; newData.zIndex = 2; }
+        else if (isHoveredSource || isHoveredTarget) { newData.color = HOVER_NODE_COLOR; newData.hidden = false; newData.zIndex = 1; }
+        return newData;
+    };
+
+
+    // --- Sigma.js Initialization ---
+    function initializeSigma() {
+        console.log("Initializing Sigma.js (Phase 7 - Sync Layout)...");
+        if (!graphContainer) {
+            console.error("Graph container #graph-container not found!");
+            showError("Graph container element is missing.");
+            return;
+        }
+        try {
+            graph = new Graph({ multi: true, type: 'directed' });
+
+            sigmaInstance = new Sigma(graph, graphContainer, {
+                allowInvalidContainer: true,
+                defaultNodeType: "circle",
+                defaultEdgeType: "arrow",
+                nodeReducer: nodeReducer,
+                edgeReducer: edgeReducer,
+                labelDensity: 0.1,
+                labelGridCellSize: 150,
+                labelRenderedSizeThreshold: 8,
+                labelFont: "Lato, sans-serif",
+                zIndex: true,
+                hideEdgesOnMove: true,
+                hideLabelsOnMove: true,
+                enableCameraInteraction: true,
+            });
+            console.log("Sigma.js instance created.");
+            setupSigmaEventHandlers();
+            console.log("Sigma.js initialized successfully.");
+        } catch (e) {
+            console.error("Error initializing Sigma:", e);
+            showError(`Failed to initialize graph visualization: ${e.message}. Check browser console.`);
+            sigmaInstance = null;
+            graph = null;
+        }
+    }
+
+    // --- Sigma Event Handlers ---
+    function setupSigmaEventHandlers() {
+        if (!sigmaInstance) return;
+        console.log("Setting up Sigma event handlers (Phase 7)...");
+        sigmaInstance.on("downNode", (e) => { if (!e.event.original.ctrlKey) { isDragging = true; draggedNode = e.node; const initialGraphPos = graph.getNodeAttributes(draggedNode); const nodePosition = sigmaInstance.graphToViewport(initialGraphPos); const mousePosition = { x: e.event.x, y: e.event.y }; dragStartX = mousePosition.x - nodePosition.x; dragStartY = mousePosition.y - nodePosition.y; sigmaInstance.getCamera().disable(); }});
+        sigmaInstance.getMouseCaptor().on("mousemove", (e) => { if (!isDragging || !draggedNode) return; const mousePosition = { x: e.x, y: e.y }; const newViewportPos = { x: mousePosition.x - dragStartX, y: mousePosition.y - dragStartY }; const newGraphPos = sigmaInstance.viewportToGraph(newViewportPos); graph.setNodeAttribute(draggedNode, "x", newGraphPos.x); graph.setNodeAttribute(draggedNode, "y", newGraphPos.y); });
+        const stopDragging = () => { if (isDragging && draggedNode) {} isDragging = false; draggedNode = null; if (sigmaInstance) sigmaInstance.getCamera().enable(); };
+        sigmaInstance.getMouseCaptor().on("mouseup", stopDragging);
+        sigmaInstance.getMouseCaptor().on("mouseleave", stopDragging);
+        sigmaInstance.on("enterNode", (e) => { if (!isDragging) { hoveredNode = e.node; highlightedNodes.clear(); highlightedNodes.add(hoveredNode); if(selectedNode !== hoveredNode) { graph.neighbors(hoveredNode).forEach(neighbor => highlightedNodes.add(neighbor)); } if (selectedNode && selectedNode !== hoveredNode) { highlightedNodes.add(selectedNode); graph.neighbors(selectedNode).forEach(neighbor => highlightedNodes.add(neighbor)); } const nodeData = graph.getNodeAttributes(hoveredNode); const tooltipContent = `ID: ${nodeData.label}<br>Degree (window): ${nodeData.degree}`; showTooltip(tooltipContent, e.event.x, e.event.y); sigmaInstance.refresh(); } });
+        sigmaInstance.on("leaveNode", (e) => { if (!isDragging) { hoveredNode = null; hideTooltip(); if (!selectedNode) { highlightedNodes.clear(); } else { highlightedNodes.clear(); highlightedNodes.add(selectedNode); graph.neighbors(selectedNode).forEach(neighbor => highlightedNodes.add(neighbor)); } sigmaInstance.refresh(); } });
+        sigmaInstance.on("clickNode", (e) => { if (!isDragging) { const clickedNode = e.node; if (selectedNode === clickedNode) { selectedNode = null; highlightedNodes.clear(); } else { selectedNode = clickedNode; highlightedNodes.clear(); highlightedNodes.add(selectedNode); graph.neighbors(selectedNode).forEach(neighbor => highlightedNodes.add(neighbor)); } console.log(`Selected node: ${selectedNode}`); sigmaInstance.refresh(); } });
+        sigmaInstance.on("clickStage", () => { if (selectedNode && !isDragging) { selectedNode = null; highlightedNodes.clear(); console.log("Selected node cleared by stage click."); sigmaInstance.refresh(); } });
+    }
+
+    // --- Data Fetching and Graph Population ---
+    // Nodes and links refer to channels by compact index; the names are loaded separately
+    // and reloaded when a graph contains channels ingested since the last load. min_size
+    // makes the backend bypass a cached map that doesn't cover those channels yet.
+    async function fetchChannelMap(minSize) {
+        try {
+            const response = await fetch(`${CHANNEL_MAP_ENDPOINT}?min_size=${minSize}`);
+            if (!response.ok) { throw new Error(`HTTP error ${response.status}`); }
+            channelNames = await response.json();
+            console.log(`Channel map received: ${channelNames.length} entries`);
+        } catch (error) {
+            console.warn("Failed to load channel map; showing channel indices instead of ids.", error);
+        }
+    }
+
+    // The backend pages links; follow next_cursor until the window is complete and merge
+    // the pages, summing node degrees by id.
+    async function fetchGraphDataPages(params) {
+        const degreesById = new Map();
+        const links = [];
+        let data = null;
+        let cursor = null;
+        do {
+            const pageParams = new URLSearchParams(params);
+            if (cursor) { pageParams.set('after_ts', String(cursor.after_ts)); pageParams.set('after_id', String(cursor.after_id)); }
+            const url = `${API_ENDPOINT}?${pageParams.toString()}`;
+            console.log(`Requesting URL: ${url}`);
+            const response = await fetch(url);
+            if (!response.ok) { let errorText = "An error occurred"; try { const errorData = await response.json(); errorText = errorData.error || `HTTP error ${response.status}`; } catch (e) { errorText = `HTTP error ${response.status}: ${response.statusText}`; } throw new Error(errorText); }
+            data = await response.json();
+            if (!data || !Array.isArray(data.nodes) || !Array.isArray(data.links)) { throw new Error("Invalid data structure received from backend."); }
+            data.nodes.forEach(node => { degreesById.set(node.id, (degreesById.get(node.id) || 0) + (node.degree || 0)); });
+            for (const link of data.links) { links.push(link); }
+            cursor = data.next_cursor;
+        } while (cursor);
+        const nodes = Array.from(degreesById, ([id, degree]) => ({ id: id, degree: degree }));
+        return { nodes: nodes, links: links, min_timestamp: data.min_timestamp, max_timestamp: data.max_timestamp };
+    }
+
+    async function fetchAndPopulateGraph(startTime = null, endTime = null) {
+        if (!graph || !sigmaInstance) { return; }
+        if (isFetchingData) { return; }
+        initialZoomApplied = false;
+        console.log(`Fetching graph data for window: ${startTime} -> ${endTime}`);
+        isFetchingData = true;
+        showLoading(true);
+        hideError();
+        currentStartTimeMs = startTime === null ? overallMinTimestamp : Math.round(startTime);
+        currentEndTimeMs = endTime === null ? overallMaxTimestamp : Math.round(endTime);
+        if (currentStartTimeMs > currentEndTimeMs) { currentStartTimeMs = currentEndTimeMs; }
+        const params = new URLSearchParams();
+        params.append('start_time', String(currentStartTimeMs));
+        params.append('end_time', String(currentEndTimeMs));
+        try {
+            const data = await fetchGraphDataPages(params);
+            console.log(`Data received: ${data.nodes.length} nodes, ${data.links.length} links`);
+            const maxUnnamedId = data.nodes.reduce((maxId, node) => (channelNames[node.id] == null ? Math.max(maxId, node.id) : maxId), -1);
+            if (maxUnnamedId >= 0) { await fetchChannelMap(maxUnnamedId + 1); }
+
+            // No need to stop layout for sync assign
+
+            const existingNodes = {};
+            if (graph.order > 0) { graph.forEachNode((node, attrs) => { if (attrs.x !== undefined && attrs.y !== undefined) { existingNodes[node] = { x: attrs.x, y: attrs.y }; } }); }
+            graph.clear();
+            console.log("Populating graphology instance...");
+            let nodesAdded = 0;
+            data.nodes.forEach(node => { if (node.id === null || node.id === undefined) { return; } const existingPos = existingNodes[node.id]; const degree = node.degree || 0; const targetSize = NODE_MIN_SIZE + Math.sqrt(degree) * NODE_BASE_SIZE_FACTOR; const finalSize = Math.max(NODE_MIN_SIZE, Math.min(targetSize, NODE_MAX_SIZE)); const originalColor = getRandomColor(); try { graph.addNode(node.id, { label: channelNames[node.id] ?? String(node.id), x: existingPos?.x ?? Math.random() * 1000, y: existingPos?.y ?? Math.random() * 1000, size: finalSize, degree: degree, color: originalColor, originalColor: originalColor, zIndex: 1 }); nodesAdded++; } catch (nodeError) { console.error(`Error adding node ${node.id}:`, nodeError); } });
+            let edgesAdded = 0;
+            data.links.forEach(link => { if (link.source == null || link.target == null) { return; } const sourceStr = String(link.source); const targetStr = String(link.target); if (graph.hasNode(sourceStr) && graph.hasNode(targetStr)) { try { const edgeExists = !graph.multi && graph.hasEdge(sourceStr, targetStr); if (!edgeExists) { graph.addEdge(sourceStr, targetStr, { timestamp: link.timestamp, type: 'arrow', size: 0.5, zIndex: 0 }); edgesAdded++; } else if (graph.multi) { graph.addEdge(sourceStr, targetStr, { timestamp: link.timestamp, type: 'arrow', size: 0.5, zIndex: 0 }); edgesAdded++; } } catch (edgeError) { } } });
+            console.log(`Graph populated: ${nodesAdded} nodes, ${edgesAdded} edges.`);
+            if (graph.order === 0) { console.warn("Graph is empty after population."); }
+            if (startTime === null && endTime === null) {
+                console.log("Performing initial slider setup...");
+                overallMinTimestamp = data.min_timestamp; overallMaxTimestamp = data.max_timestamp;
+                const now = Date.now();
+                if (overallMinTimestamp === null || overallMinTimestamp === undefined || isNaN(overallMinTimestamp) || overallMaxTimestamp === null || overallMaxTimestamp === undefined || isNaN(overallMaxTimestamp) || overallMinTimestamp > overallMaxTimestamp) { console.warn("Received invalid overall timestamps from backend or range is invalid. Using defaults (last 7 days)."); overallMinTimestamp = now - (7 * 24 * 60 * 60 * 1000); overallMaxTimestamp = now; }
+                currentStartTimeMs = overallMinTimestamp; currentEndTimeMs = overallMaxTimestamp;
+                console.log(`Overall time range: ${overallMinTimestamp} -> ${overallMaxTimestamp}`); console.log(`Formatted: ${formatTimestampUTC(overallMinTimestamp)} -> ${formatTimestampUTC(overallMaxTimestamp)}`);
+                if (overallMinTimestamp <= overallMaxTimestamp) { startTimeSlider.min = String(overallMinTimestamp); startTimeSlider.max = String(overallMaxTimestamp); endTimeSlider.min = String(overallMinTimestamp); endTimeSlider.max = String(overallMaxTimestamp); startTimeSlider.value = String(overallMinTimestamp); endTimeSlider.value = String(overallMaxTimestamp); startTimeLabel.textContent = formatTimestampUTC(overallMinTimestamp); endTimeLabel.textContent = formatTimestampUTC(overallMaxTimestamp); startTimeSlider.disabled = false; endTimeSlider.disabled = false; console.log("Sliders initialized and enabled."); }
+                else { console.error("Invalid overall time range after potential defaults. Cannot initialize sliders."); showError("Error: Invalid time range data from server."); startTimeSlider.disabled = true; endTimeSlider.disabled = true; }
+            }
+            if (graph.order > 0) { console.log("Triggering initial layout calculation..."); applyLayout(INITIAL_LAYOUT_ITERATIONS); }
+            else { showLoading(false); }
+            // sigmaInstance.refresh(); // Refresh is called within applyLayout's finally block now
+        } catch (error) {
+            console.error("Failed to fetch or process graph data:", error);
+            showError(`Failed to load graph data: ${error.message}`);
+            graph.clear();
+            showLoading(false);
+        } finally {
+            isFetchingData = false;
+            console.log("fetchAndPopulateGraph finished.");
+        }
+    }
+
+
+    // --- Layout Function (Synchronous Version) ---
+    function applyLayout(iterations, manualTrigger = false) {
+        // Check if the imported layout object exists and is a function (assign)
+        if (typeof forceAtlas2Layout !== 'function') {
+             console.error("Layout library (forceAtlas2Layout assign function) not loaded or imported correctly!");
+             showError("Layout engine failed to load.");
+             return;
+        }
+        if (!graph || !sigmaInstance || graph.order === 0) {
+            console.log("Skipping layout: Graph empty or not initialized.");
+            return; // Don't show/hide loading if not running layout
+        }
+
+        const layoutIterations = iterations !== undefined ? iterations : INITIAL_LAYOUT_ITERATIONS;
+        console.log(`Applying ForceAtlas2 layout (${layoutIterations} iterations)...`);
+        showLoading(true, "Calculating Layout...");
+
+        // Use setTimeout to allow the loading indicator to render before blocking
+        setTimeout(() => {
+            const settings = {
+                iterations: layoutIterations,
+                settings: {
+                    barnesHutOptimize: graph.order > 1000,
+                    barnesHutTheta: 0.6,
+                    gravity: 1.0,       // Might need adjustment if nodes fly away
+                    scalingRatio: 10.0, // Might need adjustment
+                    strongGravityMode: false,
+                    slowDown: 1 + Math.log(graph.order) / 10,
+                    adjustSizes: false
+                }
+            };
+
+            console.time("Layout Calculation");
+            let layoutSuccess = false;
+            try {
+                 // Use the synchronous assign method
+                 forceAtlas2Layout.assign(graph, settings);
+                 console.timeEnd("Layout Calculation");
+                 console.log("ForceAtlas2 layout applied.");
+                 layoutSuccess = true; // Mark layout as successful
+
+                 // *** Add Coordinate Check ***
+                 let invalidCoordsFound = false;
+                 graph.forEachNode((node, attrs) => {
+                     if (!isFinite(attrs.x) || !isFinite(attrs.y)) {
+                         console.error(`  Node ${node}: INVALID coordinates after layout! x=${attrs.x}, y=${attrs.y}`);
+                         invalidCoordsFound = true;
+                         // Optional: Try to reset invalid coords to prevent breaking camera
+                         // graph.setNodeAttribute(node, 'x', Math.random() * 100);
+                         // graph.setNodeAttribute(node, 'y', Math.random() * 100);
+                     }
+                 });
+
+                 if (invalidCoordsFound) {
+                      showError("Layout produced invalid coordinates! Graph might disappear or camera might fail.");
+                      // Optionally skip centering if coords are bad
+                      // layoutSuccess = false;
+                 }
+
+
+                 // Center camera immediately after synchronous layout completes (if successful)
+                //  if (layoutSuccess) {
+                //     if (!initialZoomApplied && graph.order > 0 && layoutIterations >= INITIAL_LAYOUT_ITERATIONS) {
+                //         centerCamera();
+                //         initialZoomApplied = true;
+                //     } else if (manualTrigger) {
+                //         centerCamera();
+                //     }
+                //  }
+
+
+            } catch (e) {
+                 console.error("Error applying ForceAtlas2 layout:", e);
+                 showError("Error occurred during graph layout.");
+                 console.timeEnd("Layout Calculation");
+            } finally {
+                 showLoading(false); // Hide loading indicator
+                 console.log("applyLayout finished.");
+                 // Refresh sigma instance to show new positions (even if centering failed)
+                //  if (sigmaInstance) {
+                //       console.log("Refreshing Sigma instance after layout attempt.");
+                //       sigmaInstance.refresh();
+                //  }
+            }
+        }, 10); // Very short delay just to allow UI update
+    }
+
+    function centerCamera() {
+         if (!sigmaInstance || graph.order === 0) return;
+
+         console.log("Applying camera centering and zoom...");
+         console.log("Camera state BEFORE centering:", sigmaInstance.getCamera().getState());
+
+         let minX = Infinity, maxX = -Infinity, minY = Infinity, maxY = -Infinity;
+         let hasFiniteCoords = false;
+         graph.forEachNode((node, attributes) => {
+             // *** Check coordinates are finite before using them for bounds ***
+             if (isFinite(attributes.x) && isFinite(attributes.y)) {
+                  if (attributes.x < minX) minX = attributes.x;
+                  if (attributes.x > maxX) maxX = attributes.x;
+                  if (attributes.y < minY) minY = attributes.y;
+                  if (attributes.y > maxY) maxY = attributes.y;
+                  hasFiniteCoords = true;
+             } else {
+                 console.warn(`Node ${node} has invalid coordinates (x=${attributes.x}, y=${attributes.y}) - skipping for bound calculation.`);
+             }
+         });
+
+         if (!hasFiniteCoords) {
+             console.warn("Cannot center camera: No nodes with finite coordinates found after layout.");
+             // Reset camera to a default view if bounds are invalid
+             sigmaInstance.getCamera().animate({ x: 0.5, y: 0.5, ratio: 1, angle: 0 }, { duration: 200 });
+             return;
+         }
+
+         // Handle case where all valid nodes are at the same point or bounds are still invalid
+         if (minX === Infinity || minY === Infinity || maxX === -Infinity || maxY === -Infinity || (minX === maxX && minY === maxY)) {
+              console.warn("Cannot determine valid bounds for camera centering (single point or invalid bounds). Using default view.");
+              // Use coordinates of the first valid node found, or default if none
+              const firstNode = graph.findNode(n => isFinite(graph.getNodeAttribute(n, 'x')) && isFinite(graph.getNodeAttribute(n, 'y')));
+              const targetX = firstNode ? graph.getNodeAttribute(firstNode, 'x') : 0.5;
+              const targetY = firstNode ? graph.getNodeAttribute(firstNode, 'y') : 0.5;
+              sigmaInstance.getCamera().animate({ x: targetX, y: targetY, ratio: 1, angle: 0 }, { duration: 200 });
+              return;
+         }
+
+         // --- Proceed with normal centering calculation ---
+         const graphWidth = maxX - minX || 1; // Avoid division by zero
+         const graphHeight = maxY - minY || 1;
+         const graphRatio = graphWidth / graphHeight;
+
+         const { width: vpWidth, height: vpHeight } = sigmaInstance.getDimensions();
+         const viewportRatio = vpWidth / vpHeight;
+
+         let targetRatio;
+         if (graphRatio > viewportRatio) { targetRatio = graphWidth / vpWidth; }
+         else { targetRatio = graphHeight / vpHeight; }
+
+         targetRatio *= 1.2; // Padding factor
+         targetRatio = sigmaInstance.getCamera().getBoundedRatio(targetRatio); // Apply min/max zoom limits
+
+         // Ensure targetRatio is a valid positive number
+         if (!isFinite(targetRatio) || targetRatio <= 0) {
+              console.warn(`Calculated invalid targetRatio (${targetRatio}). Resetting ratio to 1.`);
+              targetRatio = 1;
+         }
+
+         const centerX = (minX + maxX) / 2;
+         const centerY = (minY + maxY) / 2;
+
+         console.log(`Centering camera on graph coords [${centerX.toFixed(2)}, ${centerY.toFixed(2)}] with ratio ${targetRatio.toFixed(3)}`);
+         sigmaInstance.getCamera().animate(
+             { x: centerX, y: centerY, ratio: targetRatio, angle: 0 },
+             { duration: 300 } // Animation duration
+         ).then(() => {
+             console.log("Camera animation finished. Final state:", sigmaInstance.getCamera().getState());
+         });
+    }
+
+
+    // --- Debounce Function ---
+    function debounce(func, delay) {
+        let timeoutId;
+        return function(...args) {
+            const context = this;
+            clearTimeout(timeoutId);
+            timeoutId = setTimeout(() => {
+                func.apply(context, args);
+            }, delay);
+        };
+    }
+
+    // --- Handle Slider Events ---
+    function handleTimeChange() {
+        let startTimeMs = parseInt(startTimeSlider.value, 10);
+        let endTimeMs = parseInt(endTimeSlider.value, 10);
+        const minVal = parseInt(startTimeSlider.min, 10);
+        const maxVal = parseInt(endTimeSlider.max, 10);
+
+        startTimeMs = isNaN(startTimeMs) ? (isNaN(minVal)? overallMinTimestamp : minVal) : startTimeMs;
+        endTimeMs = isNaN(endTimeMs) ? (isNaN(maxVal)? overallMaxTimestamp : maxVal) : endTimeMs;
+
+        if (this === startTimeSlider && startTimeMs > endTimeMs) { endTimeSlider.value = String(startTimeMs); endTimeMs = startTimeMs; }
+        else if (this === endTimeSlider && endTimeMs < startTimeMs) { startTimeSlider.value = String(endTimeMs); startTimeMs = endTimeMs; }
+
+        currentStartTimeMs = startTimeMs;
+        currentEndTimeMs = endTimeMs;
+
+        startTimeLabel.textContent = formatTimestampUTC(startTimeMs);
+        endTimeLabel.textContent = formatTimestampUTC(endTimeMs);
+
+        if (sigmaInstance) { sigmaInstance.refresh(); }
+    }
+
+    // Debounced function to fetch data when sliders stop moving
+    const debouncedFetchUpdate = debounce(() => {
+        if (startTimeSlider.disabled || endTimeSlider.disabled) return;
+        let fetchStartTimeMs = parseInt(startTimeSlider.value, 10);
+        let fetchEndTimeMs = parseInt(endTimeSlider.value, 10);
+        fetchStartTimeMs = isNaN(fetchStartTimeMs) ? overallMinTimestamp : fetchStartTimeMs;
+        fetchEndTimeMs = isNaN(fetchEndTimeMs) ? overallMaxTimestamp : fetchEndTimeMs;
+        if (fetchStartTimeMs > fetchEndTimeMs) { fetchStartTimeMs = fetchEndTimeMs; }
+        console.log("Debounced fetch triggered...");
+        fetchAndPopulateGraph(fetchStartTimeMs, fetchEndTimeMs);
+    }, DEBOUNCE_DELAY);
+
+
+    // --- Event Listeners ---
+    startTimeSlider.addEventListener('input', handleTimeChange);
+    endTimeSlider.addEventListener('input', handleTimeChange);
+    startTimeSlider.addEventListener('change', debouncedFetchUpdate);
+    endTimeSlider.addEventListener('change', debouncedFetchUpdate);
+
+    if (layoutButton) {
+         layoutButton.addEventListener('click', () => {
+             console.log("Manual layout trigger clicked.");
+             applyLayout(MANUAL_LAYOUT_ITERATIONS, true);
+         });
+    }
+
+
+    // --- Main Execution ---
+    initializeSigma();
+    if (sigmaInstance && graph) {
+        fetchAndPopulateGraph();
+    } else {
+         console.error("Skipping initial data fetch: Sigma/Graphology failed initialization.");
+         startTimeSlider.disabled = true;
+         endTimeSlider.disabled = true;
+         if(layoutButton) layoutButton.disabled = true;
+    }
+
+}); // End of DOMContentLoaded listener
+
+// --- Add CSS for Tooltip ---
+const style = document.createElement('style');
+style.textContent = `
   .sigma-tooltip {
     position: absolute;
     display: none;
@@ -326,5 +894,7 @@ In order to be iterable, non-array objects must have a [Symbol.iterator]() metho
     word-wrap: break-word;
     white-space: pre-wrap;
   }
-`;document.head.appendChild(dr);})();
+`;
+document.head.appendChild(style);
+}})();
 //# sourceMappingURL=bundle.js.map
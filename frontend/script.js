@@ -33,6 +33,7 @@ document.addEventListener("DOMContentLoaded", () => {
     let graph = null;
     let overallMinTimestamp = 0;
     let overallMaxTimestamp = 0;
+    let channelNames = []; // channel_id by compact channel index, from CHANNEL_MAP_ENDPOINT
     let currentStartTimeMs = 0;
     let currentEndTimeMs = 0;
     let isFetchingData = false;
@@ -51,6 +52,7 @@ document.addEventListener("DOMContentLoaded", () => {
 
     // --- Configuration ---
     const API_ENDPOINT = '/graph-data';
+    const CHANNEL_MAP_ENDPOINT = '/channel-map';
     const DEBOUNCE_DELAY = 400;
     const INITIAL_LAYOUT_ITERATIONS = 100;
     const MANUAL_LAYOUT_ITERATIONS = 50;
@@ -232,6 +234,44 @@ document.addEventListener("DOMContentLoaded", () => {
     }
 
     // --- Data Fetching and Graph Population ---
+    // Nodes and links refer to channels by compact index; the names are loaded separately
+    // and reloaded when a graph contains channels ingested since the last load. min_size
+    // makes the backend bypass a cached map that doesn't cover those channels yet.
+    async function fetchChannelMap(minSize) {
+        try {
+            const response = await fetch(`${CHANNEL_MAP_ENDPOINT}?min_size=${minSize}`);
+            if (!response.ok) { throw new Error(`HTTP error ${response.status}`); }
+            channelNames = await response.json();
+            console.log(`Channel map received: ${channelNames.length} entries`);
+        } catch (error) {
+            console.warn("Failed to load channel map; showing channel indices instead of ids.", error);
+        }
+    }
+
+    // The backend pages links; follow next_cursor until the window is complete and merge
+    // the pages, summing node degrees by id.
+    async function fetchGraphDataPages(params) {
+        const degreesById = new Map();
+        const links = [];
+        let data = null;
+        let cursor = null;
+        do {
+            const pageParams = new URLSearchParams(params);
+            if (cursor) { pageParams.set('after_ts', String(cursor.after_ts)); pageParams.set('after_id', String(cursor.after_id)); }
+            const url = `${API_ENDPOINT}?${pageParams.toString()}`;
+            console.log(`Requesting URL: ${url}`);
+            const response = await fetch(url);
+            if (!response.ok) { let errorText = "An error occurred"; try { const errorData = await response.json(); errorText = errorData.error || `HTTP error ${response.status}`; } catch (e) { errorText = `HTTP error ${response.status}: ${response.statusText}`; } throw new Error(errorText); }
+            data = await response.json();
+            if (!data || !Array.isArray(data.nodes) || !Array.isArray(data.links)) { throw new Error("Invalid data structure received from backend."); }
+            data.nodes.forEach(node => { degreesById.set(node.id, (degreesById.get(node.id) || 0) + (node.degree || 0)); });
+            for (const link of data.links) { links.push(link); }
+            cursor = data.next_cursor;
+        } while (cursor);
+        const nodes = Array.from(degreesById, ([id, degree]) => ({ id: id, degree: degree }));
+        return { nodes: nodes, links: links, min_timestamp: data.min_timestamp, max_timestamp: data.max_timestamp };
+    }
+
     async function fetchAndPopulateGraph(startTime = null, endTime = null) {
         if (!graph || !sigmaInstance) { return; }
         if (isFetchingData) { return; }
@@ -246,14 +286,11 @@ document.addEventListener("DOMContentLoaded", () => {
         const params = new URLSearchParams();
         params.append('start_time', String(currentStartTimeMs));
         params.append('end_time', String(currentEndTimeMs));
-        const url = `${API_ENDPOINT}?${params.toString()}`;
-        console.log(`Requesting URL: ${url}`);
         try {
-            const response = await fetch(url);
-            if (!response.ok) { let errorText = "An error occurred"; try { const errorData = await response.json(); errorText = errorData.error || `HTTP error ${response.status}`; } catch (e) { errorText = `HTTP error ${response.status}: ${response.statusText}`; } throw new Error(errorText); }
-            const data = await response.json();
-            console.log(`Data received: ${data.nodes?.length || 0} nodes, ${data.links?.length || 0} links`);
-            if (!data || !Array.isArray(data.nodes) || !Array.isArray(data.links)) { throw new Error("Invalid data structure received from backend."); }
+            const data = await fetchGraphDataPages(params);
+            console.log(`Data received: ${data.nodes.length} nodes, ${data.links.length} links`);
+            const maxUnnamedId = data.nodes.reduce((maxId, node) => (channelNames[node.id] == null ? Math.max(maxId, node.id) : maxId), -1);
+            if (maxUnnamedId >= 0) { await fetchChannelMap(maxUnnamedId + 1); }
 
             // No need to stop layout for sync assign
 
@@ -262,9 +299,9 @@ document.addEventListener("DOMContentLoaded", () => {
             graph.clear();
             console.log("Populating graphology instance...");
             let nodesAdded = 0;
-            data.nodes.forEach(node => { if (node.id === null || node.id === undefined) { return; } const existingPos = existingNodes[node.id]; const degree = node.degree || 0; const targetSize = NODE_MIN_SIZE + Math.sqrt(degree) * NODE_BASE_SIZE_FACTOR; const finalSize = Math.max(NODE_MIN_SIZE, Math.min(targetSize, NODE_MAX_SIZE)); const originalColor = getRandomColor(); try { graph.addNode(node.id, { label: node.label || String(node.id), x: existingPos?.x ?? Math.random() * 1000, y: existingPos?.y ?? Math.random() * 1000, size: finalSize, degree: degree, color: originalColor, originalColor: originalColor, zIndex: 1 }); nodesAdded++; } catch (nodeError) { console.error(`Error adding node ${node.id}:`, nodeError); } });
+            data.nodes.forEach(node => { if (node.id === null || node.id === undefined) { return; } const existingPos = existingNodes[node.id]; const degree = node.degree || 0; const targetSize = NODE_MIN_SIZE + Math.sqrt(degree) * NODE_BASE_SIZE_FACTOR; const finalSize = Math.max(NODE_MIN_SIZE, Math.min(targetSize, NODE_MAX_SIZE)); const originalColor = getRandomColor(); try { graph.addNode(node.id, { label: channelNames[node.id] ?? String(node.id), x: existingPos?.x ?? Math.random() * 1000, y: existingPos?.y ?? Math.random() * 1000, size: finalSize, degree: degree, color: originalColor, originalColor: originalColor, zIndex: 1 }); nodesAdded++; } catch (nodeError) { console.error(`Error adding node ${node.id}:`, nodeError); } });
             let edgesAdded = 0;
-            data.links.forEach(link => { if (!link.source || !link.target) { return; } const sourceStr = String(link.source); const targetStr = String(link.target); if (graph.hasNode(sourceStr) && graph.hasNode(targetStr)) { try { const edgeExists = !graph.multi && graph.hasEdge(sourceStr, targetStr); if (!edgeExists) { graph.addEdge(sourceStr, targetStr, { timestamp: link.timestamp, type: 'arrow', size: 0.5, zIndex: 0 }); edgesAdded++; } else if (graph.multi) { graph.addEdge(sourceStr, targetStr, { timestamp: link.timestamp, type: 'arrow', size: 0.5, zIndex: 0 }); edgesAdded++; } } catch (edgeError) { } } });
+            data.links.forEach(link => { if (link.source == null || link.target == null) { return; } const sourceStr = String(link.source); const targetStr = String(link.target); if (graph.hasNode(sourceStr) && graph.hasNode(targetStr)) { try { const edgeExists = !graph.multi && graph.hasEdge(sourceStr, targetStr); if (!edgeExists) { graph.addEdge(sourceStr, targetStr, { timestamp: link.timestamp, type: 'arrow', size: 0.5, zIndex: 0 }); edgesAdded++; } else if (graph.multi) { graph.addEdge(sourceStr, targetStr, { timestamp: link.timestamp, type: 'arrow', size: 0.5, zIndex: 0 }); edgesAdded++; } } catch (edgeError) { } } });
             console.log(`Graph populated: ${nodesAdded} nodes, ${edgesAdded} edges.`);
             if (graph.order === 0) { console.warn("Graph is empty after population."); }
             if (startTime === null && endTime === null) {
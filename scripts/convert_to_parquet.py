@@ -0,0 +1,35 @@
+import os
+import sys
+import argparse
+import pandas as pd
+
+# One-time conversion of a pickled source DataFrame to Parquet, which the ingestion
+# script can load column-by-column with pyarrow instead of unpickling every value.
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert a pickled source DataFrame to Parquet.")
+    parser.add_argument('source', help="Path to the .pkl file to convert.")
+    parser.add_argument(
+        'output',
+        nargs='?',
+        help="Path of the Parquet file to write (defaults to the source path with a .parquet extension)."
+    )
+    args = parser.parse_args()
+
+    output_path = args.output or os.path.splitext(args.source)[0] + '.parquet'
+
+    try:
+        print(f"Loading data from: {args.source}")
+        df = pd.read_pickle(args.source)
+        print(f"Loaded {len(df)} records.")
+        # Strings are dictionary-encoded and timezone-aware datetimes keep their UTC instants
+        df.to_parquet(output_path, engine='pyarrow', index=False)
+    except Exception as e:
+        print(f"ERROR: Failed to convert data file: {e}")
+        sys.exit(1)
+
+    print(f"Wrote {output_path}")
+    print("Point SOURCE_DATA_PATH in your .env file at this file to use it for ingestion.")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -1,10 +1,13 @@
 import os
 import sys
+import threading
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 import pandas as pd
 from neo4j import GraphDatabase, basic_auth
 from dotenv import load_dotenv
 import time
-from datetime import timezone # Import timezone directly
 
 # --- Configuration Loading (Keep as before) ---
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -16,46 +19,235 @@ NEO4J_USER = os.getenv("NEO4J_USER")
 NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD")
 SOURCE_DATA_PATH_RELATIVE = os.getenv("SOURCE_DATA_PATH")
 SOURCE_DATA_PATH = os.path.join(project_root, SOURCE_DATA_PATH_RELATIVE)
+# Used to clear the running backend's caches once the new data is in place
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+FLASK_HOST = os.getenv("FLASK_HOST", "127.0.0.1")
+FLASK_PORT = int(os.getenv("FLASK_PORT", 5000))
+INGEST_WORKERS = int(os.getenv("INGEST_WORKERS", 4)) # Concurrent writer threads, each with its own session
+CHANNEL_BATCH_SIZE = 10000 # Distinct channel ids merged per transaction
+APOC_BATCH_SIZE = 10000 # Staged rows per server-side apoc.periodic.iterate transaction
+APOC_CONCURRENCY = 8 # Parallel apoc.periodic.iterate batches
+TIMESTAMP_INDEX_NAME = "repost_timestamp_range_idx"
+DAY_MS = 24 * 60 * 60 * 1000 # Length of a UTC day in epoch milliseconds
+ROLLUP_BATCH_SIZE = 1000 # Channels whose daily rollups are rebuilt per transaction
 
-# --- Helper Functions (Keep as before) ---
-def datetime_to_ms_epoch(dt):
-    """Converts a datetime object to milliseconds epoch UTC."""
-    if pd.isna(dt): # Handle potential missing datetime values
-        return None
-    if dt.tzinfo is None:
-        # If timezone info is missing, explicitly assume UTC, matching the Neo4j storage goal
-        # Alternatively, you could raise an error or log a warning
-        dt = dt.replace(tzinfo=timezone.utc)
-    return int(dt.astimezone(tz=timezone.utc).timestamp() * 1000)
+# Columns read from the source file
+REQUIRED_COLUMNS = ['channel_from_id', 'channel_id', 'publish_datetime']
+# Reference point for converting timezone-aware timestamps to milliseconds epoch
+EPOCH_UTC = pd.Timestamp(0, tz='UTC')
+
+# --- Helper Functions ---
+def load_source_data(path):
+    """Loads the source DataFrame. Columnar files are read with pyarrow, limited to the required columns."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.parquet':
+        return pd.read_parquet(path, columns=REQUIRED_COLUMNS, engine='pyarrow')
+    if extension == '.feather':
+        return pd.read_feather(path, columns=REQUIRED_COLUMNS)
+    # Legacy pickle: every value is rebuilt as a Python object and all columns are loaded
+    print("WARNING: Loading a pickle file. Convert it once with 'python scripts/convert_to_parquet.py <file>' for faster loading.")
+    return pd.read_pickle(path)
 
 # --- Neo4j Interaction Functions (Keep as before) ---
 def create_constraints_indexes(tx):
     """Creates necessary constraints and indexes if they don't exist."""
     print("Creating constraints and indexes...")
     tx.run("CREATE CONSTRAINT channel_id_unique IF NOT EXISTS FOR (c:Channel) REQUIRE c.channel_id IS UNIQUE")
-    tx.run("CREATE INDEX repost_timestamp_idx IF NOT EXISTS FOR ()-[r:REPOSTED]-() ON (r.timestamp)")
+    tx.run("CREATE CONSTRAINT channel_idx_unique IF NOT EXISTS FOR (c:Channel) REQUIRE c.idx IS UNIQUE")
+    # An explicit RANGE index lets time-window filters (timestamp >= start AND <= end) seek
+    # instead of scanning every relationship. It replaces the earlier unnamed-type index on
+    # the same property, which IF NOT EXISTS would otherwise treat as equivalent.
+    tx.run("DROP INDEX repost_timestamp_idx IF EXISTS")
+    tx.run(f"CREATE RANGE INDEX {TIMESTAMP_INDEX_NAME} IF NOT EXISTS FOR ()-[r:REPOSTED]-() ON (r.timestamp)")
+    # One :DailyAgg node per channel and UTC day, looked up by day range at query time
+    tx.run("CREATE CONSTRAINT daily_agg_unique IF NOT EXISTS FOR (a:DailyAgg) REQUIRE (a.channel_idx, a.day) IS UNIQUE")
+    tx.run("CREATE RANGE INDEX daily_agg_day_idx IF NOT EXISTS FOR (a:DailyAgg) ON (a.day)")
     print("Constraints and indexes checked/created.")
 
-def ingest_data_batch(tx, batch_data):
-    """Ingests a batch of data using UNWIND for efficiency."""
-    # Query uses UNWIND, MERGEs nodes, uses WITH to carry forward nodes and row data,
-    # filters rows with missing data using WHERE, then creates the relationship.
+def _plan_operators(plan):
+    """Yields the operator types of an EXPLAIN/PROFILE plan tree."""
+    yield plan.get("operatorType", "")
+    for child in plan.get("children", []):
+        yield from _plan_operators(child)
+
+def check_timestamp_index_plan(session):
+    """Warns if the planner would not use the timestamp range index for a time-window query."""
+    session.run(f"CALL db.awaitIndex('{TIMESTAMP_INDEX_NAME}', 300)").consume()
+    # EXPLAIN only plans the query; PROFILE would also execute it over the whole graph
+    summary = session.run(
+        "EXPLAIN MATCH (source:Channel)-[r:REPOSTED]->(target:Channel) "
+        "WHERE r.timestamp >= $startTime AND r.timestamp <= $endTime "
+        "RETURN source.idx, target.idx, r.timestamp",
+        startTime=0, endTime=1,
+    ).consume()
+    operators = list(_plan_operators(summary.plan or {}))
+    if any("RelationshipIndexSeekByRange" in operator for operator in operators):
+        print(f"Time-window queries use {TIMESTAMP_INDEX_NAME}.")
+    else:
+        print(f"WARNING: Time-window queries are not planned with {TIMESTAMP_INDEX_NAME} (plan: {', '.join(operators)}).")
+
+def get_next_channel_idx(tx):
+    """Returns the first compact channel index not yet assigned in the database."""
+    query = "MATCH (c:Channel) RETURN coalesce(max(c.idx), -1) + 1 AS next_idx"
+    return tx.run(query).single()["next_idx"]
+
+def merge_channels_batch(tx, channel_ids, next_idx):
+    """
+    MERGEs a batch of distinct channel ids, so relationship batches only need to look them up.
+    Channels that already have a compact index keep it; the others are numbered consecutively
+    from `next_idx`, so repeated runs leave no gaps. Returns the index of every channel, in the
+    order of `channel_ids`, and the next index still free.
+    """
     query = """
-    UNWIND $batch as row
-    MERGE (source:Channel {channel_id: row.source_id})
-    MERGE (target:Channel {channel_id: row.target_id})
-    // Use WITH to carry forward the matched/created nodes and the original row data
-    WITH source, target, row
-    // Filter rows HERE using the carried-forward 'row' data
-    WHERE row.source_id IS NOT NULL
-      AND row.target_id IS NOT NULL
-      AND row.timestamp_ms IS NOT NULL
-      AND source IS NOT NULL // Also ensure MERGE succeeded (should always if ID not null)
-      AND target IS NOT NULL // Also ensure MERGE succeeded
-    // Create relationship only for valid, non-null rows/nodes
-    CREATE (source)-[:REPOSTED {timestamp: row.timestamp_ms}]->(target)
+    UNWIND $channel_ids AS channel_id
+    MATCH (c:Channel {channel_id: channel_id})
+    WHERE c.idx IS NOT NULL
+    RETURN channel_id, c.idx AS idx
     """
-    tx.run(query, batch=batch_data)
+    idx_by_id = {record["channel_id"]: record["idx"] for record in tx.run(query, channel_ids=channel_ids)}
+    new_ids = [channel_id for channel_id in channel_ids if channel_id not in idx_by_id]
+    if new_ids:
+        new_idxs = list(range(next_idx, next_idx + len(new_ids)))
+        query = """
+        UNWIND range(0, size($channel_ids) - 1) AS i
+        MERGE (c:Channel {channel_id: $channel_ids[i]})
+        SET c.idx = $idxs[i]
+        """
+        tx.run(query, channel_ids=new_ids, idxs=new_idxs)
+        idx_by_id.update(zip(new_ids, new_idxs))
+    return [idx_by_id[channel_id] for channel_id in channel_ids], next_idx + len(new_ids)
+
+def ingest_data_batch(tx, source_idxs, target_idxs, timestamps_ms):
+    """Ingests a batch of relationships, passed as parallel column lists, using UNWIND for efficiency."""
+    # Rows with missing data were already dropped during preparation, and every channel
+    # was merged beforehand, so endpoints are plain lookups on the unique idx index
+    # instead of a MERGE (with its locking) per row. Column lists avoid sending a map per row.
+    query = """
+    UNWIND range(0, size($timestamps) - 1) AS i
+    MATCH (source:Channel {idx: $source_idxs[i]})
+    MATCH (target:Channel {idx: $target_idxs[i]})
+    CREATE (source)-[:REPOSTED {timestamp: $timestamps[i]}]->(target)
+    """
+    tx.run(query, source_idxs=source_idxs, target_idxs=target_idxs, timestamps=timestamps_ms)
+
+def stage_data_batch(tx, source_idxs, target_idxs, timestamps_ms):
+    """Stores a batch of prepared rows as temporary :_Staging nodes for APOC to turn into relationships."""
+    # Creating new, unconnected nodes takes no locks on existing channels, so staging
+    # batches from several workers never contend with each other
+    query = """
+    UNWIND range(0, size($timestamps) - 1) AS i
+    CREATE (:_Staging {source_idx: $source_idxs[i], target_idx: $target_idxs[i], ts: $timestamps[i]})
+    """
+    tx.run(query, source_idxs=source_idxs, target_idxs=target_idxs, timestamps=timestamps_ms)
+
+def apoc_available(tx):
+    """Checks whether APOC's apoc.periodic.iterate procedure is installed."""
+    query = """
+    SHOW PROCEDURES YIELD name
+    WHERE name = 'apoc.periodic.iterate'
+    RETURN count(*) > 0 AS available
+    """
+    return tx.run(query).single()["available"]
+
+def run_periodic_iterate(session, iterate_query, action_query, parallel):
+    """Runs apoc.periodic.iterate, raising if any of its batches failed."""
+    # Auto-commit query: APOC commits each batch itself, so this must not be wrapped in
+    # a managed transaction that could be retried as a whole
+    query = """
+    CALL apoc.periodic.iterate($iterateQuery, $actionQuery, {
+        batchSize: $batchSize, parallel: $parallel, concurrency: $concurrency, retries: 3
+    })
+    YIELD total, failedBatches, errorMessages
+    RETURN total, failedBatches, errorMessages
+    """
+    result = session.run(
+        query,
+        iterateQuery=iterate_query,
+        actionQuery=action_query,
+        batchSize=APOC_BATCH_SIZE,
+        parallel=parallel,
+        concurrency=APOC_CONCURRENCY,
+    ).single()
+    if result["failedBatches"]:
+        raise RuntimeError(f"apoc.periodic.iterate failed for {result['failedBatches']} batches: {result['errorMessages']}")
+    return result["total"]
+
+def clear_staging(session):
+    """Deletes :_Staging nodes left behind by an interrupted run."""
+    run_periodic_iterate(session, "MATCH (st:_Staging) RETURN st", "DELETE st", parallel=False)
+
+def create_relationships_from_staging(session):
+    """Turns all :_Staging nodes into REPOSTED relationships, with Neo4j driving the batch loop."""
+    # Batches run in parallel inside the server; the occasional deadlock between batches
+    # sharing a channel is retried by APOC
+    return run_periodic_iterate(
+        session,
+        "MATCH (st:_Staging) RETURN st",
+        """
+        MATCH (source:Channel {idx: st.source_idx})
+        MATCH (target:Channel {idx: st.target_idx})
+        CREATE (source)-[:REPOSTED {timestamp: st.ts}]->(target)
+        DELETE st
+        """,
+        parallel=True,
+    )
+
+def build_daily_rollups(session):
+    """
+    (Re)computes every channel's degree per UTC day into :DailyAgg nodes, so the backend
+    can sum rollups for day-aligned windows instead of counting relationships. The
+    undirected pattern counts a self-repost once, matching the backend's other degree paths.
+    """
+    # CALL { } IN TRANSACTIONS commits in batches, so it must run in an auto-commit transaction
+    query = f"""
+    MATCH (c:Channel)
+    WHERE c.idx IS NOT NULL
+    CALL {{
+        WITH c
+        MATCH (c)-[r:REPOSTED]-()
+        WITH c, toInteger(floor(r.timestamp / toFloat($dayMs))) AS day, count(*) AS degree
+        MERGE (a:DailyAgg {{channel_idx: c.idx, day: day}})
+        SET a.degree = degree
+    }} IN TRANSACTIONS OF {ROLLUP_BATCH_SIZE} ROWS
+    """
+    session.run(query, dayMs=DAY_MS).consume()
+
+def invalidate_backend_caches():
+    """
+    Asks a running backend to drop its cached time range, channel map and responses,
+    which would otherwise describe the graph as it was before this ingestion.
+    """
+    if not ADMIN_TOKEN:
+        print("NOTE: ADMIN_TOKEN is not set, so the backend's caches were not cleared. "
+              "Restart the backend (or wait for its cache TTLs) to serve the new data.")
+        return
+    host = "127.0.0.1" if FLASK_HOST in ("0.0.0.0", "") else FLASK_HOST
+    request = urllib.request.Request(
+        f"http://{host}:{FLASK_PORT}/admin/invalidate",
+        method="POST",
+        headers={"X-Admin-Token": ADMIN_TOKEN},
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=10):
+            pass
+        print("Backend caches cleared.")
+    except Exception as e:
+        print(f"WARNING: Could not clear the backend's caches ({e}). If it is running, restart it "
+              "or call POST /admin/invalidate to serve the new data.")
+
+def ingest_partition(driver, batch_func, source_idxs, target_idxs, timestamps_ms, batch_size, report_progress):
+    """Writes one worker's share of the prepared columns in batches with `batch_func`, on its own session."""
+    with driver.session(database="neo4j") as session:
+        for i in range(0, len(timestamps_ms), batch_size):
+            batch = slice(i, i + batch_size)
+            # execute_write retries transient errors such as deadlocks between workers
+            session.execute_write(
+                batch_func,
+                source_idxs[batch].tolist(),
+                target_idxs[batch].tolist(),
+                timestamps_ms[batch].tolist(),
+            )
+            report_progress(len(timestamps_ms[batch]))
 
 # --- Main Ingestion Logic ---
 def main():
@@ -67,12 +259,12 @@ def main():
 
     try:
         print(f"Loading data from: {SOURCE_DATA_PATH}")
-        df = pd.read_pickle(SOURCE_DATA_PATH)
+        df = load_source_data(SOURCE_DATA_PATH)
         print(f"Loaded {len(df)} records.")
         print(f"DataFrame columns: {df.columns}") # Print columns for verification
 
         # *** MODIFIED VALIDATION ***
-        required_columns = {'channel_from_id', 'channel_id', 'publish_datetime'}
+        required_columns = set(REQUIRED_COLUMNS)
         if not required_columns.issubset(df.columns):
              missing = required_columns - set(df.columns)
              print(f"ERROR: Data file is missing required columns: {missing}")
@@ -84,36 +276,23 @@ def main():
         print(f"ERROR: Failed to load or validate data file: {e}")
         sys.exit(1)
 
-    # 3. Prepare data for Neo4j
+    # 3. Prepare data for Neo4j (vectorized, so no per-row Python work)
     try:
-        data_for_neo4j = []
-        processed_count = 0
-        skipped_count = 0
         print("Preparing data for Neo4j...")
-        for index, row in df.iterrows():
-            # *** MODIFIED COLUMN ACCESS ***
-            source_id = row['channel_from_id']
-            target_id = row['channel_id']
-            publish_dt = row['publish_datetime']
-
-            # Basic check for missing essential data for a relationship
-            if pd.isna(source_id) or pd.isna(target_id) or pd.isna(publish_dt):
-                skipped_count += 1
-                # Optional: Log skipped rows
-                # print(f"Skipping row {index}: Missing source_id, target_id, or publish_datetime")
-                continue # Skip this row if essential data is missing
-
-            timestamp_ms = datetime_to_ms_epoch(publish_dt)
-            if timestamp_ms is None: # Check if conversion failed
-                 skipped_count += 1
-                 continue
-
-            data_for_neo4j.append({
-                'source_id': str(source_id), # Ensure string
-                'target_id': str(target_id), # Ensure string
-                'timestamp_ms': timestamp_ms
-            })
-            processed_count += 1
+        total_count = len(df)
+        # Skip rows missing essential data for a relationship
+        df = df.dropna(subset=['channel_from_id', 'channel_id', 'publish_datetime'])
+        # Naive datetimes are assumed to be UTC, aware ones are converted to UTC;
+        # values that cannot be parsed become NaT and are skipped as well
+        publish_dt = pd.to_datetime(df['publish_datetime'], utc=True, errors='coerce')
+        valid = publish_dt.notna().to_numpy()
+
+        source_ids = df['channel_from_id'].to_numpy()[valid].astype(str) # Ensure string
+        target_ids = df['channel_id'].to_numpy()[valid].astype(str) # Ensure string
+        timestamps_ms = ((publish_dt[valid] - EPOCH_UTC) // pd.Timedelta(milliseconds=1)).to_numpy(dtype='int64')
+
+        processed_count = len(timestamps_ms)
+        skipped_count = total_count - processed_count
 
         print(f"Data preparation complete. Processed: {processed_count}, Skipped (missing data): {skipped_count}")
         if processed_count == 0 and skipped_count > 0:
@@ -134,29 +313,93 @@ def main():
     driver = None
     try:
         print(f"Connecting to Neo4j at {NEO4J_URI}...")
-        driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASSWORD))
+        driver = GraphDatabase.driver(
+            NEO4J_URI,
+            auth=(NEO4J_USER, NEO4J_PASSWORD),
+            max_connection_pool_size=INGEST_WORKERS + 2,
+        )
         driver.verify_connectivity()
         print("Successfully connected to Neo4j.")
 
         with driver.session(database="neo4j") as session: # Use default database 'neo4j' unless specified otherwise
-            # *** UPDATED API CALL ***
             session.execute_write(create_constraints_indexes)
 
-            # Ingest data in batches
-            batch_size = 1000 # Adjust batch size based on memory/performance
-            print(f"Ingesting {len(data_for_neo4j)} prepared records in batches of {batch_size}...")
-            if not data_for_neo4j:
-                 print("No data to ingest.")
+            use_apoc = session.execute_read(apoc_available)
+            if use_apoc:
+                print("APOC found: relationships will be created server-side with apoc.periodic.iterate.")
+                clear_staging(session)
             else:
-                for i in range(0, len(data_for_neo4j), batch_size):
-                    batch = data_for_neo4j[i:i + batch_size]
-                    # *** UPDATED API CALL ***
-                    session.execute_write(ingest_data_batch, batch)
-                    # Simple progress indicator for large files
-                    processed_records = min(i + batch_size, len(data_for_neo4j))
-                    print(f"  Processed records {processed_records}/{len(data_for_neo4j)}...")
-
-            print("Data ingestion completed successfully.")
+                print("APOC not found: relationships will be created by client-side batches.")
+
+            # Phase 1: MERGE every distinct channel exactly once, giving each a compact
+            # integer index (Channel.idx). Relationships are written by index, and the
+            # backend sends indices instead of channel_id strings in /graph-data.
+            endpoint_codes, channel_ids = pd.factorize(np.concatenate([source_ids, target_ids]))
+            next_idx = session.execute_read(get_next_channel_idx)
+            channel_idxs = np.empty(len(channel_ids), dtype=np.uint32)
+            print(f"Merging {len(channel_ids)} distinct channels in batches of {CHANNEL_BATCH_SIZE}...")
+            for i in range(0, len(channel_ids), CHANNEL_BATCH_SIZE):
+                batch = slice(i, i + CHANNEL_BATCH_SIZE)
+                channel_idxs[batch], next_idx = session.execute_write(
+                    merge_channels_batch, channel_ids[batch].tolist(), next_idx
+                )
+            source_idxs = channel_idxs[endpoint_codes[:processed_count]]
+            target_idxs = channel_idxs[endpoint_codes[processed_count:]]
+
+        # Phase 2: write the rows in batches, spread over several writer threads. With APOC the
+        # workers only stage the rows and Neo4j creates the relationships itself (no client
+        # round-trip per relationship batch); otherwise the workers create them directly.
+        batch_size = 1000 # Adjust batch size based on memory/performance
+        print(f"Ingesting {processed_count} prepared records in batches of {batch_size} using {INGEST_WORKERS} workers...")
+        if processed_count == 0:
+             print("No data to ingest.")
+        else:
+            # Sorting by the smaller endpoint index keeps relationships that touch the same
+            # channels in the same partition, so workers rarely wait on each other's locks
+            lower_idxs = np.minimum(source_idxs, target_idxs)
+            order = np.argsort(lower_idxs, kind='stable')
+            source_idxs, target_idxs, timestamps_ms = source_idxs[order], target_idxs[order], timestamps_ms[order]
+
+            progress_lock = threading.Lock()
+            progress = {"done": 0}
+
+            def report_progress(count):
+                # Simple progress indicator for large files
+                with progress_lock:
+                    progress["done"] += count
+                    print(f"  Processed records {progress['done']}/{processed_count}...")
+
+            partition_size = -(-processed_count // INGEST_WORKERS) # Ceiling division
+            with ThreadPoolExecutor(max_workers=INGEST_WORKERS) as executor:
+                futures = [
+                    executor.submit(
+                        ingest_partition,
+                        driver,
+                        stage_data_batch if use_apoc else ingest_data_batch,
+                        source_idxs[start:start + partition_size],
+                        target_idxs[start:start + partition_size],
+                        timestamps_ms[start:start + partition_size],
+                        batch_size,
+                        report_progress,
+                    )
+                    for start in range(0, processed_count, partition_size)
+                ]
+                for future in futures:
+                    future.result() # Re-raises any worker error
+
+            if use_apoc:
+                print("Creating relationships from staged records...")
+                with driver.session(database="neo4j") as session:
+                    created = create_relationships_from_staging(session)
+                print(f"  Created {created} relationships.")
+
+            with driver.session(database="neo4j") as session:
+                print("Building daily degree rollups...")
+                build_daily_rollups(session)
+                check_timestamp_index_plan(session)
+
+        print("Data ingestion completed successfully.")
+        invalidate_backend_caches()
 
     except Exception as e:
         print(f"ERROR: An error occurred during Neo4j interaction: {e}")
@@ -8,12 +8,19 @@ from dotenv import load_dotenv
 
 try:
     import docker
-    from docker.errors import DockerException
+    from docker.errors import DockerException, NotFound
 except ImportError:
     print("ERROR: 'docker' library not found. Please install it:")
     print("pip install docker")
     sys.exit(1)
 
+try:
+    import yaml
+except ImportError:
+    print("ERROR: 'PyYAML' library not found. Please install it:")
+    print("pip install pyyaml")
+    sys.exit(1)
+
 # --- Configuration ---
 PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
 DOTENV_PATH = os.path.join(PROJECT_ROOT, '.env')
@@ -21,6 +28,8 @@ NEO4J_DATA_DIR = os.path.join(PROJECT_ROOT, 'neo4j', 'data')
 NEO4J_LOGS_DIR = os.path.join(PROJECT_ROOT, 'neo4j', 'logs')
 DOCKER_COMPOSE_FILE = os.path.join(PROJECT_ROOT, 'docker-compose.yml')
 INGESTION_SCRIPT = os.path.join(PROJECT_ROOT, 'scripts', 'ingest_data.py')
+NEO4J_SERVICE_NAME = 'neo4j' # Service in docker-compose.yml that defines the Neo4j container
+NEO4J_READY_TIMEOUT_SECONDS = 180 # First start can take a while (e.g. downloading plugins)
 # Use the python interpreter from the current virtual environment
 PYTHON_EXECUTABLE = sys.executable
 
@@ -39,20 +48,20 @@ def print_error(message):
     print(f"ERROR: {message}", file=sys.stderr)
 
 def check_docker_running():
-    """Checks if the Docker daemon is running and accessible."""
+    """Checks if the Docker daemon is running and accessible. Returns a client, or None."""
     print_step("Checking Docker status...")
     try:
         client = docker.from_env()
         client.ping()
         print_info("Docker daemon is running.")
-        return True
+        return client
     except DockerException:
         print_error("Docker daemon is not running or accessible.")
         print_error("Please start Docker Desktop or the Docker service.")
-        return False
+        return None
     except Exception as e:
         print_error(f"An unexpected error occurred while checking Docker: {e}")
-        return False
+        return None
 
 def ensure_docker_volumes_exist():
     """Creates the host directories needed for Neo4j volumes."""
@@ -66,36 +75,105 @@ def ensure_docker_volumes_exist():
         print_error(f"Failed to create volume directories: {e}")
         sys.exit(1)
 
-def run_docker_compose(args, action_desc):
-    """Runs a docker-compose command."""
+def load_neo4j_service():
+    """Reads the Neo4j service definition from docker-compose.yml."""
     if not os.path.exists(DOCKER_COMPOSE_FILE):
         print_error(f"docker-compose.yml not found at: {DOCKER_COMPOSE_FILE}")
         sys.exit(1)
+    try:
+        with open(DOCKER_COMPOSE_FILE) as f:
+            compose_config = yaml.safe_load(f)
+        return compose_config['services'][NEO4J_SERVICE_NAME]
+    except (OSError, yaml.YAMLError, KeyError, TypeError) as e:
+        print_error(f"Failed to read the '{NEO4J_SERVICE_NAME}' service from docker-compose.yml: {e}")
+        sys.exit(1)
 
-    command = ['docker-compose'] + args
-    print_info(f"Running: {' '.join(command)}")
+def get_service_environment(service):
+    """Returns the service's environment as a dict (compose allows a list or a mapping)."""
+    environment = service.get('environment') or {}
+    if isinstance(environment, dict):
+        return {key: str(value) for key, value in environment.items()}
+    return dict(item.split('=', 1) for item in environment)
+
+def build_container_options(service):
+    """Translates the compose service definition into docker SDK containers.run() arguments."""
+    ports = {}
+    for mapping in service.get('ports', []):
+        host_port, container_port = str(mapping).rsplit(':', 1)
+        ports[f"{container_port}/tcp"] = int(host_port.rsplit(':', 1)[-1])
+
+    volumes = []
+    for mapping in service.get('volumes', []):
+        host_path, container_path = mapping.split(':', 1)
+        # Relative host paths in the compose file are relative to the project root
+        volumes.append(f"{os.path.abspath(os.path.join(PROJECT_ROOT, host_path))}:{container_path}")
+
+    options = {
+        'image': service['image'],
+        'name': service.get('container_name', NEO4J_SERVICE_NAME),
+        'ports': ports,
+        'volumes': volumes,
+        'environment': get_service_environment(service),
+        'detach': True,
+    }
+    restart_policy = service.get('restart')
+    if restart_policy and restart_policy != 'no':
+        options['restart_policy'] = {'Name': restart_policy}
+    return options
+
+def get_neo4j_container(client, service):
+    """Returns the Neo4j container if it exists, otherwise None."""
     try:
-        # Use check=True to raise CalledProcessError if command fails
-        subprocess.run(command, check=True, cwd=PROJECT_ROOT, capture_output=True, text=True)
-        print_info(f"Docker Compose action '{action_desc}' successful.")
+        return client.containers.get(service.get('container_name', NEO4J_SERVICE_NAME))
+    except NotFound:
+        return None
+
+def remove_neo4j_container(client, service):
+    """Stops and removes the Neo4j container (the equivalent of 'docker-compose down')."""
+    container = get_neo4j_container(client, service)
+    if container is None:
+        print_info("Neo4j container does not exist, nothing to stop.")
         return True
-    except FileNotFoundError:
-        print_error("'docker-compose' command not found. Is Docker Compose installed and in your PATH?")
-        return False
-    except subprocess.CalledProcessError as e:
-        print_error(f"Docker Compose action '{action_desc}' failed.")
-        print_error(f"Return Code: {e.returncode}")
-        print_error(f"Stderr: {e.stderr}")
-        print_error(f"Stdout: {e.stdout}")
-        return False
-    except Exception as e:
-        print_error(f"An unexpected error occurred running docker-compose: {e}")
+    try:
+        container.stop()
+        container.remove()
+        print_info(f"Container '{container.name}' stopped and removed.")
+        return True
+    except DockerException as e:
+        print_error(f"Failed to stop Neo4j container: {e}")
         return False
 
-def clear_neo4j_data():
+def wait_for_neo4j(container, service):
+    """Polls Neo4j with cypher-shell, backing off exponentially, until it accepts queries."""
+    print_info("Waiting for Neo4j to accept connections...")
+    auth = get_service_environment(service).get('NEO4J_AUTH', 'none')
+    shell_environment = {}
+    if auth != 'none':
+        # cypher-shell reads credentials from these variables, keeping them off the command line
+        user, password = auth.split('/', 1)
+        shell_environment = {'NEO4J_USERNAME': user, 'NEO4J_PASSWORD': password}
+
+    deadline = time.monotonic() + NEO4J_READY_TIMEOUT_SECONDS
+    delay = 0.5
+    while True:
+        container.reload()
+        if container.status != 'running':
+            print_error(f"Neo4j container stopped unexpectedly (status: {container.status}).")
+            return False
+        exit_code, _ = container.exec_run(['cypher-shell', 'RETURN 1'], environment=shell_environment)
+        if exit_code == 0:
+            print_info("Neo4j is ready.")
+            return True
+        if time.monotonic() + delay > deadline:
+            print_error(f"Neo4j did not become ready within {NEO4J_READY_TIMEOUT_SECONDS} seconds.")
+            return False
+        time.sleep(delay)
+        delay = min(delay * 2, 5)
+
+def clear_neo4j_data(client, service):
     """Stops Neo4j container, removes data volume contents, restarts."""
     print_step("Clearing existing Neo4j data...")
-    if not run_docker_compose(['down'], 'stop container'):
+    if not remove_neo4j_container(client, service):
         print_error("Failed to stop Neo4j container. Aborting clear.")
         return False # Indicate failure
 
@@ -115,22 +193,29 @@ def clear_neo4j_data():
     # No need to restart here, the main flow will start it
     return True # Indicate success
 
-def start_neo4j():
-    """Starts the Neo4j container using docker-compose up -d."""
+def start_neo4j(client, service):
+    """Starts the Neo4j container (creating it from the compose definition if needed) and waits until it is ready."""
     print_step("Starting Neo4j container...")
-    if not run_docker_compose(['up', '-d'], 'start container'):
+    try:
+        container = get_neo4j_container(client, service)
+        if container is None:
+            container = client.containers.run(**build_container_options(service))
+            print_info(f"Container '{container.name}' created from image {service['image']}.")
+        elif container.status != 'running':
+            container.start()
+            print_info(f"Container '{container.name}' started.")
+        else:
+            print_info(f"Container '{container.name}' is already running.")
+    except DockerException as e:
+        print_error(f"Failed to start Neo4j container: {e}")
         return False # Indicate failure
 
-    print_info("Waiting for Neo4j container to initialize (approx. 15-30 seconds)...")
-    # This is a simple wait. A more robust solution would poll the Bolt port or check container health.
-    time.sleep(20) # Adjust sleep time if needed
-    print_info("Neo4j should be ready.")
-    return True # Indicate success
+    return wait_for_neo4j(container, service)
 
-def stop_neo4j():
-    """Stops the Neo4j container using docker-compose down."""
+def stop_neo4j(client, service):
+    """Stops and removes the Neo4j container."""
     print_step("Stopping Neo4j container...")
-    run_docker_compose(['down'], 'stop container')
+    remove_neo4j_container(client, service)
 
 def run_ingestion():
     """Runs the data ingestion script."""
@@ -172,22 +257,24 @@ def main():
     print("=== Temporal Graph Env Setup & Ingestion ===")
     print("=============================================")
 
-    if not check_docker_running():
+    client = check_docker_running()
+    if client is None:
         sys.exit(1)
 
+    service = load_neo4j_service()
     ensure_docker_volumes_exist()
 
     neo4j_started_successfully = False
     if args.clear:
-        if clear_neo4j_data():
+        if clear_neo4j_data(client, service):
             # Start Neo4j after clearing
-            neo4j_started_successfully = start_neo4j()
+            neo4j_started_successfully = start_neo4j(client, service)
         else:
             print_error("Aborting due to failure during data clearing.")
             sys.exit(1)
     else:
         # Just ensure Neo4j is started if not clearing
-        neo4j_started_successfully = start_neo4j()
+        neo4j_started_successfully = start_neo4j(client, service)
 
     if not neo4j_started_successfully:
         print_error("Failed to start Neo4j container. Aborting.")
@@ -197,10 +284,10 @@ def main():
     ingestion_successful = run_ingestion()
 
     if args.stop:
-        stop_neo4j()
+        stop_neo4j(client, service)
     else:
         print_info("\nNeo4j container is left running.")
-        print_info("You can stop it manually using: docker-compose down")
+        print_info(f"You can stop it manually using: docker stop {service.get('container_name', NEO4J_SERVICE_NAME)}")
 
     if ingestion_successful:
         print("\n--- Setup and Ingestion Process Completed Successfully ---")